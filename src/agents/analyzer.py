@@ -10,19 +10,21 @@ class AnalyzerAgent(BaseAgent):
     Identifies key components, dependencies, and critical factors.
     """
 
-    def __init__(self):
+    def __init__(self, client=None):
         super().__init__(
             agent_id="analyzer-agent",
-            role_description="Problem Decomposition Specialist - breaks complex problems into manageable sub-components and identifies key factors"
+            role_description="Problem Decomposition Specialist - breaks complex problems into manageable sub-components and identifies key factors",
+            client=client
         )
 
-    def analyze(self, problem: str, constraints: list = None) -> dict:
+    def analyze(self, problem: str, constraints: list = None, on_conclusion=None) -> dict:
         """
         Analyze a problem and break it down into components.
 
         Args:
             problem: The problem statement to analyze
             constraints: Optional list of constraints
+            on_conclusion: Optional callback receiving the streamed conclusion early
 
         Returns:
             Thought signature dictionary
@@ -31,5 +33,6 @@ class AnalyzerAgent(BaseAgent):
             problem=problem,
             reasoning_type="analysis",
             parent_signatures=None,
-            constraints=constraints
+            constraints=constraints,
+            on_conclusion=on_conclusion
         )
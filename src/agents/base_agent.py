@@ -2,30 +2,33 @@
 Base agent class for all specialized agents in the TLO system.
 """
 import json
-from typing import Dict, List, Optional
-import google.generativeai as genai
+from typing import Callable, Dict, List, Optional
 from config import Config
-
-# Configure Gemini API at import time only if key is available
-if Config.is_configured():
-    genai.configure(api_key=Config.GEMINI_API_KEY)
+from runtime.llm import LLMClient
+from runtime.schema import SchemaError, default_validator
+from runtime.speculation import SpeculationCancelledError, streamed_conclusion
 
 
 class BaseAgent:
     """Base class for all reasoning agents."""
 
-    def __init__(self, agent_id: str, role_description: str):
+    # Parent conclusions are trimmed to this length in compact prompts
+    COMPACT_CONCLUSION_CHARS = 300
+
+    def __init__(self, agent_id: str, role_description: str, client: Optional[LLMClient] = None):
         self.agent_id = agent_id
         self.role_description = role_description
-        # Use current Config values (may have been updated with user-provided key)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        # Model calls go through the client so each one is routed and accounted for
+        self.client = client or LLMClient()
 
     def generate_signature(
         self,
         problem: str,
         reasoning_type: str,
         parent_signatures: Optional[List[Dict]] = None,
-        constraints: Optional[List[str]] = None
+        constraints: Optional[List[str]] = None,
+        on_conclusion: Optional[Callable[[Dict], None]] = None,
+        compact: bool = False
     ) -> Dict:
         """
         Generate a thought signature for a given problem.
@@ -35,24 +38,72 @@ class BaseAgent:
             reasoning_type: Type of reasoning (analysis, decision, synthesis, evaluation)
             parent_signatures: List of parent signature dictionaries for context
             constraints: List of constraints to consider
+            on_conclusion: Optional callback; the response is streamed and the
+                callback receives a partial signature (agent_id, conclusion) as
+                soon as the conclusion has arrived, before the rest is parsed
+            compact: Ask for the shorter 3-step chain regardless of the deadline
 
         Returns:
             Dictionary representing the thought signature
         """
+        # Near the request deadline, ask for a shorter chain over trimmed context
+        short_on_time = self.client.short_on_time()
+        if short_on_time:
+            self.client.deadline.degrade(
+                reasoning_type,
+                "compact prompt",
+                f"{self.client.deadline.remaining():.1f}s left for {self.agent_id}"
+            )
+        compact = compact or short_on_time
+
         # Build context from parent signatures
         context_text = ""
         if parent_signatures:
             context_text = "\n\nPREVIOUS REASONING:\n"
             for i, parent in enumerate(parent_signatures, 1):
+                conclusion = parent['conclusion']
+                if short_on_time and len(conclusion) > self.COMPACT_CONCLUSION_CHARS:
+                    conclusion = conclusion[:self.COMPACT_CONCLUSION_CHARS] + "..."
                 context_text += f"\nSignature {i} (from {parent['agent_id']}):\n"
-                context_text += f"  Conclusion: {parent['conclusion']}\n"
-                context_text += f"  Confidence: {parent['confidence_score']}\n"
+                context_text += f"  Conclusion: {conclusion}\n"
+                # Partial parents used for speculative runs carry no confidence yet
+                if 'confidence_score' in parent:
+                    context_text += f"  Confidence: {parent['confidence_score']}\n"
 
         # Build constraints text
         constraints_text = ""
         if constraints:
             constraints_text = "\n\nCONSTRAINTS:\n" + "\n".join(f"- {c}" for c in constraints)
 
+        if compact:
+            structure_text = """1. **Key Assumptions** - What are you taking as given?
+2. **Logical Inferences** - What follows from them?
+3. **Final Conclusion** - What's your recommendation?
+
+For each step in your reasoning chain (steps 1-3), provide:"""
+            alternatives_text = """Also provide:
+- 1 alternative approach you considered but rejected, with why it was rejected and its confidence score"""
+        else:
+            structure_text = """1. **Initial Observations** - What do you notice about the problem?
+2. **Key Assumptions** - What are you taking as given?
+3. **Logical Inferences** - What follows from your observations?
+4. **Alternative Paths** - What else could work? (Consider at least 2 alternatives)
+5. **Final Conclusion** - What's your recommendation?
+
+For each step in your reasoning chain (steps 1-5), provide:"""
+            alternatives_text = """Also provide:
+- At least 2 alternative approaches you considered but rejected
+- For each alternative: the reasoning, why it was rejected, and its confidence score"""
+
+        # A streamed response is asked for its conclusion first, so speculative
+        # children can start from it before the reasoning chain is generated
+        conclusion_field = '\n  "conclusion": "your final recommendation or decision",'
+        conclusion_first, conclusion_last = (conclusion_field, "") if on_conclusion else ("", conclusion_field)
+        order_text = (
+            '\nWrite the "conclusion" field first: decide your recommendation, then give the reasoning chain behind it.\n'
+            if on_conclusion else ""
+        )
+
         # Create prompt for signature generation
         prompt = f"""
 You are {self.agent_id}: {self.role_description}
@@ -66,23 +117,15 @@ PROBLEM: {problem}{context_text}{constraints_text}
 
 Generate a detailed reasoning chain with the following structure:
 
-1. **Initial Observations** - What do you notice about the problem?
-2. **Key Assumptions** - What are you taking as given?
-3. **Logical Inferences** - What follows from your observations?
-4. **Alternative Paths** - What else could work? (Consider at least 2 alternatives)
-5. **Final Conclusion** - What's your recommendation?
-
-For each step in your reasoning chain (steps 1-5), provide:
+{structure_text}
 - The reasoning text (detailed explanation)
 - Confidence level (0.0 to 1.0, where 1.0 is absolute certainty)
 - Evidence or justification
 
-Also provide:
-- At least 2 alternative approaches you considered but rejected
-- For each alternative: the reasoning, why it was rejected, and its confidence score
-
+{alternatives_text}
+{order_text}
 Output ONLY valid JSON matching this exact schema:
-{{
+{{{conclusion_first}
   "reasoning_chain": [
     {{
       "step": 1,
@@ -90,8 +133,7 @@ Output ONLY valid JSON matching this exact schema:
       "confidence": 0.85,
       "evidence": ["supporting fact 1", "supporting fact 2"]
     }}
-  ],
-  "conclusion": "your final recommendation or decision",
+  ],{conclusion_last}
   "confidence_score": 0.82,
   "alternative_paths": [
     {{
@@ -105,37 +147,61 @@ Output ONLY valid JSON matching this exact schema:
 Remember: Output ONLY the JSON, no additional text.
 """
 
+        response_text = ""
         try:
-            # Generate response using Gemini 3
-            response = self.model.generate_content(
+            # Generate response using the model routed for this phase
+            routing = self.client.route(reasoning_type)
+            response_text = self.client.generate_json(
                 prompt,
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": Config.DEFAULT_TEMPERATURE
-                }
+                routing,
+                Config.DEFAULT_TEMPERATURE,
+                on_partial=self._conclusion_watcher(on_conclusion) if on_conclusion else None
             )
 
-            # Parse JSON response
-            signature_data = json.loads(response.text)
+            # Parse JSON response, repairing near-valid output instead of re-generating
+            signature_data, repairs = default_validator.parse(response_text, "ModelSignature")
 
             # Add agent metadata
             signature_data["agent_id"] = self.agent_id
             signature_data["reasoning_type"] = reasoning_type
             signature_data["context"] = {
                 "parent_signatures": [p.get("signature_id") for p in (parent_signatures or [])],
-                "input_data": {"problem": problem},
+                # The role is kept so the signature can be regenerated (ThoughtLineageOrchestrator.recompute)
+                "input_data": {"problem": problem, "role_description": self.role_description},
                 "constraints": constraints or []
             }
+            signature_data["metadata"] = {"routing": routing}
+            if compact:
+                signature_data["metadata"]["compact_prompt"] = True
+            if repairs:
+                signature_data["metadata"]["repairs"] = repairs
 
             return signature_data
 
-        except json.JSONDecodeError as e:
+        except SpeculationCancelledError:
+            raise
+        except (json.JSONDecodeError, SchemaError) as e:
             print(f"[ERROR] Failed to parse JSON from {self.agent_id}: {e}")
-            print(f"Response text: {response.text[:500]}")
+            print(f"Response text: {response_text[:500]}")
             raise
         except Exception as e:
             print(f"[ERROR] {self.agent_id} failed to generate signature: {e}")
             raise
 
+    def _conclusion_watcher(self, on_conclusion: Callable[[Dict], None]) -> Callable[[str], None]:
+        """Wrap on_conclusion into a stream callback that fires once the conclusion is complete."""
+        fired = False
+
+        def on_partial(text: str):
+            nonlocal fired
+            if fired:
+                return
+            conclusion = streamed_conclusion(text)
+            if conclusion is not None:
+                fired = True
+                on_conclusion({"agent_id": self.agent_id, "conclusion": conclusion})
+
+        return on_partial
+
     def __str__(self):
         return f"{self.agent_id} ({self.role_description})"
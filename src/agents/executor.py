@@ -1,6 +1,8 @@
 """
 Executor Agent - Implements plans and reports results.
 """
+from typing import Dict, List, Optional
+
 from agents.base_agent import BaseAgent
 
 
@@ -10,13 +12,20 @@ class ExecutorAgent(BaseAgent):
     Takes strategic plans and determines concrete execution steps.
     """
 
-    def __init__(self):
+    def __init__(self, client=None, workstream: Optional[int] = None):
+        """
+        Args:
+            client: Shared LLMClient
+            workstream: 1-based workstream number for a sharded sub-agent (see execute_workstream)
+        """
         super().__init__(
-            agent_id="executor-agent",
-            role_description="Execution Specialist - transforms strategic plans into concrete implementation steps with measurable outcomes"
+            agent_id="executor-agent" if workstream is None else f"executor-agent-ws{workstream}",
+            role_description="Execution Specialist - transforms strategic plans into concrete implementation steps with measurable outcomes",
+            client=client
         )
+        self.workstream = workstream
 
-    def execute_plan(self, problem: str, planning_signatures: list = None, constraints: list = None) -> dict:
+    def execute_plan(self, problem: str, planning_signatures: list = None, constraints: list = None, on_conclusion=None) -> dict:
         """
         Create execution steps based on the planning phase.
 
@@ -24,6 +33,7 @@ class ExecutorAgent(BaseAgent):
             problem: The problem statement
             planning_signatures: Previous planning signatures for context
             constraints: Optional list of constraints
+            on_conclusion: Optional callback receiving the streamed conclusion early
 
         Returns:
             Thought signature dictionary
@@ -32,5 +42,94 @@ class ExecutorAgent(BaseAgent):
             problem=f"Create concrete execution steps for: {problem}",
             reasoning_type="evaluation",
             parent_signatures=planning_signatures,
-            constraints=constraints
+            constraints=constraints,
+            on_conclusion=on_conclusion
         )
+
+    @staticmethod
+    def workstreams(reasoning_chain: List[Dict], shards: int) -> List[List[Dict]]:
+        """
+        Split a plan's reasoning chain into contiguous workstreams of near-equal size.
+
+        Never returns more workstreams than there are steps, nor an empty one.
+        """
+        shards = max(1, min(shards, len(reasoning_chain)))
+        bounds = [round(i * len(reasoning_chain) / shards) for i in range(shards + 1)]
+        return [reasoning_chain[bounds[i]:bounds[i + 1]] for i in range(shards)]
+
+    def execute_workstream(self, problem: str, planning_signature: Dict, shards: int, constraints: list = None) -> dict:
+        """
+        Create execution steps for this sub-agent's workstream of the plan.
+
+        The workstream is re-derived from the plan on every call, so a
+        regenerated plan is split the same way again. Sub-agents ask for the
+        compact 3-step chain; their outputs are combined by reduce_workstreams().
+
+        Args:
+            problem: The problem statement
+            planning_signature: The plan being executed
+            shards: Number of workstreams the plan is split into
+            constraints: Optional list of constraints
+
+        Returns:
+            Thought signature dictionary, with metadata.workstream
+        """
+        streams = self.workstreams(planning_signature.get("reasoning_chain", []), shards)
+        # A regenerated plan may have fewer steps than workstreams; the last one carries on
+        steps = streams[min(self.workstream, len(streams)) - 1]
+        step_text = "\n".join(f"- Step {step['step']}: {step['thought']}" for step in steps)
+        data = self.generate_signature(
+            problem=(
+                f"Create concrete execution steps for workstream {self.workstream} of {shards} of the plan for: {problem}\n\n"
+                f"Cover only this workstream; the other workstreams are handled separately:\n{step_text}"
+            ),
+            reasoning_type="evaluation",
+            parent_signatures=[planning_signature],
+            constraints=constraints,
+            compact=True
+        )
+        data["metadata"]["workstream"] = {
+            "index": self.workstream,
+            "count": shards,
+            "plan_steps": [step["step"] for step in steps],
+            "problem": problem
+        }
+        return data
+
+    def reduce_workstreams(self, problem: str, workstream_signatures: List[Dict], constraints: list = None) -> dict:
+        """
+        Combine workstream signatures into one execution signature, without a model call.
+
+        Reasoning steps are concatenated in workstream order and renumbered,
+        conclusions are listed per workstream, and the confidence is the mean
+        of the workstreams' confidences.
+
+        Args:
+            problem: The problem statement
+            workstream_signatures: Signatures from execute_workstream(), in workstream order
+            constraints: Optional list of constraints
+
+        Returns:
+            Thought signature dictionary whose parents are the workstream signatures
+        """
+        reasoning_chain, conclusions, alternatives = [], [], []
+        for index, sig in enumerate(workstream_signatures, 1):
+            for step in sig["reasoning_chain"]:
+                reasoning_chain.append(dict(step, step=len(reasoning_chain) + 1, thought=f"[Workstream {index}] {step['thought']}"))
+            conclusions.append(f"Workstream {index}: {sig['conclusion']}")
+            alternatives.extend(sig.get("alternative_paths", []))
+
+        return {
+            "agent_id": self.agent_id,
+            "reasoning_type": "evaluation",
+            "reasoning_chain": reasoning_chain,
+            "conclusion": "\n".join(conclusions),
+            "confidence_score": round(sum(s["confidence_score"] for s in workstream_signatures) / len(workstream_signatures), 3),
+            "alternative_paths": alternatives,
+            "context": {
+                "parent_signatures": [s.get("signature_id") for s in workstream_signatures],
+                "input_data": {"problem": f"Create concrete execution steps for: {problem}", "role_description": self.role_description},
+                "constraints": constraints or []
+            },
+            "metadata": {"reduced_workstreams": {"count": len(workstream_signatures), "problem": problem}}
+        }
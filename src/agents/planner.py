@@ -1,29 +1,73 @@
 """
 Planner Agent - Creates action sequences based on analysis.
 """
+import re
+from typing import Dict, Union
 from agents.base_agent import BaseAgent
 
 
+# Built-in competing focus profiles used by the parallel demo. Each profile is
+# a role description plus the constraints the planner is launched with.
+FOCUS_PROFILES = {
+    "growth": {
+        "role_description": "Growth-Obsessed Strategist - Your ONLY metric is User Acquisition. Your reward function is 100% tied to capturing market share. You MUST prioritize rapid adoption even if it means burning cash or accepting risks. Budget overruns are acceptable if they accelerate growth.",
+        "constraints": ["Maximize user acquisition at all costs", "Viral growth is paramount", "Ignore short-term burn rate"]
+    },
+    "revenue": {
+        "role_description": "Margin-Protection Strategist - Your ONLY metric is Unit Economics and Profitability. Your reward function is 100% tied to protecting margins. You MUST block any strategy that lowers pricing or increases CAC, even if it limits growth. Cash flow survival trumps market share.",
+        "constraints": ["Protect unit economics ruthlessly", "No pricing below sustainable margins", "Cash flow survival required"]
+    }
+}
+
+
+def resolve_focus_profile(profile: Union[str, Dict]) -> Dict:
+    """
+    Normalize a focus profile into {"focus", "role_description", "constraints"}.
+
+    Args:
+        profile: Name of a built-in profile, or a dict with a "focus" name and
+            optional "role_description" and "constraints" overrides
+
+    Returns:
+        Fully populated focus profile dictionary
+    """
+    if isinstance(profile, str):
+        profile = {"focus": profile}
+
+    focus = profile.get("focus")
+    if not focus:
+        raise ValueError("Focus profile requires a 'focus' name")
+
+    builtin = FOCUS_PROFILES.get(focus, {})
+    role_description = profile.get("role_description") or builtin.get("role_description")
+    if not role_description:
+        raise ValueError(f"Focus profile '{focus}' requires a role_description")
+
+    return {
+        "focus": focus,
+        "role_description": role_description,
+        "constraints": list(profile.get("constraints", builtin.get("constraints", [])))
+    }
+
+
 class PlannerAgent(BaseAgent):
     """
     Specialized agent for strategic planning and sequencing.
     Takes analysis and creates actionable plans with timing and dependencies.
     """
 
-    def __init__(self, focus=None):
-        if focus == "growth":
-            agent_id = "planner-growth-focus"
-            role_description = "Growth-Obsessed Strategist - Your ONLY metric is User Acquisition. Your reward function is 100% tied to capturing market share. You MUST prioritize rapid adoption even if it means burning cash or accepting risks. Budget overruns are acceptable if they accelerate growth."
-        elif focus == "revenue":
-            agent_id = "planner-revenue-focus"
-            role_description = "Margin-Protection Strategist - Your ONLY metric is Unit Economics and Profitability. Your reward function is 100% tied to protecting margins. You MUST block any strategy that lowers pricing or increases CAC, even if it limits growth. Cash flow survival trumps market share."
+    def __init__(self, focus=None, role_description=None, client=None):
+        if focus and (role_description or focus in FOCUS_PROFILES):
+            slug = re.sub(r"[^a-z0-9]+", "-", focus.lower()).strip("-")
+            agent_id = f"planner-{slug}-focus"
+            role_description = role_description or FOCUS_PROFILES[focus]["role_description"]
         else:
             agent_id = "planner-agent"
             role_description = "Strategic Planning Specialist - creates actionable plans with timing, sequencing, and resource allocation"
 
-        super().__init__(agent_id=agent_id, role_description=role_description)
+        super().__init__(agent_id=agent_id, role_description=role_description, client=client)
 
-    def plan(self, problem: str, analysis_signatures: list = None, constraints: list = None) -> dict:
+    def plan(self, problem: str, analysis_signatures: list = None, constraints: list = None, on_conclusion=None) -> dict:
         """
         Create a plan based on the problem and prior analysis.
 
@@ -31,6 +75,7 @@ class PlannerAgent(BaseAgent):
             problem: The problem statement to plan for
             analysis_signatures: Previous analysis signatures for context
             constraints: Optional list of constraints
+            on_conclusion: Optional callback receiving the streamed conclusion early
 
         Returns:
             Thought signature dictionary
@@ -39,5 +84,6 @@ class PlannerAgent(BaseAgent):
             problem=problem,
             reasoning_type="decision",
             parent_signatures=analysis_signatures,
-            constraints=constraints
+            constraints=constraints,
+            on_conclusion=on_conclusion
         )
@@ -1,210 +1,487 @@
 """
 Flask web application for Thought Lineage Orchestrator visualization.
 """
-from flask import Flask, render_template, jsonify, request
-from orchestrator import ThoughtLineageOrchestrator, ThoughtSignature
-from agents import AnalyzerAgent, PlannerAgent
-from intelligence import ContradictionDetector, Synthesizer
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context, make_response, send_file
+from orchestrator import ThoughtLineageOrchestrator, FanoutRejectedError
+from intelligence import ProblemIndex, ContradictionIndex
+from graph import GraphDiff, GraphEventBus, SharedGraphStore
+from runtime import (
+    Deadline, DeadlineExceededError, RequestBudget, RequestProfiler, SchedulerRejectedError,
+    default_flight, default_router, default_scheduler
+)
+from config import Config
+from datetime import datetime, timedelta
+from functools import wraps
+import hashlib
 import json
+import os
+import threading
+import uuid
 
 app = Flask(__name__)
+# The most recently started run, served by the read endpoints. Requests do their
+# own work on an orchestrator of their own and only publish it here
 orchestrator = None
-current_results = None
+_current_lock = threading.Lock()
+# Shared across requests so near-identical submissions can reuse their analysis
+# and previously compared plan pairs can reuse their collision reports
+problem_index = ProblemIndex(Config.PROBLEM_INDEX_PATH)
+contradiction_index = ContradictionIndex(Config.CONTRADICTION_INDEX_PATH)
+# Multi-process serving: the current graph lives in a SQLite store shared by every worker
+shared_store = SharedGraphStore(Config.SHARED_STATE_PATH) if Config.SHARED_STATE_PATH else None
+# Live node and edge events per session, broadcast to every viewer subscribed to it
+event_bus = GraphEventBus(
+    max_queue=Config.EVENT_QUEUE_SIZE,
+    history=Config.EVENT_HISTORY,
+    heartbeat_seconds=Config.EVENT_HEARTBEAT_SECONDS,
+    stream_seconds=Config.EVENT_STREAM_SECONDS
+)
+
+# Opt-in profiling of the request path, per request or for a sampled fraction
+profiler = RequestProfiler(
+    Config.PROFILE_DIR,
+    sample_rate=Config.PROFILE_SAMPLE_RATE,
+    interval_seconds=Config.PROFILE_SAMPLE_INTERVAL_SECONDS
+)
+
+
+def profiled(view):
+    """Profile a view, including response serialization, when requested or sampled."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True) or {}
+        if not profiler.should_profile(data.get('profile')):
+            return view(*args, **kwargs)
+        with profiler.profile(request.path) as profile:
+            response = make_response(view(*args, **kwargs))
+        response.headers['X-TLO-Profile'] = profile['id']
+        return response
+    return wrapper
+
+
+def current_orchestrator():
+    """The orchestrator holding the current graph, synced from the shared store when enabled."""
+    global orchestrator
+    with _current_lock:
+        if shared_store is not None:
+            orchestrator = shared_store.current(ThoughtLineageOrchestrator)
+        return orchestrator
+
+
+def set_current(run_orchestrator):
+    """Make a starting run the one the read endpoints serve."""
+    global orchestrator
+    with _current_lock:
+        orchestrator = run_orchestrator
 
 
 @app.route('/')
 def index():
     """Main visualization page."""
-    return render_template('index.html')
+    return render_template('index.html', live_events=Config.LIVE_EVENTS)
+
+
+def request_tenant(custom_api_key):
+    """
+    Scheduler tenant of a request: its API key, else the client address.
+
+    Model calls are scheduled fairly per tenant, and analysis reuse is scoped to it.
+    """
+    if custom_api_key:
+        return "key:" + hashlib.sha256(custom_api_key.encode()).hexdigest()[:12]
+    return f"addr:{request.remote_addr}"
+
+
+def admit(tenant, requested):
+    """
+    Admission control for a request that makes model calls.
+
+    Clients may ask for "batch"; whether a request runs as interactive is
+    decided by the scheduler. Returns (priority, None) when admitted, or
+    (None, error response) otherwise; admitted requests must be handed back
+    with default_scheduler.finish().
+    """
+    try:
+        return default_scheduler.admit(tenant, requested), None
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+    except SchedulerRejectedError as e:
+        response = jsonify({"error": str(e)})
+        response.headers['Retry-After'] = '5'
+        return None, (response, 503)
+
+
+def deadline_seconds(data):
+    """
+    Deadline budget requested for a request, capped at Config.REQUEST_DEADLINE_SECONDS.
+
+    Clients may ask for a shorter deadline but never a longer one. Returns
+    (seconds, None), or (None, error response) when the value is not a
+    positive number.
+    """
+    requested = data.get('deadline_seconds')
+    if requested is None:
+        return Config.REQUEST_DEADLINE_SECONDS, None
+    try:
+        seconds = float(requested) if not isinstance(requested, bool) else None
+    except (TypeError, ValueError):
+        seconds = None
+    # Also rules out zero and NaN
+    if seconds is None or not seconds > 0:
+        return None, (jsonify({"error": f"deadline_seconds must be a positive number, got {requested!r}"}), 400)
+    return min(seconds, Config.REQUEST_DEADLINE_SECONDS), None
 
 
 @app.route('/api/process', methods=['POST'])
+@profiled
 def process_problem():
     """Process a problem through the TLO system."""
-    global orchestrator, current_results
-
     data = request.json
     problem = data.get('problem', '')
-    mode = data.get('mode', 'sequential')  # sequential or parallel
     custom_api_key = data.get('api_key')  # Optional custom API key
-    model = data.get('model', 'gemini-3-flash-preview')  # Optional model selection
+    # Viewers subscribed to /api/sessions/<session_id>/events watch the graph grow
+    session_id = str(data.get('session_id') or uuid.uuid4().hex)
+    tenant = request_tenant(custom_api_key)
 
     if not problem:
         return jsonify({"error": "Problem statement required"}), 400
 
-    # If custom API key provided, temporarily configure it
-    import google.generativeai as genai
-    from config import Config
-    original_api_key = None
-    original_model = None
-
     # Check that we have an API key (either from env or user-provided)
     if not custom_api_key and not Config.is_configured():
         return jsonify({"error": "No API key configured. Please enter your Gemini API key in the API Key field."}), 400
+    seconds, rejection = deadline_seconds(data)
+    if rejection is not None:
+        return rejection
 
+    priority, rejection = admit(tenant, data.get('priority', 'interactive'))
+    if rejection is not None:
+        return rejection
     try:
-        if custom_api_key:
-            # Save original config
-            from config import Config
-            original_api_key = Config.GEMINI_API_KEY
-            original_model = Config.GEMINI_MODEL
-
-            # Use custom config
-            Config.GEMINI_API_KEY = custom_api_key
-            Config.GEMINI_MODEL = model
-            genai.configure(api_key=custom_api_key)
-
-            # Create new orchestrator with custom config
-            orchestrator = ThoughtLineageOrchestrator()
-        else:
-            # Use default config but update model if specified
-            from config import Config
-            if model != Config.GEMINI_MODEL:
-                original_model = Config.GEMINI_MODEL
-                Config.GEMINI_MODEL = model
+        return _process(data, problem, tenant, priority, custom_api_key, session_id, seconds)
+    finally:
+        default_scheduler.finish(tenant, priority)
+
+
+def _process(data, problem, tenant, priority, custom_api_key, session_id, seconds):
+    """Run an admitted /api/process request on an orchestrator of its own."""
+    mode = data.get('mode', 'sequential')  # sequential, parallel or fanout
+    model = data.get('model')  # Optional model selection (defaults to Config.GEMINI_MODEL)
+    reuse_analysis = data.get('reuse_analysis')  # Optional: auto, offer or never
+    budget = RequestBudget(data.get('budget_usd'))  # Optional spend ceiling for model routing
+
+    # Started before any model work so the whole request stays under the worker timeout
+    deadline = Deadline(seconds)
+
+    # The caller's key and model go to this request's client only; Config and the
+    # library's process-wide key are never touched, so concurrent requests stay apart
+    orchestrator = ThoughtLineageOrchestrator(
+        problem_index=problem_index,
+        contradiction_index=contradiction_index,
+        budget=budget,
+        tenant=tenant,
+        priority=priority,
+        api_key=custom_api_key,
+        model=model
+    )
 
-            orchestrator = ThoughtLineageOrchestrator()
+    try:
+        orchestrator.signature_listeners.append(event_bus.listener(session_id, orchestrator.graph))
+        if shared_store is not None:
+            run_id = shared_store.start_run(orchestrator)
+        set_current(orchestrator)
 
         if mode == 'parallel':
             # Parallel mode: create conflicting plans to demonstrate contradiction detection
-            results = run_parallel_demo(problem)
+            results = run_parallel_demo(orchestrator, problem, reuse_analysis, deadline)
+        elif mode == 'fanout':
+            # Fan-out mode: arbitrary list of competing focus profiles
+            results = orchestrator.run_competing_plans(
+                problem,
+                data.get('focus_profiles') or ["growth", "revenue"],
+                constraints=data.get('constraints'),
+                max_concurrency=data.get('max_concurrency'),
+                max_cost_usd=data.get('max_cost_usd'),
+                latency_budget_seconds=data.get('latency_budget_seconds'),
+                reuse_analysis=reuse_analysis,
+                deadline=deadline,
+                incremental_detection=data.get('incremental_detection')
+            )
         else:
             # Sequential mode: standard workflow
-            results = orchestrator.process_problem(problem)
-
-        current_results = results
+            results = orchestrator.process_problem(
+                problem,
+                reuse_analysis=reuse_analysis,
+                deadline=deadline,
+                speculative=data.get('speculative'),  # Optional: overlap phases on streamed conclusions
+                executor_shards=data.get('executor_shards')  # Optional: concurrent execution workstreams
+            )
+
+        results["session_id"] = session_id
+        results["priority"] = priority
+        if shared_store is not None:
+            shared_store.finish_run(run_id, results)
+        event_bus.publish(session_id, "end", {"final_conclusion": results.get("final_conclusion")})
         return jsonify(results)
 
+    except FanoutRejectedError as e:
+        event_bus.publish(session_id, "end", {"error": str(e)})
+        return jsonify({"error": str(e)}), 400
+
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"[ERROR] {error_details}")
+        event_bus.publish(session_id, "end", {"error": str(e)})
         return jsonify({"error": str(e)}), 500
 
-    finally:
-        # Restore original config if it was changed
-        if original_api_key:
-            from config import Config
-            Config.GEMINI_API_KEY = original_api_key
-            Config.GEMINI_MODEL = original_model or 'gemini-3-flash-preview'
-            genai.configure(api_key=original_api_key)
-        elif original_model:
-            from config import Config
-            Config.GEMINI_MODEL = original_model
-
 
 @app.route('/api/graph')
 def get_graph():
     """Get the current reasoning graph."""
+    orchestrator = current_orchestrator()
     if orchestrator:
         return jsonify(orchestrator.get_graph_visualization_data())
     return jsonify({"nodes": [], "edges": []})
 
 
-def run_parallel_demo(problem):
-    """Run parallel planning demo with contradiction detection."""
-    detector = ContradictionDetector()
-    synthesizer = Synthesizer()
-
-    # Analysis phase
-    analyzer = AnalyzerAgent()
-    analysis_data = analyzer.analyze(problem)
-    analysis_sig = ThoughtSignature(
-        agent_id=analysis_data['agent_id'],
-        reasoning_type=analysis_data['reasoning_type'],
-        reasoning_chain=analysis_data['reasoning_chain'],
-        conclusion=analysis_data['conclusion'],
-        confidence_score=analysis_data['confidence_score'],
-        parent_signatures=analysis_data['context'].get('parent_signatures', []),
-        input_data=analysis_data['context'].get('input_data', {}),
-        constraints=analysis_data['context'].get('constraints', []),
-        alternative_paths=analysis_data.get('alternative_paths', [])
-    )
-    orchestrator.register_signature(analysis_sig)
+@app.route('/api/graph/summary')
+def get_graph_summary():
+    """Get a bounded level-of-detail view of the graph; pass cluster=<id> to expand a collapsed node."""
+    orchestrator = current_orchestrator()
+    if not orchestrator:
+        return jsonify({"level": "nodes", "nodes": [], "edges": []})
 
-    # Parallel planning with COMPETING INCENTIVES
-    planner_a = PlannerAgent(focus="growth")
-    planner_b = PlannerAgent(focus="revenue")
+    args = request.args
+    max_nodes = args.get('max_nodes', type=int)
+    try:
+        return jsonify(orchestrator.get_graph_summary(
+            cluster_id=args.get('cluster'),
+            offset=args.get('offset', 0, type=int),
+            max_nodes=min(max(max_nodes, 1), 1000) if max_nodes else None
+        ))
+    except KeyError:
+        return jsonify({"error": f"Unknown cluster: {args.get('cluster')}"}), 404
+
+
+@app.route('/api/sessions/<session_id>/events')
+def session_events(session_id):
+    """Server-Sent Events stream of a session's node and edge events."""
+    subscription = event_bus.subscribe(session_id, request.headers.get('Last-Event-ID'))
+    return Response(
+        subscription,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-    constraints_a = ["Maximize user acquisition at all costs", "Viral growth is paramount", "Ignore short-term burn rate"]
-    constraints_b = ["Protect unit economics ruthlessly", "No pricing below sustainable margins", "Cash flow survival required"]
 
-    plan_a_data = planner_a.plan(
-        problem,
-        analysis_signatures=[analysis_sig.to_dict()],
-        constraints=constraints_a
+@app.route('/api/sessions/stats')
+def get_session_stats():
+    """Get live-event counts: sessions, subscribers, events published and viewers dropped for lagging."""
+    return jsonify(event_bus.stats())
+
+
+@app.route('/api/signatures')
+def query_signatures():
+    """Query signatures by agent, reasoning type, time range and confidence, with pagination."""
+    orchestrator = current_orchestrator()
+    if not orchestrator:
+        return jsonify({"total": 0, "offset": 0, "limit": 0, "signatures": []})
+
+    args = request.args
+    since = args.get('since')
+    if args.get('since_seconds') is not None:
+        # Relative window, e.g. since_seconds=3600 for "the last hour"
+        since = (datetime.now() - timedelta(seconds=args.get('since_seconds', type=float))).isoformat()
+
+    limit = min(max(args.get('limit', 50, type=int), 1), 500)
+    result = orchestrator.graph.query(
+        agent_id=args.get('agent_id'),
+        reasoning_type=args.get('reasoning_type'),
+        since=since,
+        until=args.get('until'),
+        min_confidence=args.get('min_confidence', type=float),
+        max_confidence=args.get('max_confidence', type=float),
+        offset=max(args.get('offset', 0, type=int), 0),
+        limit=limit
     )
-    plan_a_sig = ThoughtSignature(
-        agent_id="planner-growth-focus",
-        reasoning_type=plan_a_data['reasoning_type'],
-        reasoning_chain=plan_a_data['reasoning_chain'],
-        conclusion=plan_a_data['conclusion'],
-        confidence_score=plan_a_data['confidence_score'],
-        parent_signatures=[analysis_sig.signature_id],
-        input_data=plan_a_data['context'].get('input_data', {}),
-        constraints=constraints_a,
-        alternative_paths=plan_a_data.get('alternative_paths', [])
+    result["signatures"] = [sig.to_dict() for sig in result["signatures"]]
+    if result["offset"] + limit < result["total"]:
+        result["next_offset"] = result["offset"] + limit
+    return jsonify(result)
+
+
+@app.route('/api/lineage/export', methods=['POST'])
+def export_lineages():
+    """Stream a deduplicated lineage export for many targets."""
+    orchestrator = current_orchestrator()
+    if not orchestrator:
+        return jsonify({"error": "No reasoning graph available"}), 404
+
+    data = request.json or {}
+    signature_ids = data.get('signature_ids')
+    if not signature_ids and data.get('reasoning_type'):
+        # e.g. every synthesis in the session
+        signature_ids = list(orchestrator.graph.by_type.get(data['reasoning_type'], []))
+    if not signature_ids:
+        return jsonify({"error": "signature_ids or reasoning_type required"}), 400
+
+    return Response(
+        stream_with_context(orchestrator.iter_lineages_export(signature_ids)),
+        mimetype='application/json'
     )
-    orchestrator.register_signature(plan_a_sig)
 
-    plan_b_data = planner_b.plan(
-        problem,
-        analysis_signatures=[analysis_sig.to_dict()],
-        constraints=constraints_b
-    )
-    plan_b_sig = ThoughtSignature(
-        agent_id="planner-revenue-focus",
-        reasoning_type=plan_b_data['reasoning_type'],
-        reasoning_chain=plan_b_data['reasoning_chain'],
-        conclusion=plan_b_data['conclusion'],
-        confidence_score=plan_b_data['confidence_score'],
-        parent_signatures=[analysis_sig.signature_id],
-        input_data=plan_b_data['context'].get('input_data', {}),
-        constraints=constraints_b,
-        alternative_paths=plan_b_data.get('alternative_paths', [])
-    )
-    orchestrator.register_signature(plan_b_sig)
-
-    # Detect contradictions
-    contradiction = detector.detect(plan_a_sig.to_dict(), plan_b_sig.to_dict())
-
-    synthesis_sig = None
-    if contradiction['has_contradiction'] and contradiction['severity'] > 0.5:
-        # Synthesize resolution
-        synthesis_data = synthesizer.synthesize(
-            plan_a_sig.to_dict(),
-            plan_b_sig.to_dict(),
-            contradiction
-        )
-        synthesis_sig = ThoughtSignature(
-            agent_id=synthesis_data['agent_id'],
-            reasoning_type=synthesis_data['reasoning_type'],
-            reasoning_chain=synthesis_data['reasoning_chain'],
-            conclusion=synthesis_data['conclusion'],
-            confidence_score=synthesis_data['confidence_score'],
-            parent_signatures=synthesis_data['context'].get('parent_signatures', []),
-            input_data=synthesis_data['context'].get('input_data', {}),
-            constraints=synthesis_data['context'].get('constraints', []),
-            alternative_paths=synthesis_data.get('alternative_paths', [])
+
+@app.route('/api/graph/metrics')
+def get_graph_metrics():
+    """Get lineage-aware confidence metrics for the current reasoning graph."""
+    orchestrator = current_orchestrator()
+    if not orchestrator:
+        return jsonify({"metrics": [], "weakest_links": []})
+
+    signature_id = request.args.get('signature_id')
+    result = orchestrator.get_lineage_metrics(signature_id, top=request.args.get('top', 10, type=int))
+    if "error" in result:
+        return jsonify(result), 404
+    return jsonify(result)
+
+
+@app.route('/api/graph/diff', methods=['POST'])
+def diff_graphs():
+    """Diff a saved graph snapshot against another snapshot or the current graph."""
+    orchestrator = current_orchestrator()
+    data = request.json or {}
+    base = data.get('base')
+    target = data.get('target')
+    if target is None and orchestrator:
+        target = orchestrator.get_graph_visualization_data()
+    if not base or not target:
+        return jsonify({"error": "A base graph is required, plus a target graph when no run is loaded"}), 400
+
+    engine = GraphDiff(confidence_tolerance=data.get('tolerance', 0.005))
+    try:
+        result = engine.diff(base, target)
+        if data.get('merge'):
+            result["merged"] = engine.merge(base, target)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid graph: {e}"}), 400
+    return jsonify(result)
+
+
+@app.route('/api/recompute', methods=['POST'])
+def recompute_signatures():
+    """Regenerate only the signatures downstream of an edited or re-run signature."""
+    orchestrator = current_orchestrator()
+    if not orchestrator:
+        return jsonify({"error": "No reasoning graph available"}), 404
+
+    data = request.json or {}
+    changes = data.get('changes')
+    if not changes:
+        return jsonify({"error": "changes required"}), 400
+
+    # Regenerated signatures are paid for with the caller's own key and budget,
+    # never with whatever the run that built the graph used
+    custom_api_key = data.get('api_key')
+    if not custom_api_key and not Config.is_configured():
+        return jsonify({"error": "No API key configured. Please enter your Gemini API key in the API Key field."}), 400
+    seconds, rejection = deadline_seconds(data)
+    if rejection is not None:
+        return rejection
+    tenant = request_tenant(custom_api_key)
+    priority, rejection = admit(tenant, data.get('priority', 'interactive'))
+    if rejection is not None:
+        return rejection
+
+    try:
+        caller = orchestrator.for_caller(
+            budget=RequestBudget(data.get('budget_usd')),
+            tenant=tenant,
+            priority=priority,
+            api_key=custom_api_key,
+            model=data.get('model')
         )
-        orchestrator.register_signature(synthesis_sig)
+        result = caller.recompute(changes, deadline=Deadline(seconds), max_concurrency=data.get('max_concurrency'))
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except DeadlineExceededError as e:
+        return jsonify({"error": str(e)}), 504
+    finally:
+        default_scheduler.finish(tenant, priority)
+    return jsonify(result)
+
 
-    signatures = [analysis_sig, plan_a_sig, plan_b_sig]
-    if synthesis_sig:
-        signatures.append(synthesis_sig)
+@app.route('/api/fanout/estimate', methods=['POST'])
+def estimate_fanout():
+    """Estimate calls, cost and latency of a fan-out before launching it."""
+    data = request.json
+    problem = data.get('problem', '')
+    if not problem:
+        return jsonify({"error": "Problem statement required"}), 400
 
-    return {
-        "problem": problem,
-        "mode": "parallel",
-        "signatures": [sig.to_dict() for sig in signatures],
-        "contradiction": contradiction if contradiction['has_contradiction'] else None,
-        "final_conclusion": synthesis_sig.conclusion if synthesis_sig else plan_a_sig.conclusion,
-        "graph": orchestrator.get_graph_visualization_data()
-    }
+    try:
+        estimate = ThoughtLineageOrchestrator().estimate_fanout_cost(
+            problem,
+            data.get('focus_profiles') or ["growth", "revenue"],
+            constraints=data.get('constraints'),
+            max_concurrency=data.get('max_concurrency')
+        )
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(estimate)
+
+
+@app.route('/api/routing/stats')
+def get_routing_stats():
+    """Get the model routing policy, live per-model latency and cost stats, call coalescing and scheduler counts."""
+    stats = default_router.snapshot()
+    stats["coalescing"] = default_flight.stats()
+    stats["scheduler"] = default_scheduler.stats()
+    return jsonify(stats)
+
+
+@app.route('/api/profiles')
+def list_profiles():
+    """Get top-N summaries of recently profiled requests in this worker."""
+    return jsonify({"profiles": profiler.summaries(request.args.get('top', type=int))})
+
+
+@app.route('/api/profiles/<profile_id>')
+def get_profile(profile_id):
+    """Get one profile summary, or its flamegraph input with ?format=folded."""
+    summary = profiler.get(profile_id)
+    if summary is None:
+        return jsonify({"error": "Profile not found"}), 404
+    if request.args.get('format') in ('folded', 'cprofile'):
+        extension = 'folded' if request.args['format'] == 'folded' else 'prof'
+        path = profiler.path(profile_id, extension)
+        if not os.path.exists(path):
+            return jsonify({"error": f"No {request.args['format']} output for this profile"}), 404
+        return send_file(path, as_attachment=True)
+    return jsonify(summary)
+
+
+def run_parallel_demo(orchestrator, problem, reuse_analysis=None, deadline=None):
+    """Run parallel planning demo with contradiction detection."""
+    # Two planners with COMPETING INCENTIVES, fanned out from one shared analysis
+    results = orchestrator.run_competing_plans(
+        problem,
+        ["growth", "revenue"],
+        reuse_analysis=reuse_analysis,
+        deadline=deadline
+    )
+    results["mode"] = "parallel"
+    # Without a synthesis the demo answers with plan A (the growth planner),
+    # not with the highest-confidence plan the general fan-out falls back to
+    if not results["contradictions"]:
+        plan_a = next((sig for sig in results["signatures"] if sig["agent_id"] == "planner-growth-focus"), None)
+        if plan_a is not None:
+            results["final_conclusion"] = plan_a["conclusion"]
+    return results
 
 
 if __name__ == '__main__':
-    import os
     print("\n" + "="*80)
     print(" THOUGHT LINEAGE ORCHESTRATOR - Web Interface")
     print("="*80)
@@ -0,0 +1,249 @@
+"""
+Batch runner for processing many problems offline from a JSONL file.
+
+Each input line is a JSON object:
+    {"id": "p-1", "problem": "...", "constraints": ["..."], "mode": "sequential"}
+
+Only "problem" is required. "mode" may be sequential, parallel or fanout
+(with optional "focus_profiles"), and "reuse_analysis" may be auto, offer or
+never; ids default to the line number.
+
+Usage:
+    python batch.py problems.jsonl --output results.jsonl --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, Optional, Set
+
+from config import Config
+from graph import SignatureArchive
+from intelligence import ProblemIndex, ContradictionIndex
+
+
+def iter_problems(input_path: str, skip_ids: Set[str]) -> Iterator[Dict]:
+    """Stream problem records from a JSONL file, skipping already completed ids."""
+    with open(input_path) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[WARNING] Skipping line {line_number}: invalid JSON ({e})", file=sys.stderr)
+                continue
+            if not record.get("problem"):
+                print(f"[WARNING] Skipping line {line_number}: missing 'problem'", file=sys.stderr)
+                continue
+            record["id"] = str(record.get("id", line_number))
+            if record["id"] in skip_ids:
+                continue
+            yield record
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    """Read the ids of problems completed by previous runs."""
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path) as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def process_record(record: Dict, problem_index=None, contradiction_index=None, tenant: str = "batch") -> Dict:
+    """Run a single problem through a fresh orchestrator, its model calls scheduled at batch priority."""
+    from orchestrator import ThoughtLineageOrchestrator
+
+    orchestrator = ThoughtLineageOrchestrator(
+        problem_index=problem_index,
+        contradiction_index=contradiction_index,
+        tenant=tenant,
+        priority="batch"
+    )
+    mode = record.get("mode", "sequential")
+    problem = record["problem"]
+    constraints = record.get("constraints")
+
+    if mode == "sequential":
+        return orchestrator.process_problem(problem, constraints, reuse_analysis=record.get("reuse_analysis"))
+    if mode in ("parallel", "fanout"):
+        return orchestrator.run_competing_plans(
+            problem,
+            record.get("focus_profiles") or ["growth", "revenue"],
+            constraints=constraints,
+            max_concurrency=record.get("max_concurrency"),
+            reuse_analysis=record.get("reuse_analysis")
+        )
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+class BatchRunner:
+    """Processes a JSONL problem file with bounded concurrency and checkpointing."""
+
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        graphs_path: Optional[str] = None,
+        workers: int = 4,
+        archive_path: Optional[str] = None
+    ):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.graphs_path = graphs_path
+        self.workers = max(1, workers)
+        # One set of indexes for the whole run so repeated problems share analyses and reports
+        self.problem_index = ProblemIndex(Config.PROBLEM_INDEX_PATH)
+        self.contradiction_index = ContradictionIndex(Config.CONTRADICTION_INDEX_PATH)
+        # Columnar history of every run's signatures, appended as results are written
+        self.archive = SignatureArchive(archive_path) if archive_path else None
+        # Scheduler tenant shared by every problem of this run
+        self.tenant = f"batch:{os.path.basename(input_path)}"
+        self.completed = 0
+        self.failed = 0
+        self.archive_failed = 0
+
+    def run(self) -> Dict:
+        """
+        Process every pending problem and stream results to disk.
+
+        Results are appended as they finish, so completion order may differ
+        from input order. An id is checkpointed only after its result line has
+        been flushed; failed problems are not checkpointed and are retried on
+        the next run.
+
+        Returns:
+            Summary dictionary with counts and throughput
+        """
+        done_ids = load_checkpoint(self.checkpoint_path)
+        if done_ids:
+            print(f"[BATCH] Resuming: {len(done_ids)} problems already completed")
+
+        problems = iter_problems(self.input_path, done_ids)
+        started = time.monotonic()
+
+        with open(self.output_path, "a") as output, \
+                open(self.checkpoint_path, "a") as checkpoint, \
+                (open(self.graphs_path, "a") if self.graphs_path else _NullFile()) as graphs, \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+            pending = {}
+            exhausted = False
+            while pending or not exhausted:
+                # Keep at most `workers` problems in flight so the input is streamed, not loaded
+                while not exhausted and len(pending) < self.workers:
+                    record = next(problems, None)
+                    if record is None:
+                        exhausted = True
+                        break
+                    future = pool.submit(
+                        process_record, record, self.problem_index, self.contradiction_index, self.tenant
+                    )
+                    pending[future] = (record, time.monotonic())
+
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record, submitted = pending.pop(future)
+                    self._write_result(future, record, submitted, output, checkpoint, graphs)
+                    self._report_progress(started)
+
+        elapsed = time.monotonic() - started
+        summary = {
+            "completed": self.completed,
+            "failed": self.failed,
+            "archive_failed": self.archive_failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "problems_per_minute": round(self.completed * 60 / elapsed, 2) if elapsed else 0.0
+        }
+        print(f"[BATCH] Finished: {json.dumps(summary)}")
+        return summary
+
+    def _write_result(self, future, record, submitted, output, checkpoint, graphs):
+        """
+        Append one result line and checkpoint its id on success.
+
+        A failed archive append does not fail the problem: the result is still
+        written and checkpointed with its "archive_error", and the record can
+        be archived later from the results file (signature_archive.py add).
+        """
+        line = {"id": record["id"], "duration_seconds": round(time.monotonic() - submitted, 2)}
+        try:
+            result = future.result()
+        except Exception as e:
+            self.failed += 1
+            line.update({"status": "error", "error": str(e)})
+            print(f"[ERROR] Problem {record['id']} failed: {e}", file=sys.stderr)
+            output.write(json.dumps(line) + "\n")
+            output.flush()
+            return
+
+        if self.archive is not None:
+            try:
+                self.archive.append(result, record["id"])
+            except Exception as e:
+                self.archive_failed += 1
+                line["archive_error"] = str(e)
+                print(f"[ERROR] Problem {record['id']} could not be archived: {e}", file=sys.stderr)
+        if self.graphs_path:
+            graphs.write(json.dumps({"id": record["id"], "graph": result.pop("graph")}) + "\n")
+            graphs.flush()
+
+        line.update({"status": "ok", "result": result})
+        output.write(json.dumps(line) + "\n")
+        output.flush()
+        os.fsync(output.fileno())
+
+        checkpoint.write(record["id"] + "\n")
+        checkpoint.flush()
+        self.completed += 1
+
+    def _report_progress(self, started: float):
+        """Print running throughput."""
+        elapsed = time.monotonic() - started
+        rate = self.completed * 60 / elapsed if elapsed else 0.0
+        print(f"[BATCH] {self.completed} done, {self.failed} failed | {elapsed:.1f}s elapsed | {rate:.2f} problems/min")
+
+
+class _NullFile:
+    """Stand-in context manager when graphs are kept inline with results."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Process a JSONL file of problems through the TLO pipeline.")
+    parser.add_argument("input", help="JSONL file with one problem per line")
+    parser.add_argument("--output", "-o", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="File of completed ids (default: <output>.checkpoint)")
+    parser.add_argument("--graphs", help="Write reasoning graphs to this JSONL file instead of inline")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Problems processed concurrently")
+    parser.add_argument("--archive", help="Also append every run's signatures to this columnar archive directory")
+    args = parser.parse_args(argv)
+
+    Config.validate()
+
+    summary = BatchRunner(
+        args.input,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        graphs_path=args.graphs,
+        workers=args.workers,
+        archive_path=args.archive
+    ).run()
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
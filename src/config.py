@@ -2,12 +2,23 @@
 Configuration module for Thought Lineage Orchestrator.
 Manages API keys and environment settings.
 """
+import json
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean TLO_* setting; 1, true and yes (any case) turn it on."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes')
+
+
 class Config:
     """Configuration class for TLO system."""
 
@@ -21,6 +32,123 @@ class Config:
     MAX_REASONING_STEPS = 10
     DEFAULT_TEMPERATURE = 0.7
 
+    # Competing-planner fan-out settings
+    MAX_PARALLEL_AGENTS = int(os.getenv('TLO_MAX_PARALLEL_AGENTS', 8))
+    CONTRADICTION_SEVERITY_THRESHOLD = 0.5
+
+    # Near-duplicate problem detection: "auto" reuses a cached analysis,
+    # "offer" reports the match but re-runs the analyzer, "never" disables lookup
+    ANALYSIS_REUSE_MODE = os.getenv('TLO_ANALYSIS_REUSE', 'offer')
+    PROBLEM_SIMILARITY_THRESHOLD = 0.75
+    PROBLEM_INDEX_PATH = os.getenv('TLO_PROBLEM_INDEX_PATH')  # Unset keeps the index in memory
+
+    # Pairs whose reasoning chains and conclusions align at or above this TF-IDF
+    # similarity skip the model call entirely (None disables the fast path)
+    ALIGNMENT_FAST_PATH_SIMILARITY = 0.75
+
+    # Two-tier detection: a severity-only probe per pair, with the full collision
+    # report generated only when the probe lands above the threshold minus this margin
+    TWO_TIER_DETECTION = env_flag('TLO_TWO_TIER_DETECTION', False)
+    SEVERITY_PROBE_MARGIN = 0.1
+
+    # Incremental detection: compare each plan as it is registered, in the background,
+    # against its siblings ("siblings") or the latest signatures of its type ("type")
+    INCREMENTAL_DETECTION = env_flag('TLO_INCREMENTAL_DETECTION', False)
+    INCREMENTAL_DETECTION_SCOPE = os.getenv('TLO_INCREMENTAL_DETECTION_SCOPE', 'siblings')
+    INCREMENTAL_DETECTION_MAX_CANDIDATES = 8
+
+    # Persistent cache of contradiction reports keyed by pair fingerprint
+    CONTRADICTION_INDEX_PATH = os.getenv('TLO_CONTRADICTION_INDEX_PATH')  # Unset keeps the index in memory
+
+    # Per-phase model routing. Phases map to tiers; "default" is GEMINI_MODEL
+    MODEL_ROUTING_ENABLED = env_flag('TLO_MODEL_ROUTING', False)
+    MODEL_ROUTING = {
+        "tiers": {
+            "fast": 'gemini-3-flash-preview',
+            "strong": 'gemini-2.5-pro'
+        },
+        "phases": {
+            "analysis": "fast",
+            "decision": "default",
+            "evaluation": "fast",
+            "detection": "fast",
+            "synthesis": "default"
+        },
+        # Synthesis of contradictions at or above this severity uses the strong tier
+        "escalate_synthesis_severity": 0.8,
+        # Prefer the fastest model when a model's live average latency exceeds this
+        "max_call_latency_seconds": None
+    }
+
+    # End-to-end request deadline, kept under the 120s gunicorn worker timeout.
+    # Below DEADLINE_COMPACT_PROMPT_SECONDS remaining, agents send compact prompts
+    REQUEST_DEADLINE_SECONDS = float(os.getenv('TLO_REQUEST_DEADLINE_SECONDS', 100))
+    DEADLINE_COMPACT_PROMPT_SECONDS = 45.0
+
+    # Start each sequential agent as soon as its parent's conclusion has streamed in
+    SPECULATIVE_EXECUTION = env_flag('TLO_SPECULATIVE_EXECUTION', False)
+
+    # Split execution planning into this many concurrent workstreams (1 runs a single executor)
+    EXECUTOR_SHARDS = int(os.getenv('TLO_EXECUTOR_SHARDS', 1))
+
+    # Derive signature ids from a hash of the reasoning content instead of uuid4,
+    # so identical reasoning produced twice merges into one graph node
+    CONTENT_ADDRESSED_IDS = env_flag('TLO_CONTENT_ADDRESSED_IDS', False)
+
+    # Concurrent model calls with the same prompt, model and temperature share one request
+    COALESCE_MODEL_CALLS = env_flag('TLO_COALESCE_MODEL_CALLS', True)
+
+    # Fair scheduling of model calls: concurrent calls per process, slots batch work
+    # may not take from interactive requests, waiting calls per class beyond which new
+    # requests are turned away, and relative weights per tenant, e.g. '{"key:3f2a9c1b0d4e": 2}'
+    SCHEDULE_MODEL_CALLS = env_flag('TLO_SCHEDULE_MODEL_CALLS', True)
+    SCHEDULER_CONCURRENCY = int(os.getenv('TLO_SCHEDULER_CONCURRENCY', 16))
+    SCHEDULER_INTERACTIVE_RESERVE = int(os.getenv('TLO_SCHEDULER_INTERACTIVE_RESERVE', 4))
+    SCHEDULER_MAX_QUEUE = int(os.getenv('TLO_SCHEDULER_MAX_QUEUE', 64))
+    SCHEDULER_WEIGHTS = json.loads(os.getenv('TLO_SCHEDULER_WEIGHTS', '{}'))
+    # Priority is decided by the server: requests in flight per tenant that may run as
+    # interactive (further ones run as batch), and tenants pinned to a class, e.g. '{"key:3f2a9c1b0d4e": "batch"}'
+    SCHEDULER_INTERACTIVE_PER_TENANT = int(os.getenv('TLO_SCHEDULER_INTERACTIVE_PER_TENANT', 2))
+    SCHEDULER_TENANT_PRIORITIES = json.loads(os.getenv('TLO_SCHEDULER_TENANT_PRIORITIES', '{}'))
+
+    # SQLite file holding the current graph for multi-worker serving (unset keeps it per process)
+    SHARED_STATE_PATH = os.getenv('TLO_SHARED_STATE_PATH')
+
+    # Live graph events: events a viewer may fall behind before it is dropped,
+    # events kept per session for replay on reconnect, and the keep-alive interval
+    EVENT_QUEUE_SIZE = int(os.getenv('TLO_EVENT_QUEUE_SIZE', 256))
+    EVENT_HISTORY = int(os.getenv('TLO_EVENT_HISTORY', 1000))
+    EVENT_HEARTBEAT_SECONDS = 15.0
+    # Longest an event stream stays open before the viewer reconnects; keeps a
+    # stream from holding a sync worker past the gunicorn timeout
+    EVENT_STREAM_SECONDS = float(os.getenv('TLO_EVENT_STREAM_SECONDS', 60))
+    # Whether the page follows a run over its event stream. The stream is open
+    # while /api/process runs, so it needs a server that serves both at once
+    # (python app.py, or gunicorn with gthread/gevent workers); a single sync
+    # worker would sit on the stream while the run waits behind it
+    LIVE_EVENTS = env_flag('TLO_LIVE_EVENTS', False)
+
+    # Level-of-detail graph summaries: nodes per view and conclusion length
+    GRAPH_SUMMARY_MAX_NODES = int(os.getenv('TLO_GRAPH_SUMMARY_MAX_NODES', 200))
+    GRAPH_SUMMARY_CONCLUSION_CHARS = 160
+
+    # Request profiling: fraction of /api/process requests profiled (requests can
+    # also opt in with "profile": true); profiles are written to PROFILE_DIR
+    PROFILE_SAMPLE_RATE = float(os.getenv('TLO_PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('TLO_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'tlo-profiles'))
+    PROFILE_SAMPLE_INTERVAL_SECONDS = 0.005
+
+    # Rough figures used to estimate cost and latency before launching a fan-out
+    ESTIMATED_OUTPUT_TOKENS = {"signature": 1500, "detection": 600, "synthesis": 1800}
+    ESTIMATED_CALL_LATENCY_SECONDS = 12.0
+    # USD per 1M tokens as (input, output); unknown models fall back to the default model
+    MODEL_PRICING = {
+        'gemini-3-flash-preview': (0.50, 3.00),
+        'gemini-2.5-flash': (0.30, 2.50),
+        'gemini-2.5-pro': (1.25, 10.00),
+        'gemini-2.0-flash-exp': (0.10, 0.40)
+    }
+
     @classmethod
     def validate(cls):
         """Validate that required configuration is present."""
@@ -0,0 +1,11 @@
+"""
+Graph tooling package initialization.
+"""
+from graph.analytics import LineageAnalytics
+from graph.archive import SignatureArchive
+from graph.diff import GraphDiff
+from graph.events import GraphEventBus
+from graph.store import SharedGraphStore
+from graph.summary import GraphSummarizer
+
+__all__ = ['LineageAnalytics', 'GraphDiff', 'GraphEventBus', 'GraphSummarizer', 'SharedGraphStore', 'SignatureArchive']
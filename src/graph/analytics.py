@@ -0,0 +1,328 @@
+"""
+Lineage Analytics - Confidence propagation and weakest-link metrics over the reasoning graph.
+"""
+from itertools import islice
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Batches larger than this are recompiled level by level instead of node by node
+_INCREMENTAL_BATCH_LIMIT = 256
+
+
+class LineageAnalytics:
+    """
+    Compiles a ReasoningGraph into CSR parent adjacency and computes lineage-aware metrics.
+
+    For every node:
+      - propagated_confidence: own confidence times the weakest propagated
+        confidence among its parents (the product along the weakest ancestor path)
+      - lineage_min_confidence: minimum confidence over the node and all ancestors
+      - weakest_upstream: the ancestor (or the node itself) holding that minimum
+      - critical_parent: the parent whose lineage determines propagated_confidence;
+        following it back to a root gives the node's critical path
+      - depth: length of the longest path from a root
+
+    Metrics are computed in one topological pass that processes each level as
+    a vectorized NumPy reduction over CSR segments. Nodes appended to the graph
+    afterwards are folded in incrementally by update().
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.compile()
+
+    def compile(self):
+        """(Re)build the CSR adjacency and all metrics from the current graph."""
+        signatures = list(self.graph.nodes.values())
+        self.ids: List[str] = [sig.signature_id for sig in signatures]
+        self.index: Dict[str, int] = {sig_id: i for i, sig_id in enumerate(self.ids)}
+        # Parent ids referenced before they exist; their arrival forces a recompile
+        self._dangling = set()
+        # Merges add parent edges to existing nodes, which the append path cannot express
+        self._merges = self.graph.merges
+        n = len(self.ids)
+
+        parent_lists = [self._parent_indices(sig) for sig in signatures]
+
+        counts = np.fromiter((len(p) for p in parent_lists), dtype=np.int64, count=n)
+        self._size = n
+        self._capacity = max(16, n)
+        self._edge_count = int(counts.sum())
+        self._edge_capacity = max(16, self._edge_count)
+
+        self.indptr = np.zeros(self._capacity + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:n + 1])
+        self.indices = np.zeros(self._edge_capacity, dtype=np.int64)
+        if self._edge_count:
+            self.indices[:self._edge_count] = np.fromiter(
+                (p for parents in parent_lists for p in parents), dtype=np.int64, count=self._edge_count
+            )
+
+        self.confidence = np.zeros(self._capacity, dtype=np.float64)
+        self.confidence[:n] = [self._confidence(sig) for sig in signatures]
+        self.propagated = np.zeros(self._capacity, dtype=np.float64)
+        self.lineage_min = np.zeros(self._capacity, dtype=np.float64)
+        self.weakest = np.zeros(self._capacity, dtype=np.int64)
+        self.critical_parent = np.full(self._capacity, -1, dtype=np.int64)
+        self.depth = np.zeros(self._capacity, dtype=np.int64)
+
+        for level in self._topological_levels():
+            self._compute_level(level)
+
+    def update(self) -> int:
+        """
+        Fold signatures added to the graph since the last compile/update into the metrics.
+
+        Returns:
+            Number of newly incorporated signatures
+        """
+        added = len(self.graph.nodes) - self._size
+        if added < 0 or self.graph.merges != self._merges:
+            # Signatures were removed or gained parents; positions or edges are stale
+            self.compile()
+            return max(added, 0)
+        if added == 0:
+            return 0
+        # Walk from the end so the cost tracks the number of new nodes, not the graph size
+        new_signatures = list(islice(reversed(self.graph.nodes.values()), added))[::-1]
+
+        batch_ids = {sig.signature_id for sig in new_signatures}
+        needs_recompile = len(new_signatures) > _INCREMENTAL_BATCH_LIMIT
+        seen = set()
+        for sig in new_signatures:
+            if needs_recompile:
+                break
+            # A node that earlier nodes already pointed at, or a parent that only
+            # arrives later in this batch, breaks the append-in-topological-order fast path
+            needs_recompile = sig.signature_id in self._dangling or any(
+                parent_id in batch_ids and parent_id not in seen
+                for parent_id in sig.context["parent_signatures"]
+            )
+            seen.add(sig.signature_id)
+
+        if needs_recompile:
+            self.compile()
+            return len(new_signatures)
+
+        for sig in new_signatures:
+            self._append(sig)
+        return len(new_signatures)
+
+    def metrics(self, signature_id: str) -> Optional[Dict]:
+        """Lineage metrics for one signature, or None if it is not in the graph."""
+        self.update()
+        i = self.index.get(signature_id)
+        if i is None:
+            return None
+        return self._metrics_at(i)
+
+    def all_metrics(self) -> List[Dict]:
+        """Lineage metrics for every signature, in graph order."""
+        self.update()
+        return [self._metrics_at(i) for i in range(self._size)]
+
+    def critical_path(self, signature_id: str) -> List[str]:
+        """Signature ids from the root to the given signature along critical parents."""
+        self.update()
+        i = self.index.get(signature_id)
+        path = []
+        while i is not None and i >= 0:
+            path.append(self.ids[i])
+            i = int(self.critical_parent[i])
+        return list(reversed(path))
+
+    def weakest_links(self, top: int = 10) -> List[Dict]:
+        """Signatures with the lowest propagated confidence."""
+        self.update()
+        n = self._size
+        top = min(top, n)
+        if top <= 0:
+            return []
+        order = np.argpartition(self.propagated[:n], top - 1)[:top]
+        order = order[np.argsort(self.propagated[order], kind="stable")]
+        return [self._metrics_at(int(i)) for i in order]
+
+    def _metrics_at(self, i: int) -> Dict:
+        critical_parent = int(self.critical_parent[i])
+        return {
+            "signature_id": self.ids[i],
+            "confidence": float(self.confidence[i]),
+            "propagated_confidence": float(self.propagated[i]),
+            "lineage_min_confidence": float(self.lineage_min[i]),
+            "weakest_upstream": self.ids[int(self.weakest[i])],
+            "critical_parent": self.ids[critical_parent] if critical_parent >= 0 else None,
+            "depth": int(self.depth[i])
+        }
+
+    def _parent_indices(self, sig) -> List[int]:
+        """Indices of compiled parents; missing parent ids are remembered as dangling."""
+        parents = []
+        for parent_id in sig.context["parent_signatures"]:
+            if parent_id in self.index:
+                parents.append(self.index[parent_id])
+            else:
+                self._dangling.add(parent_id)
+        return parents
+
+    @staticmethod
+    def _confidence(sig) -> float:
+        try:
+            return float(sig.confidence_score)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _topological_levels(self) -> List[np.ndarray]:
+        """Kahn's algorithm over the CSR arrays, one vectorized frontier per level."""
+        n = self._size
+        indptr = self.indptr[:n + 1]
+        parents = self.indices[:self._edge_count]
+        indegree = np.diff(indptr)
+
+        # Child adjacency (CSR transpose): edges grouped by parent
+        child_of_edge = np.repeat(np.arange(n, dtype=np.int64), indegree)
+        order = np.argsort(parents, kind="stable")
+        child_indices = child_of_edge[order]
+        child_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents, minlength=n), out=child_indptr[1:])
+
+        remaining = indegree.copy()
+        frontier = np.flatnonzero(remaining == 0)
+        levels = []
+        processed = 0
+        while frontier.size:
+            levels.append(frontier)
+            processed += frontier.size
+            children, _ = self._gather(child_indptr, child_indices, frontier)
+            if children.size == 0:
+                break
+            np.subtract.at(remaining, children, 1)
+            candidates = np.unique(children)
+            frontier = candidates[remaining[candidates] == 0]
+
+        if processed != n:
+            raise ValueError("Reasoning graph contains a cycle")
+        return levels
+
+    @staticmethod
+    def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray):
+        """
+        Concatenate the CSR segments of the given rows.
+
+        Returns:
+            Tuple of (flat values, segment lengths)
+        """
+        starts = indptr[rows]
+        lengths = indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=indices.dtype), lengths
+        # Position of each output element inside its segment, offset by the segment start
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return indices[np.arange(total) + offsets], lengths
+
+    def _compute_level(self, nodes: np.ndarray):
+        """Compute metrics for one topological level; all parents are already final."""
+        parents, lengths = self._gather(self.indptr, self.indices[:self._edge_count], nodes)
+        conf = self.confidence[nodes]
+
+        roots = lengths == 0
+        if roots.any():
+            r = nodes[roots]
+            self.propagated[r] = conf[roots]
+            self.lineage_min[r] = conf[roots]
+            self.weakest[r] = r
+            self.critical_parent[r] = -1
+            self.depth[r] = 0
+
+        inner = ~roots
+        if not inner.any():
+            return
+        nodes, conf = nodes[inner], conf[inner]
+        lengths = lengths[inner]
+        seg_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        segment = np.repeat(np.arange(nodes.size), lengths)
+
+        # Weakest propagated parent per segment (first one on ties)
+        parent_prop = self.propagated[parents]
+        prop_min = np.minimum.reduceat(parent_prop, seg_starts)
+        prop_arg = self._segment_argmin(parent_prop, prop_min, segment, nodes.size)
+        self.propagated[nodes] = conf * prop_min
+        self.critical_parent[nodes] = parents[prop_arg]
+
+        # Weakest step anywhere upstream, compared against the node's own confidence
+        parent_min = self.lineage_min[parents]
+        up_min = np.minimum.reduceat(parent_min, seg_starts)
+        up_arg = self._segment_argmin(parent_min, up_min, segment, nodes.size)
+        upstream_weakest = self.weakest[parents[up_arg]]
+        own_is_weakest = conf <= up_min
+        self.lineage_min[nodes] = np.where(own_is_weakest, conf, up_min)
+        self.weakest[nodes] = np.where(own_is_weakest, nodes, upstream_weakest)
+
+        self.depth[nodes] = np.maximum.reduceat(self.depth[parents], seg_starts) + 1
+
+    @staticmethod
+    def _segment_argmin(values: np.ndarray, seg_min: np.ndarray, segment: np.ndarray, segments: int) -> np.ndarray:
+        """Flat position of the first minimum within each segment."""
+        hits = np.flatnonzero(values == seg_min[segment])
+        _, first = np.unique(segment[hits], return_index=True)
+        if first.size != segments:
+            raise ValueError("Segment minimum lookup failed")
+        return hits[first]
+
+    def _append(self, sig):
+        """Add one signature whose parents are already compiled."""
+        parents = self._parent_indices(sig)
+        self._ensure_capacity(1, len(parents))
+
+        i = self._size
+        self.ids.append(sig.signature_id)
+        self.index[sig.signature_id] = i
+        start = self._edge_count
+        self.indices[start:start + len(parents)] = parents
+        self._edge_count += len(parents)
+        self.indptr[i + 1] = self._edge_count
+        self._size += 1
+
+        conf = self._confidence(sig)
+        self.confidence[i] = conf
+        if not parents:
+            self.propagated[i] = conf
+            self.lineage_min[i] = conf
+            self.weakest[i] = i
+            self.critical_parent[i] = -1
+            self.depth[i] = 0
+            return
+
+        parents = np.asarray(parents, dtype=np.int64)
+        critical = parents[int(np.argmin(self.propagated[parents]))]
+        self.propagated[i] = conf * self.propagated[critical]
+        self.critical_parent[i] = critical
+
+        upstream = parents[int(np.argmin(self.lineage_min[parents]))]
+        if conf <= self.lineage_min[upstream]:
+            self.lineage_min[i], self.weakest[i] = conf, i
+        else:
+            self.lineage_min[i], self.weakest[i] = self.lineage_min[upstream], self.weakest[upstream]
+        self.depth[i] = int(self.depth[parents].max()) + 1
+
+    def _ensure_capacity(self, nodes: int, edges: int):
+        """Grow the backing arrays geometrically so appends stay amortized O(1)."""
+        if self._size + nodes > self._capacity:
+            capacity = max(self._capacity * 2, self._size + nodes)
+            for name in ("confidence", "propagated", "lineage_min", "weakest", "critical_parent", "depth"):
+                old = getattr(self, name)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:self._size] = old[:self._size]
+                setattr(self, name, grown)
+            indptr = np.zeros(capacity + 1, dtype=np.int64)
+            indptr[:self._size + 1] = self.indptr[:self._size + 1]
+            self.indptr = indptr
+            self._capacity = capacity
+
+        if self._edge_count + edges > self._edge_capacity:
+            capacity = max(self._edge_capacity * 2, self._edge_count + edges)
+            indices = np.zeros(capacity, dtype=np.int64)
+            indices[:self._edge_count] = self.indices[:self._edge_count]
+            self.indices = indices
+            self._edge_capacity = capacity
@@ -0,0 +1,344 @@
+"""
+Signature Archive - Columnar, memory-mapped history of signatures across runs.
+"""
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_FORMAT_VERSION = 1
+
+# Fixed-width columns: name -> dtype. Strings are dictionary-encoded into small integer codes
+_COLUMNS = {
+    "id": "S36",
+    "agent": "<i4",
+    "type": "<i2",
+    "run": "<i4",
+    "timestamp": "<M8[us]",
+    "confidence": "<f4",
+    "contradicted": "?",
+}
+
+# Variable-length text, stored as one blob per field with the end offset of each row
+_TEXT_FIELDS = ("conclusion", "chain")
+
+_DICTIONARIES = {"agent": "agents", "type": "types", "run": "runs"}
+
+
+class SignatureArchive:
+    """
+    Append-only columnar archive of signatures from many runs.
+
+    Each column is a raw little-endian array in its own file, so readers
+    map it into memory and aggregate over millions of signatures without
+    parsing JSON or loading everything into RAM. Agents, reasoning types and
+    run labels are dictionary-encoded. Conclusions and reasoning chains live
+    in text blobs indexed by per-row end offsets, and are only read for the
+    rows asked for.
+
+    manifest.json holds the row count and the dictionaries and is replaced
+    atomically after the columns are written. A crashed append therefore
+    leaves only trailing bytes past the recorded count, which readers ignore
+    and the next append truncates. One process should append at a time.
+
+    A signature is "contradicted" when a synthesis signature has it as a
+    parent, i.e. it was one side of a detected contradiction that was
+    synthesized.
+    """
+
+    # Rows aggregated per step, bounding memory use independently of archive size
+    CHUNK_ROWS = 1 << 20
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+            if self.manifest.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported archive version {self.manifest.get('version')} in {path}")
+        else:
+            self.manifest = {"version": _FORMAT_VERSION, "rows": 0, "agents": [], "types": [], "runs": []}
+        self._codes = {
+            column: {value: code for code, value in enumerate(self.manifest[name])}
+            for column, name in _DICTIONARIES.items()
+        }
+        self._maps: Dict[str, np.ndarray] = {}
+        self._ids: Optional[set] = None
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    # Writing
+
+    def append(self, source, run: str) -> int:
+        """
+        Append the signatures of one run, skipping ids already archived.
+
+        Args:
+            source: A ReasoningGraph, a graph dict as written by save_graph,
+                or a saved /api/process response (its "graph" plus the full
+                "signatures", which carry the reasoning chains)
+            run: Label of the run, e.g. a batch record id or file name
+
+        Returns:
+            Number of signatures appended
+        """
+        if self._ids is None:
+            self._ids = {bytes(i) for i in self.column("id")}
+        rows = [row for row in self._rows(source) if row["id"].encode("utf-8") not in self._ids]
+        if not rows:
+            return 0
+
+        start = len(self)
+        self._truncate_to(start)
+        columns = {
+            "id": np.array([row["id"] for row in rows], dtype=_COLUMNS["id"]),
+            "agent": np.array([self._code("agent", row["agent"]) for row in rows], dtype=_COLUMNS["agent"]),
+            "type": np.array([self._code("type", row["type"]) for row in rows], dtype=_COLUMNS["type"]),
+            "run": np.full(len(rows), self._code("run", run), dtype=_COLUMNS["run"]),
+            "timestamp": np.array([row["timestamp"] for row in rows], dtype=_COLUMNS["timestamp"]),
+            "confidence": np.array([row["confidence"] for row in rows], dtype=_COLUMNS["confidence"]),
+            "contradicted": np.array([row["contradicted"] for row in rows], dtype=_COLUMNS["contradicted"]),
+        }
+        for name, values in columns.items():
+            with open(self._file(name), "ab") as f:
+                f.write(values.tobytes())
+
+        for field in _TEXT_FIELDS:
+            base = int(self._text_ends(field)[-1]) if start else 0
+            encoded = [row[field].encode("utf-8") for row in rows]
+            ends = base + np.cumsum([len(text) for text in encoded], dtype=np.int64)
+            with open(self._file(field), "ab") as f:
+                f.write(b"".join(encoded))
+            with open(self._file(f"{field}.offsets"), "ab") as f:
+                f.write(ends.astype("<i8").tobytes())
+
+        self.manifest["rows"] = start + len(rows)
+        self._write_manifest()
+        self._ids.update(row["id"].encode("utf-8") for row in rows)
+        self._maps.clear()
+        return len(rows)
+
+    def _rows(self, source) -> Iterator[Dict]:
+        """Normalize any accepted source into archive rows."""
+        if hasattr(source, "nodes") and not isinstance(source, dict):
+            with source.lock:
+                signatures = list(source.nodes.values())
+            synthesized = {
+                parent_id
+                for sig in signatures if sig.reasoning_type == "synthesis"
+                for parent_id in sig.context["parent_signatures"]
+            }
+            for sig in signatures:
+                yield self._row(sig.signature_id, sig.agent_id, sig.reasoning_type, sig.timestamp,
+                                sig.confidence_score, sig.conclusion, sig.reasoning_chain, sig.signature_id in synthesized)
+            return
+
+        snapshot = source.get("graph", source)
+        full = {sig["signature_id"]: sig for sig in source.get("signatures", []) if "signature_id" in sig}
+        types = {node["id"]: node["type"] for node in snapshot["nodes"]}
+        synthesized = {edge["source"] for edge in snapshot["edges"] if types.get(edge["target"]) == "synthesis"}
+        for node in snapshot["nodes"]:
+            chain = full.get(node["id"], {}).get("reasoning_chain", [])
+            yield self._row(node["id"], node["agent"], node["type"], node["timestamp"],
+                            node["confidence"], node["conclusion"], chain, node["id"] in synthesized)
+
+    @staticmethod
+    def _row(signature_id, agent, reasoning_type, timestamp, confidence, conclusion, chain, contradicted) -> Dict:
+        return {
+            "id": signature_id,
+            "agent": agent,
+            "type": reasoning_type,
+            "timestamp": np.datetime64(timestamp, "us"),
+            "confidence": float(confidence),
+            "conclusion": str(conclusion),
+            "chain": json.dumps(chain, separators=(",", ":")) if chain else "",
+            "contradicted": contradicted,
+        }
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        if value not in codes:
+            codes[value] = len(codes)
+            self.manifest[_DICTIONARIES[column]].append(value)
+        return codes[value]
+
+    def _truncate_to(self, rows: int):
+        """Drop bytes a crashed append left past the recorded row count."""
+        ends = {field: int(self._text_ends(field)[-1]) if rows else 0 for field in _TEXT_FIELDS}
+        sizes = {name: rows * np.dtype(dtype).itemsize for name, dtype in _COLUMNS.items()}
+        sizes.update({f"{field}.offsets": rows * 8 for field in _TEXT_FIELDS})
+        sizes.update(ends)
+        self._maps.clear()
+        for name, size in sizes.items():
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.path, "manifest.json")
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    # Reading
+
+    def column(self, name: str) -> np.ndarray:
+        """A read-only memory-mapped column (id, agent, type, run, timestamp, confidence, contradicted)."""
+        if name not in self._maps:
+            rows = len(self)
+            if rows == 0:
+                self._maps[name] = np.empty(0, dtype=_COLUMNS[name])
+            else:
+                self._maps[name] = np.memmap(self._file(name), dtype=_COLUMNS[name], mode="r", shape=(rows,))
+        return self._maps[name]
+
+    def dictionary(self, column: str) -> List[str]:
+        """Values of a dictionary-encoded column (agent, type, run), indexed by code."""
+        return self.manifest[_DICTIONARIES[column]]
+
+    def find(self, signature_id: str) -> Optional[int]:
+        """Row number of a signature id, if archived."""
+        needle = np.array(signature_id, dtype=_COLUMNS["id"])
+        for start, stop in self._chunks():
+            hits = np.flatnonzero(self.column("id")[start:stop] == needle)
+            if hits.size:
+                return start + int(hits[0])
+        return None
+
+    def signature(self, row: int) -> Dict:
+        """One archived signature, with its conclusion and reasoning chain read from the blobs."""
+        chain = self._text("chain", row)
+        return {
+            "signature_id": self.column("id")[row].decode("utf-8"),
+            "agent_id": self.dictionary("agent")[self.column("agent")[row]],
+            "reasoning_type": self.dictionary("type")[self.column("type")[row]],
+            "run": self.dictionary("run")[self.column("run")[row]],
+            "timestamp": str(self.column("timestamp")[row]),
+            "confidence_score": round(float(self.column("confidence")[row]), 6),
+            "contradicted": bool(self.column("contradicted")[row]),
+            "conclusion": self._text("conclusion", row),
+            "reasoning_chain": json.loads(chain) if chain else [],
+        }
+
+    def confidence_distribution(
+        self,
+        by: str = "agent",
+        bins: int = 10,
+        reasoning_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Dict]:
+        """
+        Confidence histogram, mean and count per agent, reasoning type or run.
+
+        Args:
+            by: Column to group by (agent, type or run)
+            bins: Number of equal-width confidence bins over [0, 1]
+            reasoning_type: Only count signatures of this type
+            since: Only count signatures at or after this ISO timestamp
+            until: Only count signatures before this ISO timestamp
+
+        Returns:
+            Dictionary of group value -> {"count", "mean", "histogram"}
+        """
+        groups = len(self.dictionary(by))
+        counts = np.zeros(groups * bins, dtype=np.int64)
+        sums = np.zeros(groups, dtype=np.float64)
+        for start, stop in self._chunks():
+            codes, mask = self._select(start, stop, by, reasoning_type, since, until)
+            confidence = self.column("confidence")[start:stop][mask]
+            codes = codes[mask]
+            slot = np.minimum((confidence * bins).astype(np.int64), bins - 1)
+            counts += np.bincount(codes * bins + slot, minlength=groups * bins)
+            sums += np.bincount(codes, weights=confidence, minlength=groups)
+
+        counts = counts.reshape(groups, bins)
+        result = {}
+        for code, value in enumerate(self.dictionary(by)):
+            total = int(counts[code].sum())
+            if total:
+                result[value] = {
+                    "count": total,
+                    "mean": round(float(sums[code]) / total, 4),
+                    "histogram": counts[code].tolist()
+                }
+        return result
+
+    def contradiction_rates(
+        self,
+        by: str = "agent",
+        reasoning_type: Optional[str] = "decision",
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> Dict[str, Dict]:
+        """
+        Share of signatures that ended up on one side of a synthesized contradiction.
+
+        With the defaults this is the contradiction rate per planner, i.e. per focus.
+
+        Returns:
+            Dictionary of group value -> {"count", "contradicted", "rate"}
+        """
+        groups = len(self.dictionary(by))
+        counts = np.zeros(groups, dtype=np.int64)
+        contradicted = np.zeros(groups, dtype=np.int64)
+        for start, stop in self._chunks():
+            codes, mask = self._select(start, stop, by, reasoning_type, since, until)
+            flags = self.column("contradicted")[start:stop][mask]
+            codes = codes[mask]
+            counts += np.bincount(codes, minlength=groups)
+            contradicted += np.bincount(codes[flags], minlength=groups)
+
+        return {
+            value: {
+                "count": int(counts[code]),
+                "contradicted": int(contradicted[code]),
+                "rate": round(int(contradicted[code]) / int(counts[code]), 4)
+            }
+            for code, value in enumerate(self.dictionary(by))
+            if counts[code]
+        }
+
+    def _select(self, start, stop, by, reasoning_type, since, until) -> Tuple[np.ndarray, np.ndarray]:
+        """Group codes of a chunk and the mask of rows passing the filters."""
+        codes = self.column(by)[start:stop].astype(np.int64)
+        mask = np.ones(stop - start, dtype=bool)
+        if reasoning_type is not None:
+            type_code = self._codes["type"].get(reasoning_type)
+            if type_code is None:
+                return codes, np.zeros(stop - start, dtype=bool)
+            mask &= self.column("type")[start:stop] == type_code
+        if since is not None:
+            mask &= self.column("timestamp")[start:stop] >= np.datetime64(since, "us")
+        if until is not None:
+            mask &= self.column("timestamp")[start:stop] < np.datetime64(until, "us")
+        return codes, mask
+
+    def _chunks(self) -> Iterable[Tuple[int, int]]:
+        rows = len(self)
+        return ((start, min(start + self.CHUNK_ROWS, rows)) for start in range(0, rows, self.CHUNK_ROWS))
+
+    def _text_ends(self, field: str) -> np.ndarray:
+        name = f"{field}.offsets"
+        if name not in self._maps:
+            self._maps[name] = np.memmap(self._file(name), dtype="<i8", mode="r", shape=(len(self),))
+        return self._maps[name]
+
+    def _text(self, field: str, row: int) -> str:
+        ends = self._text_ends(field)
+        start = int(ends[row - 1]) if row else 0
+        end = int(ends[row])
+        if end == start:
+            return ""
+        with open(self._file(field), "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode("utf-8")
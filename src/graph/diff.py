@@ -0,0 +1,294 @@
+"""
+Graph Diff - Structural diff and merge of two reasoning graph snapshots.
+"""
+import heapq
+from typing import Dict, List, Optional
+
+
+def _confidence(node: Dict) -> float:
+    try:
+        return float(node.get("confidence") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class GraphDiff:
+    """
+    Matches the nodes of two graph snapshots by lineage position and reports what changed.
+
+    A node's position is a hash of its agent, reasoning type and its parents'
+    positions, so the analyzer -> planner -> executor chain of one run lines
+    up with the same chain of another run even though every id differs.
+    Repeated positions (the same problem run twice in one session) are told
+    apart by timestamp order.
+
+    Each node also gets a lineage digest: a hash over its own conclusion and
+    confidence and its parents' digests. Equal digests mean the node and its
+    entire ancestry are unchanged, so the comparison walks back from the
+    sinks and skips every lineage whose digest matches. Both hashes are built
+    in one topological pass, keeping diff and merge near-linear in graph size.
+    """
+
+    # Lineage labels in reports show at most this many trailing agents
+    LABEL_DEPTH = 6
+
+    def __init__(self, confidence_tolerance: float = 0.005, preview_chars: int = 200):
+        self.confidence_tolerance = confidence_tolerance
+        self.preview_chars = preview_chars
+
+    def index(self, graph) -> Dict:
+        """
+        Hash a graph snapshot by lineage position.
+
+        Args:
+            graph: A ReasoningGraph, or a dict in ReasoningGraph.to_dict() format
+
+        Returns:
+            Dictionary with nodes, parents, topological order, and per-node
+            position, digest and repeat ordinal. Positions and digests use
+            Python's salted hash, so they are only comparable within one process
+        """
+        snapshot = graph.to_dict() if hasattr(graph, "to_dict") else graph
+        nodes = {node["id"]: node for node in snapshot["nodes"]}
+        parents: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+        children: Dict[str, List[str]] = {node_id: [] for node_id in nodes}
+        dangling: Dict[str, int] = {node_id: 0 for node_id in nodes}
+        for edge in snapshot["edges"]:
+            source, target = edge["source"], edge["target"]
+            if target not in nodes:
+                continue
+            if source in nodes:
+                parents[target].append(source)
+                children[source].append(target)
+            else:
+                # Parent outside the snapshot still distinguishes the position
+                dangling[target] += 1
+
+        # Kahn's algorithm, releasing ready nodes in timestamp order so that
+        # repeated positions are numbered the same way in both snapshots
+        remaining = {node_id: len(p) for node_id, p in parents.items()}
+        ready = [(str(nodes[i].get("timestamp", "")), i) for i, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        position, digest, ordinals = {}, {}, {}
+        occurrences: Dict[str, int] = {}
+        while ready:
+            _, node_id = heapq.heappop(ready)
+            order.append(node_id)
+            node = nodes[node_id]
+            node_parents = parents[node_id]
+
+            base = hash((
+                node.get("agent"),
+                node.get("type"),
+                dangling[node_id],
+                tuple(sorted(position[p] for p in node_parents))
+            ))
+            ordinal = occurrences.get(base, 0)
+            occurrences[base] = ordinal + 1
+            position[node_id] = hash((base, ordinal))
+            ordinals[node_id] = ordinal
+
+            digest[node_id] = hash((
+                position[node_id],
+                " ".join(str(node.get("conclusion", "")).split()),
+                round(_confidence(node), 3),
+                tuple(sorted(digest[p] for p in node_parents))
+            ))
+
+            for child in children[node_id]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    heapq.heappush(ready, (str(nodes[child].get("timestamp", "")), child))
+
+        if len(order) != len(nodes):
+            raise ValueError("Reasoning graph contains a cycle")
+
+        return {
+            "nodes": nodes,
+            "parents": parents,
+            "order": order,
+            "position": position,
+            "digest": digest,
+            "ordinals": ordinals,
+            "by_position": {pos: node_id for node_id, pos in position.items()}
+        }
+
+    def diff(self, base, target) -> Dict:
+        """
+        Compare two graph snapshots.
+
+        Args:
+            base: Earlier graph (ReasoningGraph or to_dict() snapshot)
+            target: Later graph (ReasoningGraph or to_dict() snapshot)
+
+        Returns:
+            Dictionary with a summary and the added, removed and changed nodes;
+            changed nodes are ordered by the size of their confidence shift
+        """
+        a, b = self.index(base), self.index(target)
+        matched = self._match(a, b)
+
+        added, changed = [], []
+        settled = set()
+        skipped = unchanged = 0
+        for node_id in reversed(b["order"]):
+            if node_id in settled:
+                continue
+            settled.add(node_id)
+            base_id = matched.get(node_id)
+            if base_id is None:
+                added.append(self._describe(b, node_id))
+                continue
+            if a["digest"][base_id] == b["digest"][node_id]:
+                # Identical lineage: this node and every ancestor are unchanged
+                unchanged += 1
+                skipped += self._settle_ancestors(b, node_id, settled)
+                continue
+            change = self._compare(a, base_id, b, node_id)
+            if change is None:
+                unchanged += 1
+            else:
+                changed.append(change)
+
+        removed_ids = set(a["nodes"]) - set(matched.values())
+        removed = [self._describe(a, node_id) for node_id in a["order"] if node_id in removed_ids]
+        added.reverse()
+        changed.sort(key=lambda c: abs(c["confidence_shift"]), reverse=True)
+
+        return {
+            "summary": {
+                "base_nodes": len(a["nodes"]),
+                "target_nodes": len(b["nodes"]),
+                "added": len(added),
+                "removed": len(removed),
+                "changed": len(changed),
+                "unchanged": unchanged + skipped,
+                "skipped_by_lineage_digest": skipped
+            },
+            "added": added,
+            "removed": removed,
+            "changed": changed
+        }
+
+    def merge(self, base, target) -> Dict:
+        """
+        Merge two graph snapshots into one, in ReasoningGraph.to_dict() format.
+
+        Matched nodes keep their base id and take the target's conclusion,
+        confidence and timestamp (with the base values kept under "previous"
+        when they differ). Added and removed nodes are both kept. Every node is
+        tagged with a diff_status of unchanged, changed, added or removed.
+        """
+        a, b = self.index(base), self.index(target)
+        matched = self._match(a, b)
+        base_of = dict(matched)
+        target_of = {base_id: node_id for node_id, base_id in matched.items()}
+
+        nodes = []
+        for node_id in a["order"]:
+            node = dict(a["nodes"][node_id])
+            target_id = target_of.get(node_id)
+            if target_id is None:
+                node["diff_status"] = "removed"
+            elif a["digest"][node_id] == b["digest"][target_id] or self._compare(a, node_id, b, target_id) is None:
+                node["diff_status"] = "unchanged"
+            else:
+                newer = b["nodes"][target_id]
+                node["previous"] = {"conclusion": node.get("conclusion"), "confidence": node.get("confidence")}
+                node.update(
+                    conclusion=newer.get("conclusion"),
+                    confidence=newer.get("confidence"),
+                    timestamp=newer.get("timestamp"),
+                    diff_status="changed"
+                )
+            nodes.append(node)
+        for node_id in b["order"]:
+            if node_id not in base_of:
+                nodes.append(dict(b["nodes"][node_id], diff_status="added"))
+
+        edges = {}
+        for index, remap in ((a, {}), (b, base_of)):
+            for child, node_parents in index["parents"].items():
+                for parent in node_parents:
+                    key = (remap.get(parent, parent), remap.get(child, child))
+                    edges[key] = None
+
+        return {
+            "nodes": nodes,
+            "edges": [{"source": source, "target": target} for source, target in edges]
+        }
+
+    @staticmethod
+    def _match(a: Dict, b: Dict) -> Dict[str, str]:
+        """Map target node ids to base node ids sharing their lineage position."""
+        return {
+            node_id: a["by_position"][pos]
+            for node_id, pos in b["position"].items()
+            if pos in a["by_position"]
+        }
+
+    @staticmethod
+    def _settle_ancestors(index: Dict, node_id: str, settled: set) -> int:
+        """Mark every not yet settled ancestor of a node; returns how many were marked."""
+        count = 0
+        stack = list(index["parents"][node_id])
+        while stack:
+            parent = stack.pop()
+            if parent in settled:
+                continue
+            settled.add(parent)
+            count += 1
+            stack.extend(index["parents"][parent])
+        return count
+
+    def _compare(self, a: Dict, base_id: str, b: Dict, target_id: str) -> Optional[Dict]:
+        """Field-level comparison of a matched pair; None if only the ancestry changed."""
+        old, new = a["nodes"][base_id], b["nodes"][target_id]
+        old_conclusion = " ".join(str(old.get("conclusion", "")).split())
+        new_conclusion = " ".join(str(new.get("conclusion", "")).split())
+        shift = _confidence(new) - _confidence(old)
+        conclusion_changed = old_conclusion != new_conclusion
+        if not conclusion_changed and abs(shift) <= self.confidence_tolerance:
+            return None
+        return {
+            "lineage": self._label(b, target_id),
+            "agent": new.get("agent"),
+            "type": new.get("type"),
+            "base_id": base_id,
+            "target_id": target_id,
+            "conclusion_changed": conclusion_changed,
+            "base_conclusion": self._preview(old_conclusion),
+            "target_conclusion": self._preview(new_conclusion),
+            "base_confidence": old.get("confidence"),
+            "target_confidence": new.get("confidence"),
+            "confidence_shift": round(shift, 4)
+        }
+
+    def _describe(self, index: Dict, node_id: str) -> Dict:
+        node = index["nodes"][node_id]
+        return {
+            "lineage": self._label(index, node_id),
+            "id": node_id,
+            "agent": node.get("agent"),
+            "type": node.get("type"),
+            "conclusion": self._preview(node.get("conclusion", "")),
+            "confidence": node.get("confidence")
+        }
+
+    def _label(self, index: Dict, node_id: str) -> str:
+        """Readable lineage path along first parents, e.g. "analyzer-agent > planner-agent"."""
+        parts = []
+        while node_id is not None and len(parts) < self.LABEL_DEPTH:
+            ordinal = index["ordinals"][node_id]
+            parts.append(str(index["nodes"][node_id].get("agent")) + (f" #{ordinal + 1}" if ordinal else ""))
+            node_parents = index["parents"][node_id]
+            node_id = node_parents[0] if node_parents else None
+        if node_id is not None:
+            parts.append("...")
+        return " > ".join(reversed(parts))
+
+    def _preview(self, text) -> str:
+        text = str(text)
+        return text if len(text) <= self.preview_chars else text[:self.preview_chars] + "..."
+
@@ -0,0 +1,240 @@
+"""
+Graph Event Bus - In-process pub-sub of graph changes for live viewers of a session.
+"""
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterator, Optional
+
+
+class Subscription:
+    """
+    One viewer's bounded queue of serialized events.
+
+    Iterating it yields Server-Sent Events frames as they are published, with
+    a keep-alive comment whenever the session is quiet, until the viewer is
+    dropped for falling behind or the stream reaches its maximum duration.
+    A stream that ends on time asks the client to reconnect right away;
+    EventSource then resumes with Last-Event-ID, so nothing is lost, and a
+    viewer never holds a server worker for longer than max_seconds. The
+    subscription is removed from the bus when iteration stops, including
+    when the client disconnects.
+    """
+
+    def __init__(
+        self,
+        bus: "GraphEventBus",
+        session_id: str,
+        max_queue: int,
+        heartbeat_seconds: float,
+        max_seconds: Optional[float] = None
+    ):
+        self.bus = bus
+        self.session_id = session_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_seconds = max_seconds
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_queue)
+        self.dropped = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        ends = time.monotonic() + self.max_seconds if self.max_seconds else None
+        try:
+            while True:
+                wait = self.heartbeat_seconds
+                if ends is not None:
+                    remaining = ends - time.monotonic()
+                    if remaining <= 0:
+                        yield b"retry: 500\n\n"
+                        return
+                    wait = min(wait, remaining)
+                try:
+                    frame = self.queue.get(timeout=wait)
+                except queue.Empty:
+                    if ends is None or time.monotonic() < ends:
+                        yield b": keep-alive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.bus.unsubscribe(self)
+
+    def offer(self, frame: bytes) -> bool:
+        """Queue a frame without blocking; False once the viewer has fallen too far behind."""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            return False
+
+    def drop(self, frame: bytes):
+        """
+        Cut off a lagging viewer: discard its backlog, then tell it to resync and end the stream.
+
+        The publisher is the only producer, so draining always makes room for
+        the two closing items.
+        """
+        self.dropped = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+        self.queue.put_nowait(frame)
+        self.queue.put_nowait(None)
+
+
+class _Channel:
+    """Subscribers and recent events of one session."""
+
+    def __init__(self, history: int):
+        self.subscribers = set()
+        self.history = deque(maxlen=history)  # (event id, frame)
+        # Event ids count up per session, so a gap in the history is detectable
+        self.last_id = 0
+
+
+class GraphEventBus:
+    """
+    Publishes node and edge events per session to every live subscriber.
+
+    Attached to an orchestrator through listener(), each signature added to
+    the graph is published as one "node" event and one "edge" event per
+    parent; duplicates merged into an existing node are not published. An
+    event is serialized once into a Server-Sent Events frame and the same
+    bytes are queued for every subscriber, so viewers watching a session cost
+    one queue put each instead of a graph rebuild.
+
+    Publishing never blocks the agents. Each subscriber has a bounded queue;
+    one that falls further behind than that is dropped with a "resync"
+    event. Recent events are kept per session, so a viewer that reconnects
+    with Last-Event-ID (as EventSource does automatically) is replayed what
+    it missed, and is told to resync from /api/graph when that is no longer
+    available. The bus is per process: with several workers, viewers must
+    reach the worker running the session.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        history: int = 1000,
+        heartbeat_seconds: float = 15.0,
+        max_sessions: int = 100,
+        stream_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            max_queue: Events a subscriber may fall behind before it is dropped
+            history: Recent events kept per session for replay on reconnect
+            heartbeat_seconds: Idle time after which a keep-alive comment is sent
+            max_sessions: Sessions kept; the least recently used ones without subscribers are forgotten
+            stream_seconds: Longest a subscription stays open before the client is told to reconnect
+        """
+        self.max_queue = max_queue
+        self.history = history
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stream_seconds = stream_seconds
+        self.max_sessions = max_sessions
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, session_id: str, event: str, data: Dict) -> int:
+        """
+        Broadcast one event to the session's subscribers.
+
+        Returns:
+            The event id
+        """
+        with self._lock:
+            channel = self._channel(session_id)
+            channel.last_id += 1
+            frame = self._frame(event, data, channel.last_id)
+            channel.history.append((channel.last_id, frame))
+            self.published += 1
+            lagging = [sub for sub in channel.subscribers if not sub.offer(frame)]
+            for sub in lagging:
+                channel.subscribers.discard(sub)
+                self.dropped += 1
+                # No id on the resync, so a reconnect resumes from the last event actually received
+                sub.drop(self._frame("resync", {"reason": "subscriber fell behind"}))
+            return channel.last_id
+
+    def subscribe(self, session_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to a session's events from now on.
+
+        Args:
+            session_id: Session to watch
+            last_event_id: Id of the last event the client received, to replay what it missed
+
+        Returns:
+            Subscription to iterate for SSE frames
+        """
+        sub = Subscription(self, session_id, self.max_queue, self.heartbeat_seconds, self.stream_seconds)
+        with self._lock:
+            channel = self._channel(session_id)
+            if last_event_id is not None:
+                try:
+                    after = int(last_event_id)
+                except ValueError:
+                    after = 0
+                missed = [frame for event_id, frame in channel.history if event_id > after]
+                covered = len(missed) == channel.last_id - after
+                if not covered or len(missed) > self.max_queue:
+                    # Part of what the client missed is no longer kept, or too much to queue
+                    missed = [self._frame("resync", {"reason": "missed events unavailable"}, channel.last_id)]
+                for frame in missed:
+                    sub.offer(frame)
+            channel.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            channel = self._channels.get(sub.session_id)
+            if channel is not None:
+                channel.subscribers.discard(sub)
+
+    def listener(self, session_id: str, graph) -> Callable:
+        """An orchestrator signature listener publishing the signatures new to `graph` to the given session."""
+        from orchestrator import ReasoningGraph
+
+        def on_signature(signature):
+            # A duplicate merged into an existing node is not a new node
+            if graph.get_signature(signature.signature_id) is not signature:
+                return
+            self.publish(session_id, "node", ReasoningGraph.node_view(signature))
+            for parent_id in signature.context["parent_signatures"]:
+                self.publish(session_id, "edge", {"source": parent_id, "target": signature.signature_id})
+
+        return on_signature
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "sessions": len(self._channels),
+                "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+                "published": self.published,
+                "dropped_subscribers": self.dropped
+            }
+
+    def _channel(self, session_id: str) -> _Channel:
+        channel = self._channels.get(session_id)
+        if channel is None:
+            channel = self._channels[session_id] = _Channel(self.history)
+            idle = [sid for sid, c in self._channels.items() if not c.subscribers and sid != session_id]
+            for sid in idle[:max(0, len(self._channels) - self.max_sessions)]:
+                del self._channels[sid]
+        self._channels.move_to_end(session_id)
+        return channel
+
+    @staticmethod
+    def _frame(event: str, data: Dict, event_id: Optional[int] = None) -> bytes:
+        payload = json.dumps(data, separators=(",", ":"))
+        head = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{head}event: {event}\ndata: {payload}\n\n".encode("utf-8")
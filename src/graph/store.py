@@ -0,0 +1,167 @@
+"""
+Shared Graph Store - SQLite (WAL) log of the current run's graph, shared by every server process.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    results TEXT
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_by_run ON signatures (run_id, seq);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SharedGraphStore:
+    """
+    Keeps the current run's reasoning graph in a SQLite database in WAL mode.
+
+    Under gunicorn with several workers each process has its own module
+    globals, so which worker a request hits used to decide which graph it saw.
+    With this store, the worker handling /api/process starts a run, and every
+    registered signature is appended to a log as it happens. Readers in any
+    worker call current() to get an orchestrator whose graph is brought up to
+    date by replaying only the log rows it has not applied yet. WAL mode lets
+    those reads proceed while a run is being written.
+    """
+
+    def __init__(self, path: str, keep_runs: int = 20):
+        self.path = path
+        self.keep_runs = keep_runs
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # This process's view of the current run: run id, orchestrator, last applied
+        # seq, and the seqs it appended itself (already in its graph)
+        self._run_id: Optional[str] = None
+        self._orchestrator = None
+        self._seq = 0
+        self._own = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections must not be shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def start_run(self, orchestrator) -> str:
+        """
+        Make a fresh orchestrator the current run for every process.
+
+        Its registered signatures are logged as they happen, so other workers
+        see the graph grow while the request is still running.
+        """
+        run_id = str(uuid.uuid4())
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("INSERT INTO runs (run_id, started_at) VALUES (?, ?)", (run_id, time.time()))
+                conn.execute(
+                    "INSERT INTO state (key, value) VALUES ('current_run', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (run_id,)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._run_id, self._orchestrator, self._seq, self._own = run_id, orchestrator, 0, set()
+
+        self._track(orchestrator, run_id)
+        self._prune()
+        return run_id
+
+    def _track(self, orchestrator, run_id: str):
+        """Log every signature the orchestrator registers from now on under the run."""
+        orchestrator.signature_listeners.append(lambda signature: self._append(run_id, signature))
+
+    def _append(self, run_id: str, signature):
+        payload = json.dumps(signature.to_dict())
+        with self._lock:
+            cursor = self._connection().execute(
+                "INSERT INTO signatures (run_id, payload) VALUES (?, ?)",
+                (run_id, payload)
+            )
+            # The writing process already holds this signature in memory
+            if self._run_id == run_id:
+                self._own.add(cursor.lastrowid)
+
+    def finish_run(self, run_id: str, results: Dict):
+        """Store the final results of a run (without its graph, which the log already holds)."""
+        stored = {k: v for k, v in results.items() if k != "graph"}
+        self._connection().execute(
+            "UPDATE runs SET finished_at = ?, results = ? WHERE run_id = ?",
+            (time.time(), json.dumps(stored), run_id)
+        )
+
+    def current_run_id(self) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM state WHERE key = 'current_run'").fetchone()
+        return row[0] if row else None
+
+    def current(self, factory):
+        """
+        Return an orchestrator holding the current run's graph, or None before the first run.
+
+        Args:
+            factory: Zero-argument callable creating an empty orchestrator, used
+                when this process has not seen the current run yet
+        """
+        from orchestrator import ThoughtSignature
+
+        run_id = self.current_run_id()
+        if run_id is None:
+            return None
+
+        with self._lock:
+            if run_id != self._run_id:
+                self._run_id, self._orchestrator, self._seq, self._own = run_id, factory(), 0, set()
+                # Signatures registered in this process (e.g. by a recompute) join the run too
+                self._track(self._orchestrator, run_id)
+            rows = self._connection().execute(
+                "SELECT seq, payload FROM signatures WHERE run_id = ? AND seq > ? ORDER BY seq",
+                (run_id, self._seq)
+            ).fetchall()
+            # Replaying through add_signature reproduces merges of duplicate signatures
+            for seq, payload in rows:
+                if seq not in self._own:
+                    self._orchestrator.graph.add_signature(ThoughtSignature.from_dict(json.loads(payload)))
+                self._seq = seq
+            return self._orchestrator
+
+    def _prune(self):
+        """Drop the logs of all but the most recent runs."""
+        conn = self._connection()
+        stale = [row[0] for row in conn.execute(
+            "SELECT run_id FROM runs ORDER BY started_at DESC LIMIT -1 OFFSET ?", (self.keep_runs,)
+        )]
+        for run_id in stale:
+            conn.execute("DELETE FROM signatures WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
@@ -0,0 +1,212 @@
+"""
+Graph Summary - Bounded level-of-detail views of large reasoning graphs.
+"""
+import hashlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+class GraphSummarizer:
+    """
+    Reduces a reasoning graph to a view of at most max_nodes nodes.
+
+    Levels of detail, finest first:
+    - "nodes": every signature
+    - "chains": linear lineages (each node the only child of its only
+      parent, such as analyzer -> planner -> executor) collapsed into one node
+    - "agent_type": chains clustered by their sequence of agent and reasoning type
+    - "type": chains clustered by their sequence of reasoning types
+
+    A view uses the finest level that fits in max_nodes. Edges between
+    collapsed nodes are aggregated with a count, conclusions are truncated,
+    and a level that still does not fit is paged. Every collapsed node has an
+    id that can be expanded on demand into the next view of its members. The
+    ids are derived from graph content, so they stay valid across requests
+    and workers. The payload is bounded by max_nodes however large the graph
+    grows.
+    """
+
+    LEVELS = ("nodes", "chains", "agent_type", "type")
+
+    # Agents shown in a cluster label before it is elided
+    LABEL_AGENTS = 4
+
+    def __init__(self, max_nodes: int = 200, conclusion_chars: int = 160):
+        self.max_nodes = max_nodes
+        self.conclusion_chars = conclusion_chars
+        # Chains of the last graph state seen, keyed by (graph, node count, merges)
+        self._cached_key: Optional[Tuple] = None
+        self._cached_chains: List[List[str]] = []
+
+    def summarize(self, graph, cluster_id: Optional[str] = None, offset: int = 0) -> Dict:
+        """
+        Build a bounded view of the graph, or of one collapsed node's members.
+
+        Args:
+            graph: The ReasoningGraph to summarize
+            cluster_id: Id of a collapsed node from an earlier view to expand
+            offset: Index of the first node to return when the view is paged
+
+        Returns:
+            Dictionary with the level used, nodes, aggregated edges and paging
+            details; raises KeyError for an unknown cluster_id
+        """
+        chains = self._chains(graph)
+        if cluster_id is None:
+            levels, members = self.LEVELS, chains
+        else:
+            level, members = self._resolve(graph, chains, cluster_id)
+            # Only levels finer than the one the cluster came from make progress
+            levels = self.LEVELS[:self.LEVELS.index(level)]
+
+        for level in levels:
+            if self._count(graph, members, level) <= self.max_nodes:
+                break
+        units = self._units(graph, members, level)
+        paged = len(units) > self.max_nodes
+        offset = max(offset, 0) if paged else 0
+        page = units[offset:offset + self.max_nodes]
+
+        owner = {node_id: unit["id"] for unit in page for node_id in unit.pop("members")}
+        edges = Counter()
+        for parent_id, child_ids in graph.edges.items():
+            if parent_id not in owner:
+                continue
+            for child_id in child_ids:
+                if child_id in owner and owner[child_id] != owner[parent_id]:
+                    edges[(owner[parent_id], owner[child_id])] += 1
+
+        result = {
+            "level": level,
+            "cluster_id": cluster_id,
+            "total_signatures": sum(len(chain) for chain in members),
+            "total_nodes": len(units),
+            "offset": offset,
+            "nodes": page,
+            "edges": [
+                {"source": source, "target": target, "count": count}
+                for (source, target), count in edges.items()
+            ]
+        }
+        if offset + len(page) < len(units):
+            result["next_offset"] = offset + len(page)
+        return result
+
+    def _chains(self, graph) -> List[List[str]]:
+        """Partition the graph into maximal linear chains, in graph order of their heads."""
+        key = (id(graph), len(graph.nodes), graph.merges)
+        if key == self._cached_key:
+            return self._cached_chains
+
+        nodes = graph.nodes
+        children = {
+            node_id: [c for c in graph.edges.get(node_id, []) if c in nodes]
+            for node_id in nodes
+        }
+
+        def continues(node_id: str) -> Optional[str]:
+            # The node's parent when the node is that parent's only child and has no other parent
+            parents = [p for p in nodes[node_id].context["parent_signatures"] if p in nodes]
+            if len(parents) == 1 and len(children[parents[0]]) == 1:
+                return parents[0]
+            return None
+
+        chains = []
+        for node_id in nodes:
+            if continues(node_id) is not None:
+                continue
+            chain = [node_id]
+            while len(children[chain[-1]]) == 1 and continues(children[chain[-1]][0]) == chain[-1]:
+                chain.append(children[chain[-1]][0])
+            chains.append(chain)
+
+        self._cached_key, self._cached_chains = key, chains
+        return chains
+
+    def _count(self, graph, chains: List[List[str]], level: str) -> int:
+        """Number of nodes a level would produce, without building them."""
+        if level == "nodes":
+            return sum(len(chain) for chain in chains)
+        if level == "chains":
+            return len(chains)
+        return len({self._group_key(graph, chain, level) for chain in chains})
+
+    def _units(self, graph, chains: List[List[str]], level: str) -> List[Dict]:
+        """The view's nodes at one level, each with the signature ids it covers under "members"."""
+        if level == "nodes":
+            return [self._node(graph.nodes[node_id]) for chain in chains for node_id in chain]
+        if level == "chains":
+            return [
+                self._node(graph.nodes[chain[0]]) if len(chain) == 1 else self._cluster(graph, "chain", chain[0], [chain])
+                for chain in chains
+            ]
+
+        groups: Dict[str, List[List[str]]] = {}
+        for chain in chains:
+            groups.setdefault(self._group_key(graph, chain, level), []).append(chain)
+        units = [self._cluster(graph, level, self._digest(key), group) for key, group in groups.items()]
+        units.sort(key=lambda unit: -unit["size"])
+        return units
+
+    def _resolve(self, graph, chains: List[List[str]], cluster_id: str) -> Tuple[str, List[List[str]]]:
+        """The level and member chains of a collapsed node id."""
+        level, _, ref = cluster_id.partition(":")
+        if level == "chain":
+            for chain in chains:
+                if chain[0] == ref:
+                    return "chains", [chain]
+        elif level in ("agent_type", "type"):
+            members = [chain for chain in chains if self._digest(self._group_key(graph, chain, level)) == ref]
+            if members:
+                return level, members
+        raise KeyError(cluster_id)
+
+    @staticmethod
+    def _group_key(graph, chain: List[str], level: str) -> str:
+        signatures = [graph.nodes[node_id] for node_id in chain]
+        if level == "agent_type":
+            return " > ".join(f"{sig.agent_id}/{sig.reasoning_type}" for sig in signatures)
+        return " > ".join(sig.reasoning_type for sig in signatures)
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        # Stable across processes, unlike hash(), so ids work with any worker
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def _node(self, signature) -> Dict:
+        return {
+            "id": signature.signature_id,
+            "kind": "signature",
+            "agent": signature.agent_id,
+            "type": signature.reasoning_type,
+            "conclusion": self._truncate(signature.conclusion),
+            "confidence": signature.confidence_score,
+            "timestamp": signature.timestamp,
+            "members": [signature.signature_id]
+        }
+
+    def _cluster(self, graph, level: str, ref: str, chains: List[List[str]]) -> Dict:
+        """A collapsed node covering the given chains; its conclusion is the latest chain's last one."""
+        members = [node_id for chain in chains for node_id in chain]
+        signatures = [graph.nodes[node_id] for node_id in members]
+        agents = list(dict.fromkeys(sig.agent_id for sig in signatures))
+        last = graph.nodes[chains[-1][-1]]
+        label = " > ".join(agents[:self.LABEL_AGENTS]) + (" > ..." if len(agents) > self.LABEL_AGENTS else "")
+        return {
+            "id": f"{level}:{ref}",
+            "kind": level,
+            "label": label if len(chains) == 1 else f"{label} (x{len(chains)})",
+            "size": len(members),
+            "chains": len(chains),
+            "agents": agents[:self.LABEL_AGENTS],
+            "agent_count": len(agents),
+            "types": sorted({sig.reasoning_type for sig in signatures}),
+            "conclusion": self._truncate(last.conclusion),
+            "confidence": round(sum(sig.confidence_score for sig in signatures) / len(signatures), 3),
+            "timestamp": max(sig.timestamp for sig in signatures),
+            "expandable": True,
+            "members": members
+        }
+
+    def _truncate(self, text: str) -> str:
+        return text if len(text) <= self.conclusion_chars else text[:self.conclusion_chars] + "..."
@@ -0,0 +1,58 @@
+"""
+Command-line diff and merge of two saved reasoning graphs.
+
+Each file is a graph as written by ThoughtLineageOrchestrator.save_graph, or
+a saved /api/process response, whose "graph" field is used.
+
+Usage:
+    python graph_diff.py before.json after.json --output diff.json --merge merged.json
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from graph import GraphDiff
+
+
+def _load_graph(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    return data.get("graph", data)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff (and optionally merge) two saved reasoning graphs.")
+    parser.add_argument("base", help="Earlier graph JSON written by save_graph")
+    parser.add_argument("target", help="Later graph JSON written by save_graph")
+    parser.add_argument("--output", "-o", help="Write the diff here instead of stdout")
+    parser.add_argument("--merge", "-m", help="Also write the merged graph to this path")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="Ignore confidence shifts up to this size")
+    args = parser.parse_args(argv)
+
+    base, target = _load_graph(args.base), _load_graph(args.target)
+
+    engine = GraphDiff(confidence_tolerance=args.tolerance)
+    result = engine.diff(base, target)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+    if args.merge:
+        with open(args.merge, "w") as f:
+            json.dump(engine.merge(base, target), f, indent=2)
+
+    summary = result["summary"]
+    print(
+        f"[DIFF] +{summary['added']} -{summary['removed']} ~{summary['changed']} "
+        f"={summary['unchanged']} ({summary['skipped_by_lineage_digest']} skipped by lineage digest)",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
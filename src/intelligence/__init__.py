@@ -3,5 +3,8 @@ Intelligence layer package initialization.
 """
 from intelligence.contradiction_detector import ContradictionDetector
 from intelligence.synthesizer import Synthesizer
+from intelligence.problem_index import ProblemIndex
+from intelligence.contradiction_index import ContradictionIndex
+from intelligence.incremental_detector import IncrementalDetector
 
-__all__ = ['ContradictionDetector', 'Synthesizer']
+__all__ = ['ContradictionDetector', 'Synthesizer', 'ProblemIndex', 'ContradictionIndex', 'IncrementalDetector']
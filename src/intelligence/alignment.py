@@ -0,0 +1,152 @@
+"""
+Step Aligner - Locally aligns two reasoning chains to pinpoint where they diverge.
+"""
+import re
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could do does for from has have if in into is it its
+may might must not of on or our over should so such than that the their them then there these
+they this those to was we were what when which while will with would you your
+""".split())
+
+
+class StepAligner:
+    """
+    Aligns the reasoning chains of two signatures without calling the model.
+
+    Each step's thought is turned into a hashed TF-IDF vector (word unigrams
+    and bigrams, IDF computed over the steps of both chains), the chains are
+    globally aligned on cosine similarity (Needleman-Wunsch), and the first
+    aligned pair whose similarity collapses below the threshold is reported
+    as the divergence point.
+    """
+
+    def __init__(self, n_features: int = 4096, gap_penalty: float = 0.1, collapse_threshold: float = 0.2):
+        self.n_features = n_features
+        self.gap_penalty = gap_penalty
+        self.collapse_threshold = collapse_threshold
+
+    def _tokens(self, text: str) -> List[str]:
+        words = [w for w in re.findall(r"[a-z0-9$%]+", str(text).lower()) if w not in _STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """Hashed, IDF-weighted, L2-normalized term vectors (one row per text)."""
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float64)
+        for row, text in enumerate(texts):
+            buckets = [zlib.crc32(token.encode("utf-8")) % self.n_features for token in self._tokens(text)]
+            if buckets:
+                counts[row] = np.bincount(buckets, minlength=self.n_features)
+
+        tf = np.log1p(counts)
+        df = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+        weighted = tf * idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        return weighted / np.where(norms == 0, 1.0, norms)
+
+    def align(
+        self,
+        chain_a: List[Dict],
+        chain_b: List[Dict],
+        conclusion_a: Optional[str] = None,
+        conclusion_b: Optional[str] = None
+    ) -> Dict:
+        """
+        Align two reasoning chains and locate their divergence point.
+
+        Args:
+            chain_a: reasoning_chain of the first signature
+            chain_b: reasoning_chain of the second signature
+            conclusion_a: Optional conclusion of the first signature
+            conclusion_b: Optional conclusion of the second signature
+
+        Returns:
+            Dictionary with aligned step pairs, mean similarity, conclusion
+            similarity and the divergence point (None if the chains never diverge)
+        """
+        texts_a = [step.get("thought", "") for step in chain_a]
+        texts_b = [step.get("thought", "") for step in chain_b]
+        with_conclusions = conclusion_a is not None and conclusion_b is not None
+        extra = [conclusion_a, conclusion_b] if with_conclusions else []
+
+        vectors = self.vectorize(texts_a + texts_b + extra)
+        vec_a = vectors[:len(texts_a)]
+        vec_b = vectors[len(texts_a):len(texts_a) + len(texts_b)]
+        similarity = vec_a @ vec_b.T
+
+        pairs = self._needleman_wunsch(similarity)
+        aligned = [
+            {
+                "step_a": self._step_number(chain_a, i),
+                "step_b": self._step_number(chain_b, j),
+                "similarity": round(float(similarity[i, j]), 3)
+            }
+            for i, j in pairs
+        ]
+
+        divergence = None
+        for (i, j), pair in zip(pairs, aligned):
+            if pair["similarity"] < self.collapse_threshold:
+                divergence = dict(
+                    pair,
+                    index_a=i,
+                    index_b=j,
+                    thought_a=texts_a[i],
+                    thought_b=texts_b[j]
+                )
+                break
+
+        conclusion_similarity = None
+        if with_conclusions:
+            conclusion_similarity = round(float(vectors[-2] @ vectors[-1]), 3)
+
+        return {
+            "aligned_steps": aligned,
+            "unaligned_steps": len(texts_a) + len(texts_b) - 2 * len(pairs),
+            "mean_similarity": round(float(np.mean([p["similarity"] for p in aligned])), 3) if aligned else 0.0,
+            "conclusion_similarity": conclusion_similarity,
+            "divergence": divergence
+        }
+
+    def _needleman_wunsch(self, similarity: np.ndarray) -> List[tuple]:
+        """Global alignment maximizing summed similarity; returns aligned (i, j) index pairs."""
+        m, n = similarity.shape
+        gap = self.gap_penalty
+        score = np.zeros((m + 1, n + 1))
+        score[1:, 0] = -gap * np.arange(1, m + 1)
+        score[0, 1:] = -gap * np.arange(1, n + 1)
+        move = np.zeros((m + 1, n + 1), dtype=np.int8)  # 0 = match, 1 = gap in B, 2 = gap in A
+        move[1:, 0] = 1
+        move[0, 1:] = 2
+
+        for i in range(1, m + 1):
+            for j in range(1, n + 1):
+                options = (
+                    score[i - 1, j - 1] + similarity[i - 1, j - 1],
+                    score[i - 1, j] - gap,
+                    score[i, j - 1] - gap
+                )
+                best = int(np.argmax(options))
+                score[i, j] = options[best]
+                move[i, j] = best
+
+        pairs = []
+        i, j = m, n
+        while i > 0 and j > 0:
+            if move[i, j] == 0:
+                pairs.append((i - 1, j - 1))
+                i, j = i - 1, j - 1
+            elif move[i, j] == 1:
+                i -= 1
+            else:
+                j -= 1
+        return list(reversed(pairs))
+
+    @staticmethod
+    def _step_number(chain: List[Dict], index: int):
+        return chain[index].get("step", index + 1)
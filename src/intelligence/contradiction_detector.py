@@ -1,20 +1,28 @@
 """
 Contradiction Detector - Identifies logical conflicts between reasoning paths.
 """
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-import google.generativeai as genai
 from config import Config
-
-if Config.is_configured():
-    genai.configure(api_key=Config.GEMINI_API_KEY)
+from intelligence.alignment import StepAligner
+from runtime.llm import LLMClient
+from runtime.schema import default_validator
 
 
 class ContradictionDetector:
     """Detects and analyzes contradictions between thought signatures."""
 
-    def __init__(self):
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+    # Bump whenever the detection prompt changes so cached reports are invalidated
+    PROMPT_VERSION = "collision-report-v2"
+    PROBE_VERSION = "severity-probe-v1"
+
+    def __init__(self, index=None, aligner=None, client=None, two_tier: Optional[bool] = None):
+        self.client = client or LLMClient()
+        # Optional intelligence.ContradictionIndex of previously analyzed pairs
+        self.index = index
+        self.aligner = aligner or StepAligner()
+        # Two-tier mode: a severity-only probe first, the full report only above the threshold
+        self.two_tier = Config.TWO_TIER_DETECTION if two_tier is None else two_tier
 
     def detect(self, signature_a: Dict, signature_b: Dict) -> Dict:
         """
@@ -27,6 +35,32 @@ class ContradictionDetector:
         Returns:
             Dictionary with contradiction analysis
         """
+        routing = self.client.route("detection")
+        alignment = self.aligner.align(
+            signature_a['reasoning_chain'],
+            signature_b['reasoning_chain'],
+            signature_a['conclusion'],
+            signature_b['conclusion']
+        )
+        # Cached reports are keyed on exactly the steps the prompts send
+        steps = (
+            self._sent_steps(signature_a['reasoning_chain'], alignment, 'a'),
+            self._sent_steps(signature_b['reasoning_chain'], alignment, 'b')
+        )
+        if self.index is not None:
+            cached = self.index.get(signature_a, signature_b, routing["model"], self.PROMPT_VERSION, steps)
+            if cached is not None:
+                return cached
+
+        if self._is_clearly_low_severity(alignment):
+            return self._fast_path_report(signature_a, signature_b, alignment)
+
+        probe = None
+        if self.two_tier:
+            probe = self._probe(signature_a, signature_b, alignment, steps)
+            if probe is not None and not self._needs_full_report(probe):
+                return probe
+
         prompt = f"""
 You are analyzing IRRECONCILABLE ASSUMPTIONS between two reasoning agents.
 
@@ -35,14 +69,17 @@ Conclusion: {signature_a['conclusion']}
 Confidence: {signature_a['confidence_score']}
 
 Key reasoning:
-{self._format_reasoning_chain(signature_a['reasoning_chain'][:3])}
+{self._format_focused_chain(signature_a['reasoning_chain'], alignment, 'a')}
 
 SIGNATURE B (from {signature_b['agent_id']}):
 Conclusion: {signature_b['conclusion']}
 Confidence: {signature_b['confidence_score']}
 
 Key reasoning:
-{self._format_reasoning_chain(signature_b['reasoning_chain'][:3])}
+{self._format_focused_chain(signature_b['reasoning_chain'], alignment, 'b')}
+
+LOCAL STEP ALIGNMENT (computed before this analysis):
+{self._format_alignment(alignment)}
 
 CRITICAL ANALYSIS REQUIRED:
 Focus on ASSUMPTION-LEVEL conflicts, not just conclusion differences.
@@ -50,7 +87,7 @@ Focus on ASSUMPTION-LEVEL conflicts, not just conclusion differences.
 1. What CORE ASSUMPTION does Agent A make? (e.g., "Market share creates winner-take-all dynamics")
 2. What CORE ASSUMPTION does Agent B make? (e.g., "Cash flow is the only survival metric")
 3. Are these assumptions LOGICALLY INCOMPATIBLE? (Can both be true simultaneously?)
-4. At what specific reasoning step did their logic diverge?
+4. At what specific reasoning step did their logic diverge? (Start from the local alignment above)
 5. What is the FUNDAMENTAL TRADE-OFF they disagree on?
 
 Create a "Reasoning Collision Report" that identifies the exact logical divergence point.
@@ -74,19 +111,28 @@ Output ONLY valid JSON:
 """
 
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": 0.3  # Lower temperature for analytical tasks
-                }
-            )
+            # Lower temperature for analytical tasks
+            response_text = self.client.generate_json(prompt, routing, 0.3)
 
-            result = json.loads(response.text)
+            result, repairs = default_validator.parse(response_text, "ContradictionReport")
             result["signatures_compared"] = [
                 signature_a["signature_id"],
                 signature_b["signature_id"]
             ]
+            result["local_alignment"] = self._alignment_summary(alignment)
+            result["routing"] = routing
+            if repairs:
+                result["repairs"] = repairs
+            if probe is not None:
+                result["probe"] = {
+                    "has_contradiction": probe["has_contradiction"],
+                    "severity": probe["severity"],
+                    "routing": probe.get("routing")
+                }
+
+            # Only successful analyses are cached; fallback results below never are
+            if self.index is not None:
+                self.index.put(signature_a, signature_b, routing["model"], self.PROMPT_VERSION, result, steps)
             return result
 
         except Exception as e:
@@ -103,26 +149,192 @@ Output ONLY valid JSON:
                 ]
             }
 
-    def detect_multi(self, signatures: List[Dict]) -> List[Dict]:
+    def _probe(self, signature_a: Dict, signature_b: Dict, alignment: Dict, steps) -> Optional[Dict]:
+        """
+        Ask only for has_contradiction and severity, with a short prompt and a two-field answer.
+
+        Returns a probe-only report, or None if the probe failed and the full
+        report should be generated instead.
+        """
+        routing = self.client.route("detection")
+        if self.index is not None:
+            cached = self.index.get(signature_a, signature_b, routing["model"], self.PROBE_VERSION, steps)
+            if cached is not None:
+                return cached
+
+        prompt = f"""
+Rate whether two reasoning agents hold IRRECONCILABLE ASSUMPTIONS (both cannot be true at once).
+
+AGENT A ({signature_a['agent_id']}), confidence {signature_a['confidence_score']}:
+Conclusion: {signature_a['conclusion']}
+{self._format_focused_chain(signature_a['reasoning_chain'], alignment, 'a')}
+
+AGENT B ({signature_b['agent_id']}), confidence {signature_b['confidence_score']}:
+Conclusion: {signature_b['conclusion']}
+{self._format_focused_chain(signature_b['reasoning_chain'], alignment, 'b')}
+
+Severity: 0.0 = fully compatible, 0.5 = real trade-off, 1.0 = mutually exclusive.
+
+Output ONLY this JSON, nothing else:
+{{"has_contradiction": true/false, "severity": 0.0-1.0}}
+"""
+
+        try:
+            response_text = self.client.generate_json(prompt, routing, 0.0)
+            probe, repairs = default_validator.parse(response_text, "SeverityProbe")
+        except Exception as e:
+            print(f"[WARNING] Severity probe failed, generating the full report: {e}")
+            return None
+
+        threshold = Config.CONTRADICTION_SEVERITY_THRESHOLD
+        report = {
+            "has_contradiction": probe["has_contradiction"],
+            "contradiction_type": "unclassified" if probe["has_contradiction"] else "none",
+            "severity": probe["severity"],
+            "root_cause": (
+                f"Severity probe rated this pair {probe['severity']}, "
+                f"below the {threshold} threshold for a full collision report"
+            ),
+            "resolution_suggestion": "No reconciliation needed",
+            "conflicting_elements": [],
+            "local_alignment": self._alignment_summary(alignment),
+            "probe_only": True,
+            "signatures_compared": [
+                signature_a["signature_id"],
+                signature_b["signature_id"]
+            ]
+        }
+        if repairs:
+            report["repairs"] = repairs
+        if self.index is not None:
+            self.index.put(signature_a, signature_b, routing["model"], self.PROBE_VERSION, report, steps)
+        report["routing"] = routing
+        return report
+
+    @staticmethod
+    def _needs_full_report(probe: Dict) -> bool:
+        """True if the probe puts the pair close enough to the threshold to need the full report."""
+        # The margin absorbs the probe's coarser severity estimate
+        cutoff = Config.CONTRADICTION_SEVERITY_THRESHOLD - Config.SEVERITY_PROBE_MARGIN
+        return probe["has_contradiction"] and probe["severity"] > cutoff
+
+    def detect_pairs(self, signatures: List[Dict], max_workers: int = 1) -> List[Dict]:
+        """
+        Run contradiction analysis over every pair of signatures.
+
+        Args:
+            signatures: List of thought signatures to analyze
+            max_workers: Number of pairs analyzed concurrently
+
+        Returns:
+            List of contradiction analyses (unfiltered), in pair order
+        """
+        pairs = [
+            (signatures[i], signatures[j])
+            for i in range(len(signatures))
+            for j in range(i + 1, len(signatures))
+        ]
+        if max_workers <= 1 or len(pairs) <= 1:
+            return [self.detect(a, b) for a, b in pairs]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as pool:
+            return list(pool.map(lambda pair: self.detect(*pair), pairs))
+
+    def detect_multi(self, signatures: List[Dict], max_workers: int = 1) -> List[Dict]:
         """
         Detect contradictions across multiple signatures.
 
         Args:
             signatures: List of thought signatures to analyze
+            max_workers: Number of pairs analyzed concurrently
 
         Returns:
             List of contradiction analyses
         """
-        contradictions = []
+        return [
+            result for result in self.detect_pairs(signatures, max_workers)
+            if result["has_contradiction"] and result["severity"] > Config.CONTRADICTION_SEVERITY_THRESHOLD
+        ]
+
+    def _is_clearly_low_severity(self, alignment: Dict) -> bool:
+        """True when the chains and conclusions align so closely that no model call is needed."""
+        threshold = Config.ALIGNMENT_FAST_PATH_SIMILARITY
+        if threshold is None or alignment["divergence"] is not None:
+            return False
+        return (
+            alignment["mean_similarity"] >= threshold
+            and (alignment["conclusion_similarity"] or 0.0) >= threshold
+        )
+
+    def _fast_path_report(self, signature_a: Dict, signature_b: Dict, alignment: Dict) -> Dict:
+        """Local no-contradiction report for near-identical reasoning chains."""
+        return {
+            "has_contradiction": False,
+            "contradiction_type": "none",
+            "severity": round(max(0.0, 1.0 - alignment["mean_similarity"]) * 0.5, 3),
+            "divergence_point": "None - reasoning chains align step for step",
+            "root_cause": (
+                f"Local alignment found no divergence (mean step similarity "
+                f"{alignment['mean_similarity']}, conclusion similarity {alignment['conclusion_similarity']})"
+            ),
+            "resolution_suggestion": "No reconciliation needed",
+            "conflicting_elements": [],
+            "local_alignment": self._alignment_summary(alignment),
+            "fast_path": True,
+            "signatures_compared": [
+                signature_a["signature_id"],
+                signature_b["signature_id"]
+            ]
+        }
 
-        # Compare each pair
-        for i in range(len(signatures)):
-            for j in range(i + 1, len(signatures)):
-                result = self.detect(signatures[i], signatures[j])
-                if result["has_contradiction"] and result["severity"] > 0.5:
-                    contradictions.append(result)
+    def _alignment_summary(self, alignment: Dict) -> Dict:
+        """Compact alignment result attached to reports."""
+        divergence = alignment["divergence"]
+        return {
+            "mean_similarity": alignment["mean_similarity"],
+            "conclusion_similarity": alignment["conclusion_similarity"],
+            "divergence_step_a": divergence["step_a"] if divergence else None,
+            "divergence_step_b": divergence["step_b"] if divergence else None,
+            "divergence_similarity": divergence["similarity"] if divergence else None
+        }
 
-        return contradictions
+    def _format_alignment(self, alignment: Dict) -> str:
+        """Describe the local alignment for the prompt."""
+        lines = [
+            f"  A step {p['step_a']} <-> B step {p['step_b']}: similarity {p['similarity']}"
+            for p in alignment["aligned_steps"]
+        ]
+        divergence = alignment["divergence"]
+        if divergence:
+            lines.append(
+                f"  First divergence: A step {divergence['step_a']} vs B step {divergence['step_b']} "
+                f"(similarity {divergence['similarity']})"
+            )
+        else:
+            lines.append("  No step-level collapse detected; the conflict, if any, is in framing or conclusions")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _sent_steps(chain: List[Dict], alignment: Dict, side: str) -> List[Dict]:
+        """The steps of one side the prompts include: up to two before the divergence and the diverging one."""
+        divergence = alignment["divergence"]
+        if not divergence:
+            return chain[:3]
+        index = divergence[f"index_{side}"]
+        return chain[max(0, index - 2):index + 1]
+
+    def _format_focused_chain(self, chain: List[Dict], alignment: Dict, side: str) -> str:
+        """Steps leading into the divergence point, with the diverging step in full."""
+        steps = self._sent_steps(chain, alignment, side)
+        if not alignment["divergence"]:
+            return self._format_reasoning_chain(steps)
+
+        formatted = []
+        for step in steps[:-1]:
+            formatted.append(f"  Step {step.get('step')}: {step.get('thought', '')[:150]}...")
+        step = steps[-1]
+        formatted.append(f"  Step {step.get('step')} (DIVERGES): {step.get('thought', '')[:600]}")
+        return "\n".join(formatted)
 
     def _format_reasoning_chain(self, chain: List[Dict]) -> str:
         """Format reasoning chain for display."""
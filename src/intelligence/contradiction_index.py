@@ -0,0 +1,205 @@
+"""
+Contradiction Index - Persistent store of prior Reasoning Collision Reports keyed by pair fingerprint.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Steps sent for each side of a pair, as (steps of A, steps of B)
+SentSteps = Tuple[List[Dict], List[Dict]]
+
+
+class ContradictionIndex:
+    """
+    Caches contradiction analyses by a normalized, order-independent pair fingerprint.
+
+    A side's fingerprint covers its conclusion and the reasoning steps the
+    detector actually sends to the model (the steps around the divergence
+    point, passed in as `steps`, or else the leading steps), after
+    normalizing case, punctuation and whitespace. The pair key is symmetric
+    in A/B and also covers the model name and the detector prompt version,
+    so switching models or changing the prompt never serves stale reports.
+
+    Reports are stored exactly as generated, together with which side was
+    A. A report served for the reversed pair is not rewritten; its
+    "signatures_compared" lists the two ids in the report's own A/B order,
+    so every sided field, free text included, still reads correctly.
+
+    A persisted index is an append-only JSONL file: each put() writes one
+    line, and the file is rewritten only when it holds twice max_entries
+    lines or after invalidate_model().
+    """
+
+    # Bump whenever what a fingerprint covers or the file format changes, so persisted entries are dropped
+    FINGERPRINT_VERSION = "sent-steps-v2"
+
+    def __init__(self, path: Optional[str] = None, leading_steps: int = 3, max_entries: int = 10000):
+        self.path = path
+        self.leading_steps = leading_steps
+        self.max_entries = max_entries
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Lines in the persisted file, live or overwritten, to tell when to compact it
+        self._file_lines = 0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        text = re.sub(r"[^\w\s]", " ", str(text).lower())
+        return re.sub(r"\s+", " ", text).strip()
+
+    def fingerprint(self, signature: Dict, steps: Optional[List[Dict]] = None) -> str:
+        """Fingerprint one side of a pair from its conclusion and the reasoning steps sent for it."""
+        if steps is None:
+            steps = signature.get("reasoning_chain", [])[:self.leading_steps]
+        parts = [self._normalize(signature.get("conclusion", ""))]
+        for step in steps:
+            parts.append(f"{step.get('step')} {self._normalize(step.get('thought', ''))}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def pair_key(
+        self,
+        signature_a: Dict,
+        signature_b: Dict,
+        model: str,
+        version: str,
+        steps: Optional[SentSteps] = None
+    ) -> Tuple[str, bool]:
+        """
+        Build the symmetric cache key for a pair.
+
+        Args:
+            steps: Steps the detector sends for A and for B (leading steps if None)
+
+        Returns:
+            Tuple of (key, swapped) where swapped is True when (A, B) is the
+            reverse of the canonical order the report is stored in
+        """
+        steps_a, steps_b = steps or (None, None)
+        fp_a = self.fingerprint(signature_a, steps_a)
+        fp_b = self.fingerprint(signature_b, steps_b)
+        swapped = fp_a > fp_b
+        first, second = (fp_b, fp_a) if swapped else (fp_a, fp_b)
+        key = hashlib.sha256(f"{model}|{version}|{first}|{second}".encode("utf-8")).hexdigest()
+        return key, swapped
+
+    def get(
+        self,
+        signature_a: Dict,
+        signature_b: Dict,
+        model: str,
+        version: str,
+        steps: Optional[SentSteps] = None
+    ) -> Optional[Dict]:
+        """Return a stored report oriented for (A, B), or None."""
+        key, swapped = self.pair_key(signature_a, signature_b, model, version, steps)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            report = dict(entry["report"])
+
+        # The stored report's A is this call's A unless exactly one of the two orders was reversed
+        ids = [signature_a["signature_id"], signature_b["signature_id"]]
+        report["signatures_compared"] = ids[::-1] if swapped != entry["swapped"] else ids
+        report["cached"] = True
+        return report
+
+    def put(
+        self,
+        signature_a: Dict,
+        signature_b: Dict,
+        model: str,
+        version: str,
+        report: Dict,
+        steps: Optional[SentSteps] = None
+    ):
+        """Store a successful report as generated, noting whether (A, B) was the reversed order."""
+        key, swapped = self.pair_key(signature_a, signature_b, model, version, steps)
+        stored = {k: v for k, v in report.items() if k not in ("signatures_compared", "cached", "routing")}
+        entry = {"model": model, "version": version, "report": stored, "swapped": swapped, "stored_at": time.time()}
+
+        with self._lock:
+            self._insert(key, entry)
+            if self.path:
+                if self._file_lines >= 2 * self.max_entries or not os.path.exists(self.path):
+                    self._save()
+                else:
+                    with open(self.path, "a") as f:
+                        f.write(json.dumps({"key": key, "entry": entry}) + "\n")
+                    self._file_lines += 1
+
+    def invalidate_model(self, model: str) -> int:
+        """Drop every report produced by a model; returns the number removed."""
+        with self._lock:
+            stale = [key for key, entry in self.entries.items() if entry["model"] == model]
+            for key in stale:
+                del self.entries[key]
+            if stale and self.path:
+                self._save()
+        return len(stale)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size."""
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+    def _insert(self, key: str, entry: Dict):
+        """Add or replace an entry, evicting the oldest past max_entries (caller holds the lock)."""
+        # A replaced key moves to the end, so eviction order follows the latest write
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        if len(self.entries) > self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            self.entries.pop(next(iter(self.entries)))
+
+    def _header(self) -> Dict:
+        return {"fingerprint": self.FINGERPRINT_VERSION, "leading_steps": self.leading_steps}
+
+    def _save(self):
+        """Rewrite the file with only the live entries (caller holds the lock)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(self._header()) + "\n")
+            for key, entry in self.entries.items():
+                f.write(json.dumps({"key": key, "entry": entry}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file_lines = len(self.entries)
+
+    def _load(self):
+        """Load a persisted index, ignoring files fingerprinted differently."""
+        try:
+            with open(self.path) as f:
+                header = json.loads(f.readline() or "{}")
+                raw_lines = [line for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] Could not load contradiction index {self.path}: {e}")
+            return
+        lines = []
+        for line in raw_lines:
+            try:
+                lines.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A line cut short by a crash mid-append
+                print(f"[WARNING] Skipping an unreadable line in contradiction index {self.path}")
+
+        if header.get("fingerprint") != self.FINGERPRINT_VERSION or header.get("leading_steps") != self.leading_steps:
+            print(f"[WARNING] Contradiction index {self.path} uses a different fingerprint; starting fresh")
+            self._save()
+            return
+
+        for line in lines:
+            self._insert(line["key"], line["entry"])
+        self._file_lines = len(lines)
+        if len(lines) < len(raw_lines):
+            # Rewrite so later appends do not land after the partial line
+            self._save()
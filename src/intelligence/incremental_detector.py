@@ -0,0 +1,140 @@
+"""
+Incremental Detector - Starts contradiction detection as each signature is registered.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+
+class IncrementalDetector:
+    """
+    Compares each newly registered signature against the relevant existing ones.
+
+    Attached as an orchestrator signature listener, it runs while agents are
+    still generating: every signature that lands is paired with its siblings
+    (signatures sharing a parent) or, with scope "type", with the most recent
+    signatures of the same reasoning type, and each new pair is detected on
+    a background pool. By the time the last signature lands, most pairs have
+    already been analyzed, and collect() only waits for the pairs involving
+    it.
+
+    max_candidates only bounds how many comparisons a new signature starts
+    while it lands. collect() starts any pair among the wanted signatures
+    that was left out, so the result covers every pair detect_pairs would
+    have compared. Pairs still running when collect() times out are counted
+    in `unfinished`.
+    """
+
+    SCOPES = ("siblings", "type")
+
+    def __init__(
+        self,
+        detector,
+        graph,
+        scope: str = "siblings",
+        max_workers: int = 4,
+        reasoning_types: Optional[Iterable[str]] = None,
+        max_candidates: Optional[int] = None
+    ):
+        """
+        Args:
+            detector: ContradictionDetector used for each pair
+            graph: ReasoningGraph the signatures are registered in
+            scope: "siblings" or "type", which existing signatures a new one is compared with
+            max_workers: Number of pairs analyzed concurrently
+            reasoning_types: Only signatures of these types trigger detection (all if None)
+            max_candidates: Cap on comparisons per new signature, most recent first
+        """
+        if scope not in self.SCOPES:
+            raise ValueError(f"Unknown incremental detection scope '{scope}'; expected one of {self.SCOPES}")
+        self.detector = detector
+        self.graph = graph
+        self.scope = scope
+        self.reasoning_types = set(reasoning_types) if reasoning_types else None
+        self.max_candidates = max_candidates or Config.INCREMENTAL_DETECTION_MAX_CANDIDATES
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.pairs: Dict[Tuple[str, str], Future] = {}
+        self.last_signature_at: Optional[float] = None
+        self.settled_after_last_seconds: Optional[float] = None
+        self.unfinished = 0
+        self._lock = threading.Lock()
+
+    def on_signature(self, signature):
+        """Signature listener: start detection between the new signature and its candidates."""
+        if self.reasoning_types is not None and signature.reasoning_type not in self.reasoning_types:
+            return
+        new = signature.to_dict()
+        with self._lock:
+            self.last_signature_at = time.monotonic()
+            for other in self.candidates(signature):
+                self._submit(other.to_dict(), new)
+
+    def _submit(self, sig_a: Dict, sig_b: Dict):
+        """Start detection of a pair unless it already started; called with the lock held."""
+        key = tuple(sorted((sig_a["signature_id"], sig_b["signature_id"])))
+        if key not in self.pairs:
+            self.pairs[key] = self.pool.submit(self.detector.detect, sig_a, sig_b)
+
+    def candidates(self, signature) -> List:
+        """Existing signatures a new one should be compared with, most recent first."""
+        if self.scope == "siblings":
+            ids = [
+                child_id
+                for parent_id in signature.context["parent_signatures"]
+                for child_id in self.graph.edges.get(parent_id, [])
+            ]
+        else:
+            ids = self.graph.by_type.get(signature.reasoning_type, [])
+
+        found, seen = [], {signature.signature_id}
+        for sig_id in reversed(ids):
+            other = self.graph.get_signature(sig_id)
+            if sig_id in seen or other is None:
+                continue
+            if self.reasoning_types is not None and other.reasoning_type not in self.reasoning_types:
+                continue
+            seen.add(sig_id)
+            found.append(other)
+            if len(found) >= self.max_candidates:
+                break
+        return found
+
+    def collect(self, signature_ids: List[str], timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Wait for and return the reports of every detected pair within the given signatures.
+
+        Args:
+            signature_ids: Signatures whose pairwise reports are wanted
+            timeout: Seconds to wait for detections still running
+
+        Returns:
+            List of contradiction analyses (unfiltered), in the order the pairs were started
+        """
+        wanted = set(signature_ids)
+        signatures = [self.graph.get_signature(sig_id).to_dict() for sig_id in signature_ids]
+        with self._lock:
+            # Pairs left out by max_candidates start now, so no pair goes unchecked
+            for i, sig_a in enumerate(signatures):
+                for sig_b in signatures[i + 1:]:
+                    self._submit(sig_a, sig_b)
+            futures = [future for key, future in self.pairs.items() if wanted.issuperset(key)]
+        done, not_done = wait(futures, timeout=timeout)
+        self.unfinished = len(not_done)
+        if self.last_signature_at is not None:
+            self.settled_after_last_seconds = round(time.monotonic() - self.last_signature_at, 3)
+        return [future.result() for future in futures if future in done and not future.cancelled()]
+
+    def close(self):
+        """Stop the background pool; pairs not started yet are dropped."""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            "scope": self.scope,
+            "pairs": len(self.pairs),
+            "unfinished_pairs": self.unfinished,
+            "settled_after_last_signature_seconds": self.settled_after_last_seconds
+        }
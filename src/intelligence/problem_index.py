@@ -0,0 +1,200 @@
+"""
+Problem Index - Finds near-identical problem submissions so their analysis can be reused.
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Mersenne prime used for the universal hash family of the MinHash permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Articles carry no meaning for matching but shift every surrounding shingle
+_ARTICLES = re.compile(r"\b(a|an|the)\b")
+
+
+class ProblemIndex:
+    """
+    MinHash index over previously processed problem statements and constraints.
+
+    Text is normalized (lowercased, punctuation and articles stripped,
+    whitespace collapsed) and split into character shingles, so trivial
+    rewording, casing or punctuation changes still produce a high estimated
+    Jaccard similarity.
+    Lookups compare the query signature against every stored signature in a
+    single vectorized NumPy operation.
+
+    Entries belong to the tenant (API key or client) that submitted them, and
+    lookups only match the caller's own entries, so one tenant is never
+    offered another's problem text or analysis. A persisted index is an
+    append-only JSONL file: each add() writes one line, and the file is
+    rewritten only when it holds twice max_entries lines.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        max_entries: int = 5000,
+        seed: int = 7
+    ):
+        self.path = path
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.entries: List[Dict] = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._tenants = np.empty(0, dtype=object)
+        # Lines in the persisted file, live or evicted, to tell when to compact it
+        self._file_lines = 0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    @staticmethod
+    def normalize(problem: str, constraints: Optional[List[str]] = None) -> str:
+        """Canonical text for a problem and its (order-insensitive) constraints."""
+        parts = [problem] + sorted(constraints or [])
+        text = " | ".join(parts).lower()
+        text = re.sub(r"[^\w\s|]", " ", text)
+        text = _ARTICLES.sub(" ", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def minhash(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a normalized text."""
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # (a*x + b) mod p for every (permutation, shingle) pair, then min per permutation
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def find_similar(
+        self,
+        problem: str,
+        constraints: Optional[List[str]] = None,
+        threshold: float = 0.75,
+        tenant: str = "default"
+    ) -> Optional[Dict]:
+        """
+        Find the most similar problem the tenant indexed before.
+
+        Args:
+            problem: Problem statement to look up
+            constraints: Constraints submitted with the problem
+            threshold: Minimum estimated Jaccard similarity for a match
+            tenant: Only this tenant's entries are considered
+
+        Returns:
+            Matching entry with an added "similarity" field, or None
+        """
+        signature = self.minhash(self.normalize(problem, constraints))
+        with self._lock:
+            own = np.flatnonzero(self._tenants == tenant)
+            if not len(own):
+                return None
+            similarities = (self._signatures[own] == signature).mean(axis=1)
+            best = int(similarities.argmax())
+            if similarities[best] < threshold:
+                return None
+            return dict(self.entries[own[best]], similarity=round(float(similarities[best]), 3))
+
+    def add(self, problem: str, constraints: Optional[List[str]], analysis: Dict, tenant: str = "default") -> str:
+        """
+        Index a processed problem together with its analysis signature data.
+
+        Returns:
+            Id of the new index entry
+        """
+        signature = self.minhash(self.normalize(problem, constraints))
+        entry = {
+            "entry_id": str(uuid.uuid4()),
+            "tenant": tenant,
+            "problem": problem,
+            "constraints": constraints or [],
+            "analysis": analysis,
+            "indexed_at": time.time()
+        }
+        with self._lock:
+            self._append(entry, signature)
+            if self.path:
+                if self._file_lines >= 2 * self.max_entries or not os.path.exists(self.path):
+                    self._save()
+                else:
+                    with open(self.path, "a") as f:
+                        f.write(json.dumps({"entry": entry, "signature": signature.tolist()}) + "\n")
+                    self._file_lines += 1
+        return entry["entry_id"]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _append(self, entry: Dict, signature: np.ndarray):
+        """Add an entry in memory, evicting the oldest ones past max_entries (caller holds the lock)."""
+        self.entries.append(entry)
+        self._signatures = np.vstack([self._signatures, signature])
+        self._tenants = np.append(self._tenants, entry.get("tenant", "default"))
+        if len(self.entries) > self.max_entries:
+            overflow = len(self.entries) - self.max_entries
+            self.entries = self.entries[overflow:]
+            self._signatures = self._signatures[overflow:]
+            self._tenants = self._tenants[overflow:]
+
+    def _header(self) -> Dict:
+        return {"num_perm": self.num_perm, "shingle_size": self.shingle_size}
+
+    def _save(self):
+        """Rewrite the file with only the live entries (caller holds the lock)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(self._header()) + "\n")
+            for entry, signature in zip(self.entries, self._signatures.tolist()):
+                f.write(json.dumps({"entry": entry, "signature": signature}) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file_lines = len(self.entries)
+
+    def _load(self):
+        """Load a persisted index, ignoring files built with different parameters."""
+        try:
+            with open(self.path) as f:
+                header = json.loads(f.readline() or "{}")
+                raw_lines = [line for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARNING] Could not load problem index {self.path}: {e}")
+            return
+        lines = []
+        for line in raw_lines:
+            try:
+                lines.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A line cut short by a crash mid-append
+                print(f"[WARNING] Skipping an unreadable line in problem index {self.path}")
+
+        if header.get("num_perm") != self.num_perm or header.get("shingle_size") != self.shingle_size:
+            print(f"[WARNING] Problem index {self.path} was built with different parameters; starting fresh")
+            self._save()
+            return
+
+        for line in lines:
+            self._append(line["entry"], np.array(line["signature"], dtype=np.uint32))
+        self._file_lines = len(lines)
+        if len(lines) < len(raw_lines):
+            # Rewrite so later appends do not land after the partial line
+            self._save()
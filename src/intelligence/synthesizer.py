@@ -1,20 +1,16 @@
 """
 Synthesizer - Resolves contradictions and creates hybrid solutions.
 """
-import json
 from typing import Dict, List
-import google.generativeai as genai
-from config import Config
-
-if Config.is_configured():
-    genai.configure(api_key=Config.GEMINI_API_KEY)
+from runtime.llm import LLMClient
+from runtime.schema import default_validator
 
 
 class Synthesizer:
     """Synthesizes conflicting reasoning paths into coherent solutions."""
 
-    def __init__(self):
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+    def __init__(self, client=None):
+        self.client = client or LLMClient()
 
     def synthesize(
         self,
@@ -102,16 +98,11 @@ Generate a new thought signature with ENHANCED structure including arbitration_l
 Output ONLY the JSON.
 """
 
+        routing = self.client.route("synthesis", severity=contradiction.get('severity'))
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": 0.5
-                }
-            )
+            response_text = self.client.generate_json(prompt, routing, 0.5)
 
-            synthesis_data = json.loads(response.text)
+            synthesis_data, repairs = default_validator.parse(response_text, "ModelSignature")
 
             # Add metadata
             synthesis_data["agent_id"] = "synthesizer-orchestrator"
@@ -124,31 +115,53 @@ Output ONLY the JSON.
                 "input_data": {"contradiction": contradiction},
                 "constraints": []
             }
+            synthesis_data["metadata"] = {"routing": routing}
+            if repairs:
+                synthesis_data["metadata"]["repairs"] = repairs
 
             return synthesis_data
 
         except Exception as e:
             print(f"[ERROR] Synthesis failed: {e}")
-            # Return fallback: choose higher confidence path
-            higher_conf = signature_a if signature_a['confidence_score'] > signature_b['confidence_score'] else signature_b
-            return {
-                "agent_id": "synthesizer-orchestrator",
-                "reasoning_type": "synthesis",
-                "reasoning_chain": [
-                    {
-                        "step": 1,
-                        "thought": f"Synthesis failed, defaulting to higher confidence path from {higher_conf['agent_id']}",
-                        "confidence": higher_conf['confidence_score'],
-                        "evidence": ["Automatic fallback due to synthesis error"]
-                    }
-                ],
-                "conclusion": higher_conf['conclusion'],
-                "confidence_score": higher_conf['confidence_score'] * 0.9,  # Slight penalty
-                "alternative_paths": [],
-                "synthesis_explanation": f"Fallback to {higher_conf['agent_id']} due to synthesis error: {str(e)}",
-                "context": {
-                    "parent_signatures": [signature_a["signature_id"], signature_b["signature_id"]],
-                    "input_data": {},
-                    "constraints": []
+            fallback = self.fallback(signature_a, signature_b, f"synthesis error: {str(e)}")
+            fallback["metadata"]["routing"] = routing
+            return fallback
+
+    def fallback(self, signature_a: Dict, signature_b: Dict, reason: str) -> Dict:
+        """
+        Default to the higher-confidence path without calling the model.
+
+        Used when synthesis fails, and when the request deadline leaves no
+        time for a synthesis call.
+
+        Args:
+            signature_a: First thought signature
+            signature_b: Second thought signature
+            reason: Why synthesis was not performed
+
+        Returns:
+            Fallback synthesis signature
+        """
+        higher_conf = signature_a if signature_a['confidence_score'] > signature_b['confidence_score'] else signature_b
+        return {
+            "agent_id": "synthesizer-orchestrator",
+            "reasoning_type": "synthesis",
+            "reasoning_chain": [
+                {
+                    "step": 1,
+                    "thought": f"Synthesis not performed, defaulting to higher confidence path from {higher_conf['agent_id']}",
+                    "confidence": higher_conf['confidence_score'],
+                    "evidence": [f"Automatic fallback due to {reason}"]
                 }
-            }
+            ],
+            "conclusion": higher_conf['conclusion'],
+            "confidence_score": higher_conf['confidence_score'] * 0.9,  # Slight penalty
+            "alternative_paths": [],
+            "synthesis_explanation": f"Fallback to {higher_conf['agent_id']} due to {reason}",
+            "context": {
+                "parent_signatures": [signature_a["signature_id"], signature_b["signature_id"]],
+                "input_data": {},
+                "constraints": []
+            },
+            "metadata": {"fallback": True}
+        }
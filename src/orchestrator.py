@@ -2,20 +2,33 @@
 Thought Lineage Orchestrator (TLO) - Core coordination system.
 Manages thought signatures and reasoning lineage across multiple agents.
 """
+import bisect
+import hashlib
 import json
+import math
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-import google.generativeai as genai
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 from config import Config
+from runtime import Deadline, DeadlineExceededError, LLMClient, SpeculativeChild
 
-# Configure Gemini API
-genai.configure(api_key=Config.GEMINI_API_KEY)
+
+class FanoutRejectedError(ValueError):
+    """Raised when a fan-out request is invalid or exceeds its budget before launch."""
 
 
 class ThoughtSignature:
     """Represents a single thought signature from an agent."""
 
+    # Fields that define a signature's reasoning content for content-addressed ids.
+    # Parents, timestamps, input data and metadata vary per call and are excluded
+    CONTENT_FIELDS = (
+        "agent_id", "reasoning_type", "reasoning_chain", "conclusion",
+        "confidence_score", "alternative_paths", "constraints"
+    )
+
     def __init__(
         self,
         agent_id: str,
@@ -26,9 +39,10 @@ class ThoughtSignature:
         parent_signatures: Optional[List[str]] = None,
         input_data: Optional[Dict] = None,
         constraints: Optional[List[str]] = None,
-        alternative_paths: Optional[List[Dict]] = None
+        alternative_paths: Optional[List[Dict]] = None,
+        metadata: Optional[Dict] = None,
+        content_addressed: Optional[bool] = None
     ):
-        self.signature_id = str(uuid.uuid4())
         self.agent_id = agent_id
         self.timestamp = datetime.now().isoformat()
         self.reasoning_type = reasoning_type
@@ -41,6 +55,59 @@ class ThoughtSignature:
         self.conclusion = conclusion
         self.confidence_score = confidence_score
         self.alternative_paths = alternative_paths or []
+        self.metadata = metadata or {}
+
+        if Config.CONTENT_ADDRESSED_IDS if content_addressed is None else content_addressed:
+            self.signature_id = self.content_id()
+        else:
+            self.signature_id = str(uuid.uuid4())
+
+    def content_id(self) -> str:
+        """Hash of the canonicalized reasoning content; identical reasoning gets identical ids."""
+        payload = {
+            field: getattr(self, field) if field != "constraints" else self.context["constraints"]
+            for field in self.CONTENT_FIELDS
+        }
+        canonical = json.dumps(self._canonicalize(payload), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+    @classmethod
+    def _canonicalize(cls, value):
+        """Normalize whitespace and float precision so cosmetic differences hash alike."""
+        if isinstance(value, dict):
+            return {str(k): cls._canonicalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls._canonicalize(v) for v in value]
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, float):
+            return round(value, 6)
+        return value
+
+    @classmethod
+    def from_agent_output(cls, data: Dict) -> "ThoughtSignature":
+        """Build a signature from the dictionary returned by an agent."""
+        context = data.get('context', {})
+        return cls(
+            agent_id=data['agent_id'],
+            reasoning_type=data['reasoning_type'],
+            reasoning_chain=data['reasoning_chain'],
+            conclusion=data['conclusion'],
+            confidence_score=data['confidence_score'],
+            parent_signatures=context.get('parent_signatures', []),
+            input_data=context.get('input_data', {}),
+            constraints=context.get('constraints', []),
+            alternative_paths=data.get('alternative_paths', []),
+            metadata=data.get('metadata')
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ThoughtSignature":
+        """Restore a signature serialized by to_dict(), keeping its id and timestamp."""
+        signature = cls.from_agent_output(data)
+        signature.signature_id = data['signature_id']
+        signature.timestamp = data['timestamp']
+        return signature
 
     def to_dict(self) -> Dict:
         """Convert signature to dictionary format."""
@@ -53,7 +120,8 @@ class ThoughtSignature:
             "reasoning_chain": self.reasoning_chain,
             "conclusion": self.conclusion,
             "confidence_score": self.confidence_score,
-            "alternative_paths": self.alternative_paths
+            "alternative_paths": self.alternative_paths,
+            "metadata": self.metadata
         }
 
     def to_json(self) -> str:
@@ -64,19 +132,162 @@ class ThoughtSignature:
 class ReasoningGraph:
     """Manages the directed acyclic graph of thought signatures."""
 
+    # Width of the confidence buckets used by the confidence index
+    CONFIDENCE_BUCKETS = 10
+
     def __init__(self):
         self.nodes: Dict[str, ThoughtSignature] = {}  # signature_id -> ThoughtSignature
         self.edges: Dict[str, List[str]] = {}  # parent_id -> [child_id, ...]
 
-    def add_signature(self, signature: ThoughtSignature):
-        """Add a thought signature to the graph."""
-        self.nodes[signature.signature_id] = signature
+        # Secondary indexes maintained by add_signature
+        self.by_agent: Dict[str, List[str]] = {}  # agent_id -> [signature_id, ...]
+        self.by_type: Dict[str, List[str]] = {}  # reasoning_type -> [signature_id, ...]
+        self.by_confidence: Dict[int, List[str]] = {}  # bucket -> [signature_id, ...]
+        self._timestamps: List[str] = []  # Sorted ISO timestamps...
+        self._timestamp_ids: List[str] = []  # ...and the signature ids in the same order
 
-        # Add edges from parent signatures
-        for parent_id in signature.context["parent_signatures"]:
-            if parent_id not in self.edges:
-                self.edges[parent_id] = []
-            self.edges[parent_id].append(signature.signature_id)
+        # Number of times a duplicate signature was merged into an existing node
+        self.merges = 0
+
+        # Held while the graph is mutated or walked as a whole, so a run or a store
+        # replay adding signatures never races a reader iterating nodes or edges
+        self.lock = threading.RLock()
+
+    def add_signature(self, signature: ThoughtSignature) -> ThoughtSignature:
+        """
+        Add a thought signature to the graph.
+
+        A signature whose id is already present (content-addressed ids make
+        identical reasoning collide) is merged into the existing node: its
+        parent edges are unioned in and no new node is created.
+
+        Returns:
+            The signature stored in the graph
+        """
+        with self.lock:
+            existing = self.nodes.get(signature.signature_id)
+            if existing is not None:
+                self._merge_signature(existing, signature)
+                return existing
+
+            self.nodes[signature.signature_id] = signature
+
+            # Add edges from parent signatures
+            for parent_id in signature.context["parent_signatures"]:
+                if parent_id not in self.edges:
+                    self.edges[parent_id] = []
+                self.edges[parent_id].append(signature.signature_id)
+
+            self._index_signature(signature)
+            return signature
+
+    def _merge_signature(self, existing: ThoughtSignature, duplicate: ThoughtSignature):
+        """Union a duplicate's parent edges into the existing node."""
+        parents = existing.context["parent_signatures"]
+        for parent_id in duplicate.context["parent_signatures"]:
+            if parent_id in parents or parent_id == existing.signature_id:
+                continue
+            parents.append(parent_id)
+            self.edges.setdefault(parent_id, []).append(existing.signature_id)
+        existing.metadata["occurrences"] = existing.metadata.get("occurrences", 1) + 1
+        self.merges += 1
+
+    def _index_signature(self, signature: ThoughtSignature):
+        """Add a signature to the secondary indexes."""
+        sig_id = signature.signature_id
+        self.by_agent.setdefault(signature.agent_id, []).append(sig_id)
+        self.by_type.setdefault(signature.reasoning_type, []).append(sig_id)
+        self.by_confidence.setdefault(self._confidence_bucket(signature.confidence_score), []).append(sig_id)
+
+        # Signatures almost always arrive in time order, making this an append
+        position = bisect.bisect_right(self._timestamps, signature.timestamp)
+        self._timestamps.insert(position, signature.timestamp)
+        self._timestamp_ids.insert(position, sig_id)
+
+    @classmethod
+    def _confidence_bucket(cls, confidence) -> int:
+        try:
+            value = min(max(float(confidence), 0.0), 1.0)
+        except (TypeError, ValueError):
+            value = 0.0
+        return min(int(value * cls.CONFIDENCE_BUCKETS), cls.CONFIDENCE_BUCKETS - 1)
+
+    def query(
+        self,
+        agent_id: Optional[str] = None,
+        reasoning_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        offset: int = 0,
+        limit: int = 50
+    ) -> Dict:
+        """
+        Find signatures matching all given filters, newest first.
+
+        Candidates come from the most selective secondary index (agent, type,
+        timestamp range or confidence buckets); only those candidates are
+        checked against the remaining filters.
+
+        Args:
+            agent_id: Exact agent id
+            reasoning_type: Exact reasoning type
+            since: Inclusive lower bound on the ISO-8601 timestamp
+            until: Exclusive upper bound on the ISO-8601 timestamp
+            min_confidence: Inclusive lower bound on confidence_score
+            max_confidence: Exclusive upper bound on confidence_score
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+
+        Returns:
+            Dictionary with the total match count and the requested page of signatures
+        """
+        with self.lock:
+            # (size, producer) pairs so only the smallest candidate list is materialized
+            sources = []
+            if agent_id is not None:
+                ids = self.by_agent.get(agent_id, [])
+                sources.append((len(ids), lambda ids=ids: ids))
+            if reasoning_type is not None:
+                ids = self.by_type.get(reasoning_type, [])
+                sources.append((len(ids), lambda ids=ids: ids))
+            if since is not None or until is not None:
+                lo = bisect.bisect_left(self._timestamps, since) if since is not None else 0
+                hi = bisect.bisect_left(self._timestamps, until) if until is not None else len(self._timestamps)
+                sources.append((max(hi - lo, 0), lambda: self._timestamp_ids[lo:hi]))
+            if min_confidence is not None or max_confidence is not None:
+                first = self._confidence_bucket(min_confidence if min_confidence is not None else 0.0)
+                last = self._confidence_bucket(max_confidence if max_confidence is not None else 1.0)
+                buckets = [self.by_confidence.get(b, []) for b in range(first, last + 1)]
+                sources.append((sum(map(len, buckets)), lambda: [i for bucket in buckets for i in bucket]))
+
+            candidates = min(sources, key=lambda source: source[0])[1]() if sources else self._timestamp_ids
+
+            def matches(sig: ThoughtSignature) -> bool:
+                if agent_id is not None and sig.agent_id != agent_id:
+                    return False
+                if reasoning_type is not None and sig.reasoning_type != reasoning_type:
+                    return False
+                if since is not None and sig.timestamp < since:
+                    return False
+                if until is not None and sig.timestamp >= until:
+                    return False
+                if min_confidence is not None and sig.confidence_score < min_confidence:
+                    return False
+                if max_confidence is not None and sig.confidence_score >= max_confidence:
+                    return False
+                return True
+
+            matched = [sig for sig in (self.nodes[sig_id] for sig_id in candidates) if matches(sig)]
+        matched.sort(key=lambda sig: sig.timestamp, reverse=True)
+
+        return {
+            "total": len(matched),
+            "offset": offset,
+            "limit": limit,
+            "signatures": matched[offset:offset + limit]
+        }
 
     def get_signature(self, signature_id: str) -> Optional[ThoughtSignature]:
         """Retrieve a signature by ID."""
@@ -103,52 +314,185 @@ class ReasoningGraph:
 
         return lineage
 
-    def to_dict(self) -> Dict:
-        """Export graph structure for visualization."""
+    def get_ancestor_ids(self, signature_id: str) -> List[str]:
+        """Ids of every ancestor of a signature, each listed once, nearest first (depth-first)."""
+        ancestors = []
+        seen = {signature_id}
+        stack = [signature_id]
+        while stack:
+            signature = self.nodes.get(stack.pop())
+            if not signature:
+                continue
+            parents = [p for p in signature.context["parent_signatures"] if p not in seen and p in self.nodes]
+            seen.update(parents)
+            ancestors.extend(parents)
+            # Reversed so parents are visited in their declared order
+            stack.extend(reversed(parents))
+        return ancestors
+
+    @staticmethod
+    def node_view(signature: ThoughtSignature) -> Dict:
+        """One node as exported for visualization."""
         return {
-            "nodes": [
-                {
-                    "id": sig_id,
-                    "agent": sig.agent_id,
-                    "type": sig.reasoning_type,
-                    "conclusion": sig.conclusion,
-                    "confidence": sig.confidence_score,
-                    "timestamp": sig.timestamp
-                }
-                for sig_id, sig in self.nodes.items()
-            ],
-            "edges": [
-                {"source": parent_id, "target": child_id}
-                for parent_id, child_ids in self.edges.items()
-                for child_id in child_ids
-            ]
+            "id": signature.signature_id,
+            "agent": signature.agent_id,
+            "type": signature.reasoning_type,
+            "conclusion": signature.conclusion,
+            "confidence": signature.confidence_score,
+            "timestamp": signature.timestamp
         }
 
+    def to_dict(self) -> Dict:
+        """Export graph structure for visualization."""
+        with self.lock:
+            return {
+                "nodes": [self.node_view(sig) for sig in self.nodes.values()],
+                "edges": [
+                    {"source": parent_id, "target": child_id}
+                    for parent_id, child_ids in self.edges.items()
+                    for child_id in child_ids
+                ]
+            }
+
 
 class ThoughtLineageOrchestrator:
     """
     Main orchestrator that coordinates agents and manages reasoning lineage.
     """
 
-    def __init__(self):
+    # Signature fields a recompute() change may overwrite directly
+    EDITABLE_FIELDS = ("conclusion", "confidence_score", "reasoning_chain", "alternative_paths")
+
+    def __init__(
+        self,
+        problem_index=None,
+        contradiction_index=None,
+        model_router=None,
+        budget=None,
+        tenant: str = "default",
+        priority: str = "interactive",
+        api_key: Optional[str] = None,
+        model: Optional[str] = None
+    ):
         self.graph = ReasoningGraph()
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        # Every model call goes through one client so routing stats, the
+        # request budget (runtime.RequestBudget), the scheduler's tenant and
+        # priority class (runtime.FairScheduler) and the caller's own API key
+        # and model cover the whole request
+        self.client = LLMClient(
+            router=model_router,
+            budget=budget,
+            tenant=tenant,
+            priority=priority,
+            api_key=api_key,
+            model=model
+        )
+        # Optional indexes shared across requests: intelligence.ProblemIndex for
+        # analysis reuse and intelligence.ContradictionIndex for detection reuse
+        self.problem_index = problem_index
+        self.contradiction_index = contradiction_index
+        self.analytics = None
+        self.summarizer = None
+        # Callables notified with every registered signature (e.g. graph.SharedGraphStore)
+        self.signature_listeners: List[Callable[[ThoughtSignature], None]] = []
+        # Held by recompute(), so concurrent recomputes of one graph do not interleave
+        self._recompute_lock = threading.Lock()
+
+    def for_caller(self, **client_options) -> "ThoughtLineageOrchestrator":
+        """
+        An orchestrator on this one's graph whose model calls go through a client of the caller's.
+
+        The graph, indexes, listeners and recompute lock are shared, so
+        signatures registered through it land in this graph and reach the
+        same listeners. Model calls use only the caller's budget, tenant,
+        priority, API key and model (LLMClient options).
+        """
+        caller = ThoughtLineageOrchestrator(
+            problem_index=self.problem_index,
+            contradiction_index=self.contradiction_index,
+            model_router=self.client.router,
+            **client_options
+        )
+        caller.graph = self.graph
+        caller.signature_listeners = self.signature_listeners
+        caller._recompute_lock = self._recompute_lock
+        return caller
 
     def register_signature(self, signature: ThoughtSignature) -> str:
         """Register a new thought signature in the reasoning graph."""
-        self.graph.add_signature(signature)
-        print(f"[+] Registered signature {signature.signature_id[:8]}... from {signature.agent_id}")
+        stored = self.graph.add_signature(signature)
+        if stored is signature:
+            print(f"[+] Registered signature {signature.signature_id[:8]}... from {signature.agent_id}")
+        else:
+            print(f"[=] Merged duplicate signature {signature.signature_id[:8]}... from {signature.agent_id}")
+        for listener in self.signature_listeners:
+            listener(signature)
         return signature.signature_id
 
     def get_graph_visualization_data(self) -> Dict:
         """Get graph data formatted for visualization."""
         return self.graph.to_dict()
 
+    def get_graph_summary(self, cluster_id: Optional[str] = None, offset: int = 0, max_nodes: Optional[int] = None) -> Dict:
+        """
+        Get a bounded level-of-detail view of the graph, or expand one of its collapsed nodes.
+
+        Args:
+            cluster_id: Id of a collapsed node from an earlier summary to expand
+            offset: First node to return when the view is paged
+            max_nodes: Cap on nodes in the view (defaults to Config.GRAPH_SUMMARY_MAX_NODES)
+
+        Returns:
+            Summary view; raises KeyError for an unknown cluster_id
+        """
+        from graph import GraphSummarizer
+
+        max_nodes = max_nodes or Config.GRAPH_SUMMARY_MAX_NODES
+        if self.summarizer is None or self.summarizer.max_nodes != max_nodes:
+            self.summarizer = GraphSummarizer(max_nodes, Config.GRAPH_SUMMARY_CONCLUSION_CHARS)
+        with self.graph.lock:
+            return self.summarizer.summarize(self.graph, cluster_id, offset)
+
     def get_signature_details(self, signature_id: str) -> Optional[Dict]:
         """Get detailed information about a specific signature."""
         signature = self.graph.get_signature(signature_id)
         return signature.to_dict() if signature else None
 
+    def get_lineage_analytics(self):
+        """Lineage analytics over the graph, compiled on first use and updated incrementally after."""
+        from graph import LineageAnalytics
+
+        with self.graph.lock:
+            if self.analytics is None:
+                self.analytics = LineageAnalytics(self.graph)
+            else:
+                self.analytics.update()
+            return self.analytics
+
+    def get_lineage_metrics(self, signature_id: Optional[str] = None, top: int = 10) -> Dict:
+        """
+        Get propagated-confidence and weakest-link metrics.
+
+        Args:
+            signature_id: Restrict the report to one signature and its critical path
+            top: Number of weakest signatures to report
+
+        Returns:
+            Dictionary of lineage metrics
+        """
+        with self.graph.lock:
+            analytics = self.get_lineage_analytics()
+            if signature_id:
+                metrics = analytics.metrics(signature_id)
+                if metrics is None:
+                    return {"error": "Signature not found"}
+                return {"metrics": metrics, "critical_path": analytics.critical_path(signature_id)}
+
+            return {
+                "metrics": analytics.all_metrics(),
+                "weakest_links": analytics.weakest_links(top)
+            }
+
     def export_lineage(self, signature_id: str) -> Dict:
         """Export the complete lineage for a given signature."""
         signature = self.graph.get_signature(signature_id)
@@ -162,99 +506,847 @@ class ThoughtLineageOrchestrator:
             "lineage_depth": len(lineage)
         }
 
-    def process_problem(self, problem: str, constraints: Optional[List[str]] = None) -> Dict:
+    def collect_lineages(self, signature_ids: List[str]) -> Dict:
+        """
+        Resolve the ancestor ids of many targets and the union of nodes they cover.
+
+        Args:
+            signature_ids: Target signature ids
+
+        Returns:
+            Dictionary with "targets" (each with its ancestor ids), "missing"
+            ids and "node_ids", the insertion-ordered union of targets and ancestors
+        """
+        targets = []
+        missing = []
+        node_ids = {}  # Insertion-ordered set
+        with self.graph.lock:
+            for signature_id in dict.fromkeys(signature_ids):
+                if signature_id not in self.graph.nodes:
+                    missing.append(signature_id)
+                    continue
+                ancestors = self.graph.get_ancestor_ids(signature_id)
+                targets.append({
+                    "signature_id": signature_id,
+                    "ancestors": ancestors,
+                    "lineage_depth": len(ancestors)
+                })
+                node_ids[signature_id] = None
+                node_ids.update(dict.fromkeys(ancestors))
+
+        return {"targets": targets, "missing": missing, "node_ids": list(node_ids)}
+
+    def iter_lineages_export(self, signature_ids: List[str]) -> Iterator[str]:
+        """
+        Stream a deduplicated multi-lineage export as JSON text chunks.
+
+        Every signature shared by several lineages is serialized exactly once
+        in the "nodes" table; targets refer to their ancestors by id.
+
+        Args:
+            signature_ids: Target signature ids to export lineages for
+
+        Yields:
+            Chunks of the JSON document, suitable for a file or HTTP response
+        """
+        lineages = self.collect_lineages(signature_ids)
+        yield '{"targets": ' + json.dumps(lineages["targets"])
+        yield ', "missing": ' + json.dumps(lineages["missing"])
+        yield ', "node_count": ' + str(len(lineages["node_ids"]))
+        yield ', "nodes": ['
+        for i, node_id in enumerate(lineages["node_ids"]):
+            yield ("," if i else "") + json.dumps(self.graph.nodes[node_id].to_dict())
+        yield ']}'
+
+    def export_lineages(self, signature_ids: List[str], filepath: str):
+        """Write a deduplicated multi-lineage export to a JSON file."""
+        with open(filepath, 'w') as f:
+            for chunk in self.iter_lineages_export(signature_ids):
+                f.write(chunk)
+        print(f"[SAVED] Exported {len(signature_ids)} lineages to {filepath}")
+
+    def run_analysis(
+        self,
+        problem: str,
+        constraints: Optional[List[str]] = None,
+        reuse_analysis: Optional[str] = None,
+        on_conclusion=None
+    ) -> Tuple[ThoughtSignature, Optional[Dict]]:
+        """
+        Run the analysis phase, reusing the analysis of a near-identical prior problem if allowed.
+
+        Args:
+            problem: The problem statement to analyze
+            constraints: Optional list of constraints
+            reuse_analysis: "auto" reuses a matching cached analysis, "offer" runs the
+                analyzer but reports the match, "never" skips the lookup
+                (defaults to Config.ANALYSIS_REUSE_MODE)
+            on_conclusion: Optional callback receiving the analyzer's streamed
+                conclusion early (not called when a cached analysis is reused)
+
+        Returns:
+            Tuple of (registered analysis signature, reuse info dict or None)
+        """
+        from agents import AnalyzerAgent
+
+        mode = reuse_analysis or Config.ANALYSIS_REUSE_MODE
+        match = None
+        if self.problem_index is not None and mode != "never":
+            # Only the same tenant's earlier problems are matched
+            match = self.problem_index.find_similar(
+                problem,
+                constraints,
+                Config.PROBLEM_SIMILARITY_THRESHOLD,
+                tenant=self.client.tenant
+            )
+
+        reuse = None
+        if match and mode == "auto":
+            analysis_data = dict(match["analysis"])
+            analysis_data["context"] = {
+                "parent_signatures": [],
+                "input_data": {
+                    "problem": problem,
+                    "reused_analysis_of": match["problem"],
+                    "similarity": match["similarity"]
+                },
+                "constraints": constraints or []
+            }
+            # Routing metadata describes the original call, not this request
+            analysis_data.pop("metadata", None)
+            reuse = {"status": "reused", "similarity": match["similarity"], "matched_problem": match["problem"]}
+            print(f"  -> Reusing analysis of a near-identical problem (similarity {match['similarity']})")
+        else:
+            analysis_data = AnalyzerAgent(client=self.client).analyze(
+                problem,
+                constraints,
+                on_conclusion=on_conclusion
+            )
+            if self.problem_index is not None:
+                self.problem_index.add(problem, constraints, analysis_data, tenant=self.client.tenant)
+            if match:
+                reuse = {"status": "offered", "similarity": match["similarity"], "matched_problem": match["problem"]}
+
+        analysis_sig = ThoughtSignature.from_agent_output(analysis_data)
+        self.register_signature(analysis_sig)
+        return analysis_sig, reuse
+
+    def process_problem(
+        self,
+        problem: str,
+        constraints: Optional[List[str]] = None,
+        reuse_analysis: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        speculative: Optional[bool] = None,
+        executor_shards: Optional[int] = None
+    ) -> Dict:
         """
         Process a problem through multiple agents and manage their reasoning.
 
         Args:
             problem: The problem statement to solve
             constraints: Optional list of constraints to consider
+            reuse_analysis: Analysis reuse mode for near-identical problems (auto, offer, never)
+            deadline: Optional end-to-end deadline; planning and execution are
+                skipped, and prompts or models reduced, when time runs short
+            speculative: Start the planner and executor as soon as their parent's
+                conclusion has streamed in, re-running them if the final parent
+                differs (defaults to Config.SPECULATIVE_EXECUTION)
+            executor_shards: Split execution planning into this many concurrent
+                workstreams (defaults to Config.EXECUTOR_SHARDS; 1 or less runs a
+                single executor)
 
         Returns:
             Dictionary containing final result and complete reasoning graph
         """
-        from agents import AnalyzerAgent, PlannerAgent, ExecutorAgent
+        from agents import PlannerAgent, ExecutorAgent
 
+        deadline = self._attach_deadline(deadline)
         print(f"\n[*] Processing problem: {problem[:100]}...")
 
         # Create specialized agents
-        analyzer = AnalyzerAgent()
-        planner = PlannerAgent()
-        executor = ExecutorAgent()
+        planner = PlannerAgent(client=self.client)
+        executor = ExecutorAgent(client=self.client)
 
+        speculative = Config.SPECULATIVE_EXECUTION if speculative is None else speculative
+        shards = Config.EXECUTOR_SHARDS if executor_shards is None else executor_shards
         signatures = []
+        speculations = {}
 
-        # Phase 1: Analysis
-        print("[PHASE 1] Running analysis...")
-        analysis_data = analyzer.analyze(problem, constraints)
-        analysis_sig = ThoughtSignature(
-            agent_id=analysis_data['agent_id'],
-            reasoning_type=analysis_data['reasoning_type'],
-            reasoning_chain=analysis_data['reasoning_chain'],
-            conclusion=analysis_data['conclusion'],
-            confidence_score=analysis_data['confidence_score'],
-            parent_signatures=analysis_data['context'].get('parent_signatures', []),
-            input_data=analysis_data['context'].get('input_data', {}),
-            constraints=analysis_data['context'].get('constraints', []),
-            alternative_paths=analysis_data.get('alternative_paths', [])
-        )
-        self.register_signature(analysis_sig)
-        signatures.append(analysis_sig)
-        print(f"  -> Analysis complete: {analysis_sig.conclusion[:100]}...")
+        def run_executor(plan_parent):
+            return executor.execute_plan(
+                problem,
+                planning_signatures=[plan_parent],
+                constraints=constraints
+            )
+
+        def run_planner(analysis_parent):
+            # Each planner attempt owns the executor speculation started from its own conclusion.
+            # Workstreams are split from the plan's reasoning chain, so sharded execution waits for it
+            execution = SpeculativeChild(pool, run_executor)
+            data = planner.plan(
+                problem,
+                analysis_signatures=[analysis_parent],
+                constraints=constraints,
+                on_conclusion=execution.start if speculative and shards <= 1 else None
+            )
+            return data, execution
+
+        pool = ThreadPoolExecutor(max_workers=4)
+        planning = SpeculativeChild(pool, run_planner)
+        execution = None
+        try:
+            # Phase 1: Analysis
+            print("[PHASE 1] Running analysis...")
+            analysed = self._within_deadline("analysis", lambda: self.run_analysis(
+                problem,
+                constraints,
+                reuse_analysis,
+                on_conclusion=planning.start if speculative else None
+            ))
+            analysis_sig, analysis_reuse = analysed or (None, None)
+            planned = None
+            if analysis_sig is not None:
+                signatures.append(analysis_sig)
+                print(f"  -> Analysis complete: {analysis_sig.conclusion[:100]}...")
+
+                # Phase 2: Planning (using analysis)
+                print("[PHASE 2] Creating plan...")
+                planned = planning.take(analysis_sig.to_dict())
+                if planned is None:
+                    planned = self._within_deadline("decision", lambda: run_planner(analysis_sig.to_dict()))
+            else:
+                deadline.degrade("decision", "skipped", "no analysis to plan from")
+            if planned is not None:
+                planning_data, execution = planned
+                planning_sig = self._register_child(planning_data, analysis_sig, planning if speculative else None)
+                speculations["decision"] = planning
+                signatures.append(planning_sig)
+                print(f"  -> Plan complete: {planning_sig.conclusion[:100]}...")
+
+                # Phase 3: Execution planning
+                print("[PHASE 3] Planning execution...")
+                if shards > 1:
+                    execution_sigs = self._within_deadline(
+                        "evaluation",
+                        lambda: self._execute_sharded(problem, planning_sig, shards, constraints)
+                    )
+                    if execution_sigs is not None:
+                        signatures.extend(execution_sigs)
+                        print(f"  -> Execution plan complete ({len(execution_sigs) - 1} workstreams): {execution_sigs[-1].conclusion[:100]}...")
+                else:
+                    execution_data = execution.take(planning_sig.to_dict())
+                    if execution_data is None:
+                        execution_data = self._within_deadline("evaluation", lambda: run_executor(planning_sig.to_dict()))
+                    if execution_data is not None:
+                        execution_sig = self._register_child(execution_data, planning_sig, execution if speculative else None)
+                        speculations["evaluation"] = execution
+                        signatures.append(execution_sig)
+                        print(f"  -> Execution plan complete: {execution_sig.conclusion[:100]}...")
+            else:
+                deadline.degrade("evaluation", "skipped", "no plan to execute")
+        finally:
+            # Results are taken by now, so whatever still runs was discarded; it
+            # stops at its next model call (an executor started from a discarded
+            # plan is cancelled along with that plan)
+            planning.cancel()
+            if execution is not None:
+                execution.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        results = {
+            "problem": problem,
+            "signatures": [sig.to_dict() for sig in signatures],
+            # The last phase that ran answers the problem when later phases were skipped
+            "final_conclusion": signatures[-1].conclusion if signatures else None,
+            "analysis_reuse": analysis_reuse,
+            "budget": self._budget_summary(),
+            "deadline": deadline.to_dict(),
+            "degraded_phases": deadline.degraded,
+            "graph": self.get_graph_visualization_data()
+        }
+        if speculative:
+            results["speculation"] = {phase: child.to_dict() for phase, child in speculations.items()}
+
+        return results
+
+    def _register_child(
+        self,
+        data: Dict,
+        parent: ThoughtSignature,
+        speculation: Optional[SpeculativeChild] = None
+    ) -> ThoughtSignature:
+        """
+        Register a child signature against its final parent.
+
+        A speculative child was started from a partial parent with no id yet,
+        so its parent edge is pointed at the registered parent here.
+        """
+        data["context"]["parent_signatures"] = [parent.signature_id]
+        if speculation is not None:
+            data.setdefault("metadata", {})["speculation"] = speculation.to_dict()
+        sig = ThoughtSignature.from_agent_output(data)
+        self.register_signature(sig)
+        return sig
+
+    def _execute_sharded(
+        self,
+        problem: str,
+        planning_sig: ThoughtSignature,
+        shards: int,
+        constraints: Optional[List[str]] = None
+    ) -> List[ThoughtSignature]:
+        """
+        Plan execution map-reduce style: one executor sub-agent per workstream.
+
+        The plan's reasoning chain is split into workstreams that sub-agents
+        cover concurrently, each with a compact prompt, so the longest single
+        generation shrinks as the shard count grows. Workstream signatures are
+        registered as children of the plan as they land; their outputs are
+        then reduced locally into one evaluation signature that has them as
+        parents.
+
+        Returns:
+            The workstream signatures in workstream order, followed by the reduced signature
+        """
+        from agents import ExecutorAgent
+
+        plan = planning_sig.to_dict()
+        count = len(ExecutorAgent.workstreams(plan["reasoning_chain"], shards))
+        agents = [ExecutorAgent(client=self.client, workstream=i) for i in range(1, count + 1)]
+        landed = {}
+        with ThreadPoolExecutor(max_workers=min(count, Config.MAX_PARALLEL_AGENTS)) as pool:
+            futures = {
+                pool.submit(agent.execute_workstream, problem, plan, count, constraints): agent.workstream
+                for agent in agents
+            }
+            for future in as_completed(futures):
+                landed[futures[future]] = self._register_child(future.result(), planning_sig)
 
-        # Phase 2: Planning (using analysis)
-        print("[PHASE 2] Creating plan...")
-        planning_data = planner.plan(
+        workstream_sigs = [landed[i] for i in sorted(landed)]
+        reduced = ExecutorAgent(client=self.client).reduce_workstreams(
             problem,
-            analysis_signatures=[analysis_sig.to_dict()],
-            constraints=constraints
+            [sig.to_dict() for sig in workstream_sigs],
+            constraints
+        )
+        reduced_sig = ThoughtSignature.from_agent_output(reduced)
+        self.register_signature(reduced_sig)
+        return workstream_sigs + [reduced_sig]
+
+    def recompute(
+        self,
+        changes: List[Dict],
+        deadline: Optional[Deadline] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Dict:
+        """
+        Regenerate only the signatures affected by a change, make-style.
+
+        Each changed signature and every descendant reachable through the
+        graph's edges is marked dirty; every other signature is reused as is.
+        Dirty signatures are regenerated in topological order, each starting
+        as soon as its dirty parents are done, so independent branches run in
+        parallel. Regenerated signatures are registered as new nodes that point
+        at the new versions of their parents, with metadata.supersedes naming
+        the node they replace; the old nodes stay in the graph. A synthesis
+        whose parents all come back as the same signatures is reused.
+
+        Args:
+            changes: One dict per changed signature with its "signature_id" and either
+                "constraints" (re-run it with new constraints), edited fields
+                ("conclusion", "confidence_score", "reasoning_chain",
+                "alternative_paths"; applied as is without a model call), or
+                "regenerate": true (re-run it unchanged)
+            deadline: Optional end-to-end deadline; signatures that cannot finish
+                in time are skipped together with their descendants
+            max_concurrency: Cap on concurrent model calls (defaults to Config.MAX_PARALLEL_AGENTS)
+
+        Returns:
+            Dictionary with the regenerated and reused signatures, failures and graph;
+            raises KeyError for an unknown signature_id and ValueError for a superseded one
+        """
+        with self._recompute_lock:
+            return self._recompute(changes, deadline, max_concurrency)
+
+    def _recompute(
+        self,
+        changes: List[Dict],
+        deadline: Optional[Deadline],
+        max_concurrency: Optional[int]
+    ) -> Dict:
+        """recompute() with the graph's recompute lock held."""
+        from agents import ExecutorAgent
+
+        deadline = self._attach_deadline(deadline)
+        # Versions already replaced by an earlier recompute, mapped to their replacement
+        with self.graph.lock:
+            superseded = {
+                sig.metadata["supersedes"]: sig.signature_id
+                for sig in self.graph.nodes.values()
+                if sig.metadata.get("supersedes") not in (None, sig.signature_id)
+            }
+        changes_by_id = {}
+        for change in changes:
+            signature_id = change.get("signature_id")
+            if self.graph.get_signature(signature_id) is None:
+                raise KeyError(f"Unknown signature: {signature_id}")
+            if signature_id in superseded:
+                raise ValueError(
+                    f"Signature {signature_id} was superseded by {superseded[signature_id]}; change the latest version"
+                )
+            changes_by_id[signature_id] = change
+
+        # Mark: the changed signatures and everything downstream of them, leaving
+        # out superseded versions
+        dirty = set()
+        stack = list(changes_by_id)
+        while stack:
+            signature_id = stack.pop()
+            if signature_id in dirty:
+                continue
+            dirty.add(signature_id)
+            stack.extend(c for c in self.graph.edges.get(signature_id, []) if c not in superseded)
+        for signature_id in dirty:
+            self._agent_for(self.graph.get_signature(signature_id))  # Fail before any call is made
+
+        pending = {
+            signature_id: sum(1 for p in self.graph.get_signature(signature_id).context["parent_signatures"] if p in dirty)
+            for signature_id in dirty
+        }
+        with self.graph.lock:
+            reused = sum(1 for i in self.graph.nodes if i not in dirty and i not in superseded)
+        replaced: Dict[str, ThoughtSignature] = {}
+        regenerated, failed, skipped = [], [], []
+        calls = 0
+
+        def rebuild(old: ThoughtSignature) -> Tuple[Dict, int]:
+            """Produce the new version of one dirty signature; returns (data, model calls made)."""
+            parents = [replaced.get(p) or self.graph.get_signature(p) for p in old.context["parent_signatures"]]
+            parents = [p for p in parents if p is not None]
+            change = changes_by_id.get(old.signature_id, {})
+            edits = {field: change[field] for field in self.EDITABLE_FIELDS if field in change}
+            if edits:
+                data = dict(old.to_dict(), context=dict(old.context))
+                data.update(edits)
+                data["metadata"] = {"edited": sorted(edits)}
+                return data, 0
+            if old.reasoning_type == "synthesis":
+                if not change and [p.signature_id for p in parents] == old.context["parent_signatures"]:
+                    # Every parent came back as the same signature; the synthesis still holds
+                    return None, 0
+                return self._resynthesize(parents), 2
+            constraints = change.get("constraints", old.context.get("constraints"))
+            # Sharded execution: workstreams are re-split from the new plan, and reducing is local
+            workstream = old.metadata.get("workstream")
+            if workstream:
+                agent = ExecutorAgent(client=self.client, workstream=workstream["index"])
+                return agent.execute_workstream(workstream["problem"], parents[0].to_dict(), workstream["count"], constraints), 1
+            reduced = old.metadata.get("reduced_workstreams")
+            if reduced:
+                return ExecutorAgent(client=self.client).reduce_workstreams(reduced["problem"], [p.to_dict() for p in parents], constraints), 0
+            agent = self._agent_for(old)
+            data = agent.generate_signature(
+                old.context["input_data"].get("problem", ""),
+                old.reasoning_type,
+                parent_signatures=[p.to_dict() for p in parents] or None,
+                constraints=constraints
+            )
+            return data, 1
+
+        print(f"\n[*] Recomputing {len(dirty)} of {len(self.graph.nodes)} signatures...")
+        concurrency = max(1, max_concurrency or Config.MAX_PARALLEL_AGENTS)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {}
+
+            def submit_ready(signature_ids):
+                for signature_id in signature_ids:
+                    if signature_id in dirty and pending[signature_id] == 0:
+                        pending[signature_id] = -1
+                        if not self.client.can_finish():
+                            deadline.degrade("recompute", f"skipped {signature_id[:8]}", f"{deadline.remaining():.1f}s left")
+                            skip(signature_id)
+                            continue
+                        futures[pool.submit(rebuild, self.graph.get_signature(signature_id))] = signature_id
+
+            def skip(signature_id):
+                # Descendants of a signature that could not be rebuilt are not rebuilt either
+                stack = [signature_id]
+                while stack:
+                    current = stack.pop()
+                    if current in skipped:
+                        continue
+                    skipped.append(current)
+                    pending[current] = -1
+                    stack.extend(c for c in self.graph.edges.get(current, []) if c in dirty)
+
+            submit_ready(list(dirty))
+            while futures:
+                future = next(as_completed(futures))
+                signature_id = futures.pop(future)
+                old = self.graph.get_signature(signature_id)
+                try:
+                    data, made = future.result()
+                except Exception as e:
+                    failed.append({"signature_id": signature_id, "agent": old.agent_id, "error": str(e)})
+                    skip(signature_id)
+                    continue
+                calls += made
+                if data is None:
+                    replaced[signature_id] = old
+                    reused += 1
+                else:
+                    data["context"]["parent_signatures"] = [
+                        replaced[p].signature_id if p in replaced else p
+                        for p in old.context["parent_signatures"]
+                    ]
+                    data.setdefault("metadata", {})["supersedes"] = signature_id
+                    # A content-addressed duplicate merges into the existing node
+                    new = self.graph.get_signature(self.register_signature(ThoughtSignature.from_agent_output(data)))
+                    replaced[signature_id] = new
+                    regenerated.append({"old_id": signature_id, "new_id": new.signature_id, "agent": old.agent_id, "model_calls": made})
+                children = [c for c in self.graph.edges.get(signature_id, []) if c in dirty and c not in skipped]
+                for child in children:
+                    pending[child] -= 1
+                submit_ready(children)
+
+        new_sigs = [replaced[r["old_id"]] for r in regenerated]
+        return {
+            "changed": list(changes_by_id),
+            "regenerated": regenerated,
+            "reused": reused,
+            "model_calls": calls,
+            "failed": failed,
+            "skipped": [s for s in skipped if s not in {f["signature_id"] for f in failed}],
+            "signatures": [sig.to_dict() for sig in new_sigs],
+            "final_conclusion": new_sigs[-1].conclusion if new_sigs else None,
+            "budget": self._budget_summary(),
+            "deadline": deadline.to_dict(),
+            "degraded_phases": deadline.degraded,
+            "graph": self.get_graph_visualization_data()
+        }
+
+    def _agent_for(self, signature: ThoughtSignature):
+        """The agent that regenerates a signature, rebuilt from its agent id and recorded role."""
+        from agents import AnalyzerAgent, ExecutorAgent, PlannerAgent
+        from agents.base_agent import BaseAgent
+        from agents.planner import FOCUS_PROFILES
+
+        if signature.reasoning_type == "synthesis":
+            return None
+        role = signature.context["input_data"].get("role_description")
+        if role:
+            return BaseAgent(signature.agent_id, role, client=self.client)
+        # Signatures recorded before roles were stored: the built-in agents
+        builtin = [AnalyzerAgent(client=self.client), PlannerAgent(client=self.client), ExecutorAgent(client=self.client)]
+        builtin += [PlannerAgent(focus=focus, client=self.client) for focus in FOCUS_PROFILES]
+        for agent in builtin:
+            if agent.agent_id == signature.agent_id:
+                return agent
+        raise ValueError(f"Cannot regenerate signature {signature.signature_id}: unknown agent {signature.agent_id}")
+
+    def _resynthesize(self, parents: List[ThoughtSignature]) -> Dict:
+        """Re-detect the contradiction between a synthesis' parents and synthesize them again."""
+        from intelligence import ContradictionDetector, Synthesizer
+
+        sig_a, sig_b = (p.to_dict() for p in parents[:2])
+        report = ContradictionDetector(index=self.contradiction_index, client=self.client).detect(sig_a, sig_b)
+        if report["signatures_compared"][0] != sig_a["signature_id"]:
+            # A cached report for the reversed pair keeps its own A/B sides
+            sig_a, sig_b = sig_b, sig_a
+        return Synthesizer(client=self.client).synthesize(sig_a, sig_b, report)
+
+    def _attach_deadline(self, deadline: Optional[Deadline]) -> Deadline:
+        """Carry a request deadline into every model call made through the shared client."""
+        self.client.deadline = deadline or Deadline(None)
+        return self.client.deadline
+
+    def _within_deadline(self, phase: str, call):
+        """
+        Run one phase unless the deadline rules it out.
+
+        Returns the call's result, or None when the phase was skipped because
+        not even the fastest model could finish in time or the call ran past
+        the deadline.
+        """
+        deadline = self.client.deadline
+        if not self.client.can_finish():
+            deadline.degrade(phase, "skipped", f"{deadline.remaining():.1f}s left")
+            return None
+        try:
+            return call()
+        except DeadlineExceededError as e:
+            deadline.degrade(phase, "skipped", str(e))
+            return None
+
+    def _budget_summary(self) -> Optional[Dict]:
+        """Spend recorded against the request budget, if one was given."""
+        return self.client.budget.to_dict() if self.client.budget is not None else None
+
+    def estimate_fanout_cost(
+        self,
+        problem: str,
+        focus_profiles: List[Any],
+        constraints: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Dict:
+        """
+        Estimate calls, tokens, cost and latency of a competing-planner fan-out.
+
+        Token counts are approximated from prompt sizes (~4 characters per token)
+        and Config.ESTIMATED_OUTPUT_TOKENS; latency assumes every wave of
+        concurrent calls takes Config.ESTIMATED_CALL_LATENCY_SECONDS.
+
+        Args:
+            problem: The problem statement
+            focus_profiles: Focus profiles as accepted by run_competing_plans
+            constraints: Optional constraints shared by every perspective
+            max_concurrency: Cap on concurrent model calls
+
+        Returns:
+            Dictionary with call counts, token estimates, cost and latency
+        """
+        from agents.planner import resolve_focus_profile
+
+        profiles = [resolve_focus_profile(p) for p in focus_profiles]
+        concurrency = max(1, max_concurrency or Config.MAX_PARALLEL_AGENTS)
+        k = len(profiles)
+        pairs = k * (k - 1) // 2
+        outputs = Config.ESTIMATED_OUTPUT_TOKENS
+
+        # Fixed prompt scaffolding is roughly 2K characters for every call type
+        base_tokens = (2000 + len(problem) + sum(len(c) for c in constraints or [])) // 4
+        analysis_in = base_tokens
+        planner_in = sum(
+            base_tokens + (len(p["role_description"]) + sum(len(c) for c in p["constraints"])) // 4
+            + outputs["signature"] // 8  # Parent conclusion carried as context
+            for p in profiles
         )
-        planning_sig = ThoughtSignature(
-            agent_id=planning_data['agent_id'],
-            reasoning_type=planning_data['reasoning_type'],
-            reasoning_chain=planning_data['reasoning_chain'],
-            conclusion=planning_data['conclusion'],
-            confidence_score=planning_data['confidence_score'],
-            parent_signatures=planning_data['context'].get('parent_signatures', []),
-            input_data=planning_data['context'].get('input_data', {}),
-            constraints=planning_data['context'].get('constraints', []),
-            alternative_paths=planning_data.get('alternative_paths', [])
+        detection_in = pairs * (2000 // 4 + outputs["signature"] // 2)
+        synthesis_in = (2500 // 4 + outputs["signature"] // 2) if pairs else 0
+
+        input_tokens = analysis_in + planner_in + detection_in + synthesis_in
+        output_tokens = (
+            (1 + k) * outputs["signature"]
+            + pairs * outputs["detection"]
+            + (outputs["synthesis"] if pairs else 0)
         )
-        self.register_signature(planning_sig)
-        signatures.append(planning_sig)
-        print(f"  -> Plan complete: {planning_sig.conclusion[:100]}...")
 
-        # Phase 3: Execution planning
-        print("[PHASE 3] Planning execution...")
-        execution_data = executor.execute_plan(
-            problem,
-            planning_signatures=[planning_sig.to_dict()],
-            constraints=constraints
+        model = self.client.model or Config.GEMINI_MODEL
+        price_in, price_out = Config.MODEL_PRICING.get(
+            model,
+            Config.MODEL_PRICING['gemini-3-flash-preview']
         )
-        execution_sig = ThoughtSignature(
-            agent_id=execution_data['agent_id'],
-            reasoning_type=execution_data['reasoning_type'],
-            reasoning_chain=execution_data['reasoning_chain'],
-            conclusion=execution_data['conclusion'],
-            confidence_score=execution_data['confidence_score'],
-            parent_signatures=execution_data['context'].get('parent_signatures', []),
-            input_data=execution_data['context'].get('input_data', {}),
-            constraints=execution_data['context'].get('constraints', []),
-            alternative_paths=execution_data.get('alternative_paths', [])
+        cost = (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+        # Analysis, planner waves, detection waves and a single synthesis run back to back
+        waves = 1 + math.ceil(k / concurrency) + math.ceil(pairs / concurrency) + (1 if pairs else 0)
+
+        return {
+            "perspectives": k,
+            "max_concurrency": concurrency,
+            "calls": {"analysis": 1, "planning": k, "detection": pairs, "synthesis": 1 if pairs else 0},
+            "estimated_input_tokens": input_tokens,
+            "estimated_output_tokens": output_tokens,
+            "estimated_cost_usd": round(cost, 4),
+            "estimated_latency_seconds": round(waves * Config.ESTIMATED_CALL_LATENCY_SECONDS, 1),
+            "model": model
+        }
+
+    def run_competing_plans(
+        self,
+        problem: str,
+        focus_profiles: List[Any],
+        constraints: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+        latency_budget_seconds: Optional[float] = None,
+        reuse_analysis: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        incremental_detection: Optional[bool] = None
+    ) -> Dict:
+        """
+        Fan competing planners out from one shared analysis, then detect and synthesize.
+
+        Args:
+            problem: The problem statement to solve
+            focus_profiles: Built-in profile names ("growth", "revenue") or dicts with
+                "focus", "role_description" and "constraints"
+            constraints: Optional constraints shared by the analysis and every planner
+            max_concurrency: Cap on concurrent model calls (defaults to Config.MAX_PARALLEL_AGENTS)
+            max_cost_usd: Refuse to launch if the estimated cost exceeds this
+            latency_budget_seconds: Refuse to launch if the estimated latency exceeds this
+            reuse_analysis: Analysis reuse mode for near-identical problems (auto, offer, never)
+            deadline: Optional end-to-end deadline; detection and synthesis are
+                skipped, and prompts or models reduced, when time runs short
+            incremental_detection: Detect each pair as soon as both plans have
+                landed instead of after all planners finish (defaults to
+                Config.INCREMENTAL_DETECTION)
+
+        Returns:
+            Dictionary with signatures, contradictions, final conclusion and graph
+        """
+        from agents import PlannerAgent
+        from agents.planner import resolve_focus_profile
+        from intelligence import ContradictionDetector, IncrementalDetector, Synthesizer
+
+        try:
+            profiles = [resolve_focus_profile(p) for p in focus_profiles]
+        except (ValueError, TypeError, AttributeError) as e:
+            raise FanoutRejectedError(f"Invalid focus profile: {e}")
+        if len(profiles) < 2:
+            raise FanoutRejectedError("At least two focus profiles are required")
+
+        concurrency = max(1, max_concurrency or Config.MAX_PARALLEL_AGENTS)
+        estimate = self.estimate_fanout_cost(problem, profiles, constraints, concurrency)
+        if max_cost_usd is not None and estimate["estimated_cost_usd"] > max_cost_usd:
+            raise FanoutRejectedError(
+                f"Estimated cost ${estimate['estimated_cost_usd']:.4f} exceeds budget ${max_cost_usd:.4f}"
+            )
+        if latency_budget_seconds is not None and estimate["estimated_latency_seconds"] > latency_budget_seconds:
+            raise FanoutRejectedError(
+                f"Estimated latency {estimate['estimated_latency_seconds']}s exceeds budget "
+                f"{latency_budget_seconds}s; raise max_concurrency or reduce perspectives"
+            )
+
+        deadline = self._attach_deadline(deadline)
+        print(f"\n[*] Fanning out {len(profiles)} perspectives: {problem[:100]}...")
+
+        # Phase 1: Shared analysis
+        analysed = self._within_deadline("analysis", lambda: self.run_analysis(problem, constraints, reuse_analysis))
+        analysis_sig, analysis_reuse = analysed or (None, None)
+        analysis_dict = analysis_sig.to_dict() if analysis_sig is not None else None
+
+        # Phase 2: Competing planners, bounded by the concurrency cap
+        def run_planner(profile):
+            planner = PlannerAgent(
+                focus=profile["focus"],
+                role_description=profile["role_description"],
+                client=self.client
+            )
+            return planner.plan(
+                problem,
+                analysis_signatures=[analysis_dict],
+                constraints=(constraints or []) + profile["constraints"]
+            )
+
+        detector = ContradictionDetector(index=self.contradiction_index, client=self.client)
+        incremental = None
+        if Config.INCREMENTAL_DETECTION if incremental_detection is None else incremental_detection:
+            # Hooked into register_signature: pairs start detecting as plans land
+            incremental = IncrementalDetector(
+                detector,
+                self.graph,
+                scope=Config.INCREMENTAL_DETECTION_SCOPE,
+                max_workers=concurrency,
+                reasoning_types=["decision"]
+            )
+            self.signature_listeners.append(incremental.on_signature)
+
+        landed = [None] * len(profiles)
+        failed = []
+        out_of_time = analysis_sig is None or not self.client.can_finish()
+        try:
+            if analysis_sig is None:
+                deadline.degrade("decision", "skipped", "no analysis to plan from")
+            elif out_of_time:
+                deadline.degrade("decision", "skipped", f"{deadline.remaining():.1f}s left")
+            else:
+                with ThreadPoolExecutor(max_workers=min(concurrency, len(profiles))) as pool:
+                    futures = {pool.submit(run_planner, p): i for i, p in enumerate(profiles)}
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        try:
+                            data = future.result()
+                        except Exception as e:
+                            if isinstance(e, DeadlineExceededError):
+                                out_of_time = True
+                                deadline.degrade("decision", f"dropped {profiles[i]['focus']} planner", str(e))
+                            failed.append({"focus": profiles[i]["focus"], "error": str(e)})
+                            continue
+                        # Registered as each plan lands, so incremental detection can start on it
+                        landed[i] = ThoughtSignature.from_agent_output(data)
+                        self.register_signature(landed[i])
+        finally:
+            if incremental is not None:
+                self.signature_listeners.remove(incremental.on_signature)
+
+        plan_sigs = []
+        for sig in landed:
+            # Identical plans merge into one node and are compared only once
+            if sig is not None and all(sig.signature_id != other.signature_id for other in plan_sigs):
+                plan_sigs.append(sig)
+        if not plan_sigs and not out_of_time:
+            if incremental is not None:
+                incremental.close()
+            raise RuntimeError("All competing planners failed")
+
+        # Phase 3: Pairwise contradiction detection over the resulting set
+        reports = []
+        if len(plan_sigs) > 1 and incremental is not None:
+            # Most pairs already finished while the remaining planners were running
+            reports = self._within_deadline(
+                "detection",
+                lambda: incremental.collect([sig.signature_id for sig in plan_sigs], timeout=deadline.remaining())
+            ) or []
+        elif len(plan_sigs) > 1:
+            reports = self._within_deadline(
+                "detection",
+                lambda: detector.detect_pairs([sig.to_dict() for sig in plan_sigs], max_workers=concurrency)
+            ) or []
+        if incremental is not None:
+            incremental.close()
+            if incremental.unfinished:
+                deadline.degrade("detection", "incomplete", f"{incremental.unfinished} pairs still running at the request deadline")
+            # The detector turns failed calls into error reports rather than raising
+            elif deadline.expired() and any(r.get("contradiction_type") == "error" for r in reports):
+                deadline.degrade("detection", "incomplete", "some pairs ran past the request deadline")
+        detected = sorted(
+            (r for r in reports if r["has_contradiction"]),
+            key=lambda r: r["severity"],
+            reverse=True
         )
-        self.register_signature(execution_sig)
-        signatures.append(execution_sig)
-        print(f"  -> Execution plan complete: {execution_sig.conclusion[:100]}...")
+        contradictions = [r for r in detected if r["severity"] > Config.CONTRADICTION_SEVERITY_THRESHOLD]
 
-        results = {
+        # Phase 4: Synthesize the most severe collision
+        synthesis_sig = None
+        if contradictions:
+            sig_a_id, sig_b_id = contradictions[0]["signatures_compared"]
+            sig_a = self.graph.get_signature(sig_a_id).to_dict()
+            sig_b = self.graph.get_signature(sig_b_id).to_dict()
+            synthesizer = Synthesizer(client=self.client)
+            if self.client.can_finish():
+                synthesis_data = synthesizer.synthesize(sig_a, sig_b, contradictions[0])
+            else:
+                # Out of time: fall back to the higher-confidence path without a model call
+                deadline.degrade("synthesis", "skipped", f"{deadline.remaining():.1f}s left")
+                synthesis_data = synthesizer.fallback(sig_a, sig_b, "request deadline")
+            synthesis_sig = ThoughtSignature.from_agent_output(synthesis_data)
+            self.register_signature(synthesis_sig)
+
+        signatures = [sig for sig in [analysis_sig] + plan_sigs + [synthesis_sig] if sig is not None]
+        answers = plan_sigs or [sig for sig in [analysis_sig] if sig is not None]
+        best_plan = max(answers, key=lambda sig: sig.confidence_score) if answers else None
+
+        return {
             "problem": problem,
+            "mode": "fanout",
+            "focus_profiles": [p["focus"] for p in profiles],
+            "failed_profiles": failed,
             "signatures": [sig.to_dict() for sig in signatures],
-            "final_conclusion": execution_sig.conclusion,
+            "contradictions": contradictions,
+            "contradiction": detected[0] if detected else None,
+            "final_conclusion": (
+                synthesis_sig.conclusion if synthesis_sig else best_plan.conclusion if best_plan else None
+            ),
+            "analysis_reuse": analysis_reuse,
+            "cost_estimate": estimate,
+            "incremental_detection": incremental.to_dict() if incremental is not None else None,
+            "budget": self._budget_summary(),
+            "deadline": deadline.to_dict(),
+            "degraded_phases": deadline.degraded,
             "graph": self.get_graph_visualization_data()
         }
 
-        return results
-
     def save_graph(self, filepath: str):
         """Save the reasoning graph to a JSON file."""
         with open(filepath, 'w') as f:
@@ -264,6 +1356,8 @@ class ThoughtLineageOrchestrator:
 
 # Simple test to verify API connection
 if __name__ == "__main__":
+    import google.generativeai as genai
+
     print("[TEST] Testing Gemini 3 API connection...")
     try:
         model = genai.GenerativeModel(Config.GEMINI_MODEL)
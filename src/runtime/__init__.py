@@ -0,0 +1,22 @@
+"""
+Runtime package initialization.
+"""
+from runtime.routing import ModelRouter, RequestBudget, default_router
+from runtime.deadline import Deadline, DeadlineExceededError
+from runtime.llm import LLMClient, default_flight
+from runtime.singleflight import SingleFlight
+from runtime.scheduler import FairScheduler, SchedulerRejectedError, default_scheduler
+from runtime.speculation import SpeculationCancelledError, SpeculativeChild, streamed_conclusion
+from runtime.profiling import RequestProfiler
+from runtime.schema import OutputValidator, SchemaError, default_validator, recover_json
+
+__all__ = [
+    'ModelRouter', 'RequestBudget', 'default_router',
+    'Deadline', 'DeadlineExceededError',
+    'LLMClient', 'default_flight',
+    'SingleFlight',
+    'FairScheduler', 'SchedulerRejectedError', 'default_scheduler',
+    'SpeculationCancelledError', 'SpeculativeChild', 'streamed_conclusion',
+    'RequestProfiler',
+    'OutputValidator', 'SchemaError', 'default_validator', 'recover_json'
+]
@@ -0,0 +1,62 @@
+"""
+Request Deadline - End-to-end time budget carried through every phase of a request.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a model call cannot start or finish before the request deadline."""
+
+
+class Deadline:
+    """
+    Wall-clock budget for one request, shared by every agent call it makes.
+
+    Phases consult remaining() before starting work and degrade when time is
+    short; each degradation is recorded so the response can report which
+    phases ran in a reduced form and why.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.degraded: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when the request has no deadline."""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.seconds is not None and self.remaining() <= 0
+
+    def allows(self, seconds: float) -> bool:
+        """True if work expected to take `seconds` can finish before the deadline."""
+        remaining = self.remaining()
+        return remaining is None or remaining >= seconds
+
+    def degrade(self, phase: str, action: str, reason: str):
+        """Record that a phase was skipped or reduced to stay within the deadline."""
+        with self._lock:
+            self.degraded.append({
+                "phase": phase,
+                "action": action,
+                "reason": reason,
+                "at_seconds": round(self.elapsed(), 2)
+            })
+        print(f"  -> [DEADLINE] {phase}: {action} ({reason})")
+
+    def to_dict(self) -> Dict:
+        remaining = self.remaining()
+        return {
+            "budget_seconds": self.seconds,
+            "elapsed_seconds": round(self.elapsed(), 2),
+            "remaining_seconds": round(remaining, 2) if remaining is not None else None
+        }
@@ -0,0 +1,302 @@
+"""
+LLM Client - Single call path for every agent, detector and synthesizer model call.
+"""
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+from config import Config
+from runtime.deadline import Deadline, DeadlineExceededError
+from runtime.routing import ModelRouter, RequestBudget, default_router
+from runtime.scheduler import FairScheduler, Ticket, default_scheduler
+from runtime.singleflight import SingleFlight
+from runtime.speculation import SpeculationCancelledError, check_cancelled, current_speculation
+
+if Config.is_configured():
+    genai.configure(api_key=Config.GEMINI_API_KEY)
+
+# Shared by every client in the process, so identical calls from different requests coalesce
+default_flight = SingleFlight()
+
+# How often a speculative call queued for a scheduler slot checks whether it was discarded
+_CANCEL_POLL_SECONDS = 0.25
+
+
+@lru_cache(maxsize=64)
+def _key_client(api_key: str) -> glm.GenerativeServiceClient:
+    """
+    API client bound to one caller's key.
+
+    genai.configure() sets a single process-wide key, so requests bringing
+    their own key get a client of their own instead of reconfiguring the
+    library under concurrent requests.
+    """
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+
+class LLMClient:
+    """
+    Routes each call to a model and records what happened.
+
+    route() asks the ModelRouter for a decision; generate_json() runs the call
+    with the decided model, then fills the decision in place with the actual
+    latency, token counts and cost so callers can store it in metadata.
+
+    When a request Deadline is attached, calls switch to the fastest model
+    once the routed model is not expected to finish in time, and every call
+    is given the remaining time as its timeout.
+
+    Concurrent calls with the same prompt, model and temperature share one
+    in-flight request through a SingleFlight; the callers that joined an
+    existing call get its text with their usage recorded as coalesced. Only
+    calls made with the same API key are coalesced.
+
+    A client may carry the caller's own API key and default model; both
+    apply to its calls only, so concurrent requests never see each other's.
+
+    Each call to the model API first waits for a slot from the FairScheduler,
+    queued under the client's tenant and priority class, so no single
+    session or batch run can take the model away from everyone else. The
+    wait is bounded by the request deadline.
+
+    Calls made from a speculative run (runtime.speculation) stop with
+    SpeculationCancelledError once the speculation is discarded: before
+    queueing, while queued and between streamed chunks.
+    """
+
+    def __init__(
+        self,
+        router: Optional[ModelRouter] = None,
+        budget: Optional[RequestBudget] = None,
+        deadline: Optional[Deadline] = None,
+        flight: Optional[SingleFlight] = None,
+        scheduler: Optional[FairScheduler] = None,
+        tenant: str = "default",
+        priority: str = "interactive",
+        api_key: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        self.router = router or default_router
+        self.budget = budget
+        self.deadline = deadline
+        self.flight = flight or (default_flight if Config.COALESCE_MODEL_CALLS else None)
+        self.scheduler = scheduler or (default_scheduler if Config.SCHEDULE_MODEL_CALLS else None)
+        self.tenant = tenant
+        self.priority = priority
+        # Caller's own key (None uses the process-wide Config.GEMINI_API_KEY) and "default" tier model
+        self.api_key = api_key
+        self.model = model
+
+    def route(self, phase: str, severity: Optional[float] = None) -> Dict:
+        """Pick the model for a call in the given phase."""
+        decision = self.router.select(phase, severity=severity, budget=self.budget, default_model=self.model)
+        if self.deadline is not None and not self.deadline.allows(decision["expected_latency_seconds"]):
+            fastest = self.router.fastest_model(self.model)
+            if fastest != decision["model"]:
+                reason = f"{self.deadline.remaining():.1f}s left, {decision['model']} expected to take longer"
+                decision = self.router.select_fastest(phase, f"{decision['reason']}; {reason}", self.model)
+                decision["degraded"] = True
+                self.deadline.degrade(phase, f"switched to {fastest}", reason)
+        return decision
+
+    def short_on_time(self) -> bool:
+        """True once the remaining time calls for compact prompts."""
+        return self.deadline is not None and not self.deadline.allows(Config.DEADLINE_COMPACT_PROMPT_SECONDS)
+
+    def can_finish(self) -> bool:
+        """True if one more call on the fastest model fits in the remaining time."""
+        if self.deadline is None:
+            return True
+        return self.deadline.allows(self.router.expected_latency(self.router.fastest_model(self.model)))
+
+    def generate_json(
+        self,
+        prompt: str,
+        decision: Dict,
+        temperature: float,
+        on_partial: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Run a JSON-mode generation with the model chosen in `decision`.
+
+        Args:
+            prompt: Full prompt text
+            decision: Routing decision from route(); updated with actual usage
+            temperature: Sampling temperature
+            on_partial: Optional callback; when given the response is streamed
+                and the callback receives the accumulated text after each chunk
+
+        Returns:
+            Raw response text
+        """
+        options = self._request_options(decision)
+        if self.flight is None:
+            return self._generate(prompt, decision, temperature, on_partial, options)
+
+        started = time.monotonic()
+        try:
+            text, shared = self.flight.do(
+                self._flight_key(prompt, decision, temperature),
+                lambda: self._generate(prompt, decision, temperature, on_partial, options),
+                timeout=self._wait_timeout(),
+                # A discarded speculation's failure is not its followers' failure
+                retry_on=(DeadlineExceededError, SpeculationCancelledError)
+            )
+        except TimeoutError as e:
+            # Waiting on another caller's call is bounded by this request's deadline
+            if isinstance(e, DeadlineExceededError) or self.deadline is None or not self.deadline.expired():
+                raise
+            raise DeadlineExceededError(f"The {decision['phase']} call ran past the request deadline") from e
+        if shared:
+            self._record_coalesced(decision, started)
+            if on_partial is not None:
+                on_partial(text)
+        return text
+
+    def _flight_key(self, prompt: str, decision: Dict, temperature: float) -> Tuple:
+        # The key is part of the flight key so one caller's call is never billed to another's key
+        return (self.api_key, decision["model"], temperature, prompt)
+
+    def _wait_timeout(self) -> Optional[float]:
+        """How long a caller may wait on another caller's call or for a scheduler slot."""
+        return self.deadline.remaining() if self.deadline is not None else None
+
+    def _acquire(self, decision: Dict) -> Optional[Ticket]:
+        """Wait for a scheduler slot for the call; None when calls are not scheduled."""
+        if self.scheduler is None:
+            return None
+        ticket = self.scheduler.enqueue(self.tenant, self.priority, decision["expected_latency_seconds"])
+        try:
+            granted = self._wait_for_slot(ticket)
+        except SpeculationCancelledError:
+            self.scheduler.release(ticket)
+            raise
+        if not granted:
+            self.scheduler.release(ticket)
+            raise DeadlineExceededError(f"No model slot freed up for the {decision['phase']} call before the request deadline")
+        return ticket
+
+    def _wait_for_slot(self, ticket: Ticket) -> bool:
+        """Ticket.wait() bounded by the deadline; a speculative call also polls for its cancellation."""
+        if current_speculation() is None:
+            return ticket.wait(self._wait_timeout())
+        while True:
+            check_cancelled()
+            remaining = self._wait_timeout()
+            if ticket.wait(_CANCEL_POLL_SECONDS if remaining is None else min(remaining, _CANCEL_POLL_SECONDS)):
+                check_cancelled()
+                return True
+            if remaining is not None and remaining <= _CANCEL_POLL_SECONDS:
+                return False
+
+    def _release(self, ticket: Optional[Ticket]):
+        if ticket is not None:
+            self.scheduler.release(ticket)
+
+    def _remaining_options(self, options: Dict) -> Dict:
+        """Request options with the timeout cut to what is left after queueing for a slot."""
+        if self.scheduler is None or "request_options" not in options:
+            return options
+        return {"request_options": {"timeout": max(self.deadline.remaining(), 0.001)}}
+
+    def _request_options(self, decision: Dict) -> Dict:
+        options = {}
+        if self.deadline is not None and self.deadline.seconds is not None:
+            remaining = self.deadline.remaining()
+            if remaining <= 0:
+                raise DeadlineExceededError(f"No time left for the {decision['phase']} call")
+            options["request_options"] = {"timeout": remaining}
+        return options
+
+    def _generate(
+        self,
+        prompt: str,
+        decision: Dict,
+        temperature: float,
+        on_partial: Optional[Callable[[str], None]],
+        options: Dict
+    ) -> str:
+        check_cancelled()
+        ticket = self._acquire(decision)
+        started = time.monotonic()
+        try:
+            response = self._call(prompt, decision, temperature, on_partial is not None, self._remaining_options(options))
+            if on_partial is None:
+                text = response.text
+            else:
+                text = ""
+                for chunk in response:
+                    check_cancelled()
+                    text += chunk.text
+                    on_partial(text)
+        except SpeculationCancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(decision, prompt, started, e)
+            raise
+        finally:
+            self._release(ticket)
+
+        self._record(decision, prompt, response, text, started)
+        return text
+
+    def _call(self, prompt: str, decision: Dict, temperature: float, stream: bool, options: Dict):
+        """Send one generation request, with the caller's own key when it brought one."""
+        generation_config = {"response_mime_type": "application/json", "temperature": temperature}
+        if not self.api_key:
+            return genai.GenerativeModel(decision["model"]).generate_content(
+                prompt, generation_config=generation_config, stream=stream, **options
+            )
+
+        # GenerativeModel only uses the process-wide key, so a caller's key goes
+        # through its own service client, with the response wrapped the same way
+        model = decision["model"] if "/" in decision["model"] else f"models/{decision['model']}"
+        request = glm.GenerateContentRequest(
+            model=model,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+            generation_config=glm.GenerationConfig(**generation_config)
+        )
+        client = _key_client(self.api_key)
+        request_options = options.get("request_options", {})
+        if stream:
+            return genai.types.GenerateContentResponse.from_iterator(
+                client.stream_generate_content(request, **request_options)
+            )
+        return genai.types.GenerateContentResponse.from_response(client.generate_content(request, **request_options))
+
+    def _record_failure(self, decision: Dict, prompt: str, started: float, error: Exception):
+        self.router.record(decision["model"], time.monotonic() - started, len(prompt) // 4, 0, failed=True)
+        if self.deadline is not None and self.deadline.expired():
+            raise DeadlineExceededError(f"The {decision['phase']} call ran past the request deadline") from error
+
+    def _record(self, decision: Dict, prompt: str, response, text: str, started: float):
+        latency = time.monotonic() - started
+        usage = getattr(response, "usage_metadata", None)
+        # Fall back to a ~4 characters per token estimate when usage is not reported
+        input_tokens = getattr(usage, "prompt_token_count", None) or len(prompt) // 4
+        output_tokens = getattr(usage, "candidates_token_count", None) or len(text) // 4
+        cost = ModelRouter.call_cost(decision["model"], input_tokens, output_tokens)
+
+        self.router.record(decision["model"], latency, input_tokens, output_tokens)
+        if self.budget is not None:
+            self.budget.charge(cost)
+
+        decision.update({
+            "latency_seconds": round(latency, 3),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": round(cost, 6)
+        })
+
+    @staticmethod
+    def _record_coalesced(decision: Dict, started: float):
+        """A coalesced call used no tokens of its own; the caller that ran it paid for it."""
+        decision.update({
+            "latency_seconds": round(time.monotonic() - started, 3),
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+            "coalesced": True
+        })
@@ -0,0 +1,257 @@
+"""
+Request Profiling - Opt-in cProfile, stack sampling and tracemalloc capture for the request path.
+"""
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Frames under this directory are application code (src/ is the import root)
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where a sample's time goes. Serialization is matched anywhere in the stack,
+# the rest from the innermost frame outwards, so JSON parsing inside a model
+# client library still counts as network time
+_NETWORK_MODULES = (
+    "google", "grpc", "httplib2", "urllib3", "requests", "http/client.py", "ssl.py", "socket.py"
+)
+_SERIALIZATION_FUNCTIONS = {"to_dict", "jsonify", "get_graph_visualization_data", "iter_lineages_export"}
+_PROMPT_FUNCTIONS = {"generate_signature", "synthesize", "detect"}
+
+
+def _category(stack: List[Tuple[str, str]]) -> str:
+    """Classify one sampled stack (outermost frame first) into a time category."""
+    for filename, function in stack:
+        if function in _SERIALIZATION_FUNCTIONS or f"flask{os.sep}json" in filename:
+            return "serialization"
+    for filename, function in reversed(stack):
+        if any(f"{os.sep}{module}" in filename for module in _NETWORK_MODULES):
+            return "network"
+        if f"{os.sep}json{os.sep}" in filename:
+            return "json_parsing"
+        if f"concurrent{os.sep}futures" in filename:
+            return "waiting_on_workers"
+    filename, function = stack[-1]
+    if filename.startswith(_APP_ROOT):
+        # Self time in the agent, detector and synthesizer bodies is almost all prompt assembly
+        if function in _PROMPT_FUNCTIONS or function.startswith("_format"):
+            return "prompt_construction"
+        return "application"
+    return "other"
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stacks of every thread running application code at a fixed interval."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="tlo-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append((frame.f_code.co_filename, frame.f_code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                # Idle pool workers and server threads never enter application code
+                if not any(filename.startswith(_APP_ROOT) for filename, _ in stack):
+                    continue
+                self.stacks[tuple(stack)] += 1
+                self.categories[_category(stack)] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfiler:
+    """
+    Profiles selected requests and keeps summaries of the most recent ones.
+
+    A profiled request runs under three collectors at once: cProfile on the
+    request thread for exact per-function timings, a sampling thread that
+    records the stacks of every thread in application code (so agent calls
+    running on thread pools are covered too), and tracemalloc for allocations.
+    Each profile writes a collapsed-stack file (<id>.folded, the input format
+    of flamegraph.pl and speedscope), the raw cProfile stats (<id>.prof) and
+    a JSON summary with the top functions, allocation sites and the split of
+    sampled time between network, JSON parsing, serialization, prompt
+    construction and the rest.
+
+    Samples cover every thread in application code, so requests profiled
+    while others run concurrently include some of their neighbours' stacks.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 0.0,
+        interval_seconds: float = 0.005,
+        top: int = 20,
+        keep: int = 50
+    ):
+        self.directory = os.path.abspath(directory)
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_seconds
+        self.top = top
+        self.recent = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        # tracemalloc is process-wide; only the first of overlapping profiles starts it
+        self._tracing = 0
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """True if a request asked to be profiled or falls in the sampled fraction."""
+        return bool(requested) or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    @contextmanager
+    def profile(self, label: str):
+        """
+        Profile the enclosed block.
+
+        Yields a dictionary that holds the profile id on entry and is filled
+        with the summary when the block exits.
+        """
+        profile_id = uuid.uuid4().hex[:12]
+        result = {"id": profile_id}
+
+        with self._lock:
+            if self._tracing == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._tracing += 1
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this interpreter (Python 3.12+)
+            profiler = None
+        sampler = _StackSampler(self.interval_seconds)
+        sampler.start()
+        started = time.time()
+        try:
+            yield result
+        finally:
+            duration = time.time() - started
+            sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+            memory_after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self._tracing -= 1
+                if self._tracing == 0:
+                    tracemalloc.stop()
+
+            result.update(self._summarize(
+                profile_id, label, started, duration, profiler, sampler, memory_before, memory_after, peak
+            ))
+            self._write(profile_id, profiler, sampler, result)
+            self.recent.append(result)
+
+    def summaries(self, top: Optional[int] = None) -> List[Dict]:
+        """Summaries of recent profiles, newest first, trimmed to the top entries of each list."""
+        top = top or self.top
+        return [
+            {**summary, **{key: summary[key][:top] for key in ("functions", "allocations")}}
+            for summary in reversed(self.recent)
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Summary of one profile, from memory or from another worker's file in the profile directory."""
+        for summary in self.recent:
+            if summary["id"] == profile_id:
+                return summary
+        path = self.path(profile_id, "json")
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def path(self, profile_id: str, extension: str) -> Optional[str]:
+        # Profile ids are hex; anything else could escape the profile directory
+        if not profile_id.isalnum():
+            return None
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def _summarize(self, profile_id, label, started, duration, profiler, sampler, before, after, peak) -> Dict:
+        functions = []
+        if profiler is not None:
+            stats = pstats.Stats(profiler)
+            ranked = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            for (filename, line, function), (_, calls, own, cumulative, _) in ranked[:self.top]:
+                functions.append({
+                    "function": f"{function} ({self._short(filename)}:{line})",
+                    "calls": calls,
+                    "own_seconds": round(own, 4),
+                    "cumulative_seconds": round(cumulative, 4)
+                })
+
+        allocations = [
+            {
+                "location": f"{self._short(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count_diff
+            }
+            for stat in after.compare_to(before, "lineno")[:self.top]
+        ]
+
+        samples = sampler.samples or 1
+        return {
+            "label": label,
+            "started_at": started,
+            "duration_seconds": round(duration, 3),
+            "samples": sampler.samples,
+            "time_share": {
+                category: round(count / samples, 3)
+                for category, count in sampler.categories.most_common()
+            },
+            "peak_memory_kb": round(peak / 1024, 1),
+            "functions": functions,
+            "allocations": allocations,
+            "files": {
+                "folded": f"{profile_id}.folded",
+                "cprofile": f"{profile_id}.prof" if profiler is not None else None
+            }
+        }
+
+    def _write(self, profile_id: str, profiler, sampler: _StackSampler, summary: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(profile_id, "folded"), "w", encoding="utf-8") as f:
+            for stack, count in sampler.stacks.most_common():
+                frames = ";".join(f"{function} ({self._short(filename)})" for filename, function in stack)
+                f.write(f"{frames} {count}\n")
+        if profiler is not None:
+            profiler.dump_stats(self.path(profile_id, "prof"))
+        with open(self.path(profile_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    @staticmethod
+    def _short(filename: str) -> str:
+        """Path relative to the app root or site-packages, for readable frame names."""
+        if filename.startswith(_APP_ROOT):
+            return os.path.relpath(filename, _APP_ROOT)
+        marker = f"site-packages{os.sep}"
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+        return os.path.basename(filename)
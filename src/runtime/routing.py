@@ -0,0 +1,198 @@
+"""
+Model Router - Picks the model for each phase from policy, live stats and request budgets.
+"""
+import threading
+from typing import Dict, Optional
+
+from config import Config
+
+
+class RequestBudget:
+    """Tracks the cost spent by one request against an optional ceiling."""
+
+    def __init__(self, max_cost_usd: Optional[float] = None):
+        self.max_cost_usd = max_cost_usd
+        self.spent_cost_usd = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def charge(self, cost_usd: float):
+        with self._lock:
+            self.spent_cost_usd += cost_usd
+            self.calls += 1
+
+    def remaining_cost(self) -> Optional[float]:
+        """Remaining budget in USD, or None when unlimited."""
+        if self.max_cost_usd is None:
+            return None
+        return max(0.0, self.max_cost_usd - self.spent_cost_usd)
+
+    def to_dict(self) -> Dict:
+        return {
+            "max_cost_usd": self.max_cost_usd,
+            "spent_cost_usd": round(self.spent_cost_usd, 6),
+            "calls": self.calls
+        }
+
+
+class ModelRouter:
+    """
+    Routes each phase (analysis, decision, evaluation, detection, synthesis) to a model.
+
+    The policy in Config.MODEL_ROUTING maps phases to tiers ("fast", "default",
+    "strong"); synthesis escalates to the strong tier for high-severity
+    contradictions. Live per-model latency and token usage are tracked as
+    exponentially weighted averages and used to downgrade a choice that would
+    not fit the request's remaining budget or latency ceiling. Every decision
+    is returned as a dictionary meant to be stored in signature metadata.
+    """
+
+    def __init__(self, policy: Optional[Dict] = None, smoothing: float = 0.3):
+        self.policy = policy or Config.MODEL_ROUTING
+        self.smoothing = smoothing
+        self.stats: Dict[str, Dict] = {}  # model -> running stats
+        self._lock = threading.Lock()
+
+    def tier_model(self, tier: str, default_model: Optional[str] = None) -> str:
+        """Resolve a tier to a model name; "default" follows the request's model, else the configured one."""
+        default_model = default_model or Config.GEMINI_MODEL
+        if tier == "default":
+            return default_model
+        return self.policy["tiers"].get(tier) or default_model
+
+    def select(
+        self,
+        phase: str,
+        severity: Optional[float] = None,
+        budget: Optional[RequestBudget] = None,
+        default_model: Optional[str] = None
+    ) -> Dict:
+        """
+        Choose a model for one call.
+
+        Args:
+            phase: Reasoning phase of the call
+            severity: Contradiction severity, used to escalate synthesis
+            budget: Per-request budget the call is charged against
+            default_model: Model of the "default" tier for this request (defaults to Config.GEMINI_MODEL)
+
+        Returns:
+            Routing decision dictionary
+        """
+        if not Config.MODEL_ROUTING_ENABLED:
+            return self._decision(phase, "default", default_model or Config.GEMINI_MODEL, "routing disabled")
+
+        tier = self.policy["phases"].get(phase, "default")
+        reason = f"policy maps {phase} to {tier}"
+        escalate_at = self.policy.get("escalate_synthesis_severity")
+        if phase == "synthesis" and severity is not None and escalate_at is not None and severity >= escalate_at:
+            tier = "strong"
+            reason = f"synthesis severity {severity} >= {escalate_at}"
+        model = self.tier_model(tier, default_model)
+
+        # Downgrade when live latency or the remaining budget rules the policy choice out
+        candidates = {self.tier_model(t, default_model) for t in ("fast", "default", "strong")}
+        max_latency = self.policy.get("max_call_latency_seconds")
+        if max_latency is not None and self.expected_latency(model) > max_latency:
+            fastest = min(candidates, key=self.expected_latency)
+            if fastest != model:
+                model, tier = fastest, "fast"
+                reason += f"; {model} chosen for live latency under {max_latency}s"
+
+        remaining = budget.remaining_cost() if budget else None
+        if remaining is not None and self.expected_cost(model, phase) > remaining:
+            cheapest = min(candidates, key=lambda m: self.expected_cost(m, phase))
+            if cheapest != model:
+                model, tier = cheapest, "fast"
+                reason += f"; downgraded to {model} to fit remaining budget ${remaining:.4f}"
+
+        return self._decision(phase, tier, model, reason)
+
+    def fastest_model(self, default_model: Optional[str] = None) -> str:
+        """Model with the lowest live average latency; the fast tier wins ties."""
+        candidates = [self.tier_model(t, default_model) for t in ("fast", "default", "strong")]
+        return min(candidates, key=self.expected_latency)
+
+    def select_fastest(self, phase: str, reason: str, default_model: Optional[str] = None) -> Dict:
+        """Decision for the fastest model, used when a request is running out of time."""
+        return self._decision(phase, "fast", self.fastest_model(default_model), reason)
+
+    def _decision(self, phase: str, tier: str, model: str, reason: str) -> Dict:
+        return {
+            "phase": phase,
+            "tier": tier,
+            "model": model,
+            "reason": reason,
+            "expected_latency_seconds": round(self.expected_latency(model), 2),
+            "expected_cost_usd": round(self.expected_cost(model, phase), 6)
+        }
+
+    def expected_latency(self, model: str) -> float:
+        stats = self.stats.get(model)
+        return stats["latency"] if stats and stats["successes"] else Config.ESTIMATED_CALL_LATENCY_SECONDS
+
+    def expected_cost(self, model: str, phase: str) -> float:
+        stats = self.stats.get(model)
+        if stats and stats["successes"]:
+            input_tokens, output_tokens = stats["input_tokens"], stats["output_tokens"]
+        else:
+            output_key = phase if phase in Config.ESTIMATED_OUTPUT_TOKENS else "signature"
+            input_tokens, output_tokens = 1000, Config.ESTIMATED_OUTPUT_TOKENS[output_key]
+        return self.call_cost(model, input_tokens, output_tokens)
+
+    @staticmethod
+    def call_cost(model: str, input_tokens: float, output_tokens: float) -> float:
+        price_in, price_out = Config.MODEL_PRICING.get(model, Config.MODEL_PRICING['gemini-3-flash-preview'])
+        return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+    def record(self, model: str, latency_seconds: float, input_tokens: int, output_tokens: int, failed: bool = False):
+        """
+        Fold one completed call into the model's running averages.
+
+        Failed calls carry no usable latency or token counts, so they are only
+        counted; the averages are seeded by the first successful call, and
+        until then the model is estimated from Config like an unseen one.
+        """
+        with self._lock:
+            stats = self.stats.get(model)
+            if stats is None:
+                stats = self.stats[model] = {
+                    "latency": 0.0,
+                    "input_tokens": 0.0,
+                    "output_tokens": 0.0,
+                    "calls": 0,
+                    "successes": 0,
+                    "failures": 0
+                }
+            if not failed:
+                # The first success seeds the averages outright
+                a = self.smoothing if stats["successes"] else 1.0
+                stats["latency"] = (1 - a) * stats["latency"] + a * latency_seconds
+                stats["input_tokens"] = (1 - a) * stats["input_tokens"] + a * input_tokens
+                stats["output_tokens"] = (1 - a) * stats["output_tokens"] + a * output_tokens
+                stats["successes"] += 1
+            stats["calls"] += 1
+            stats["failures"] += int(failed)
+
+    def snapshot(self) -> Dict:
+        """Current per-model stats for monitoring."""
+        with self._lock:
+            return {
+                "enabled": Config.MODEL_ROUTING_ENABLED,
+                "policy": self.policy,
+                "models": {
+                    model: dict(
+                        stats,
+                        latency=round(stats["latency"], 3) if stats["successes"] else None,
+                        expected_cost_usd=(
+                            round(self.call_cost(model, stats["input_tokens"], stats["output_tokens"]), 6)
+                            if stats["successes"] else None
+                        )
+                    )
+                    for model, stats in self.stats.items()
+                }
+            }
+
+
+# Process-wide router so live stats accumulate across requests
+default_router = ModelRouter()
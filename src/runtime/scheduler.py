@@ -0,0 +1,301 @@
+"""
+Fair Scheduler - Weighted fair queueing of model calls across tenants and priority classes.
+"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from config import Config
+
+PRIORITIES = ("interactive", "batch")
+
+
+class SchedulerRejectedError(RuntimeError):
+    """Raised by admit() when the queue for a priority class is too deep to take more work."""
+
+
+class Ticket:
+    """One model call waiting for, or holding, a slot."""
+
+    def __init__(self, tenant: str, priority: str, start_tag: float):
+        self.tenant = tenant
+        self.priority = priority
+        self.start_tag = start_tag
+        self.enqueued = time.monotonic()
+        self.holding = False
+        self.released = False
+        # Set once the ticket is granted a slot or withdrawn from the queue
+        self._settled = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the ticket holds a slot; False on timeout or if it was withdrawn."""
+        self._settled.wait(timeout)
+        return self.holding and not self.released
+
+
+class FairScheduler:
+    """
+    Decides which waiting model call gets the next free slot to the model API.
+
+    There are `capacity` slots. Calls are queued per priority class and per
+    tenant (an API key, session or batch run):
+    - interactive calls always go first, and `interactive_reserve` slots are
+      never given to batch calls, so an interactive call finds a free slot as
+      long as interactive load stays within that reserve
+    - batch calls use whatever capacity interactive calls leave
+    - within a class, tenants share slots by start-time fair queueing: each
+      call is tagged with a virtual start time that advances by its expected
+      duration divided by the tenant's weight, and the lowest tag goes next.
+      A tenant with 20 planners queued therefore takes turns with a tenant
+      that has one call, instead of going first for all 20
+
+    A call takes a ticket with enqueue(), waits on it, and hands it back
+    with release() once the API call returns, so slots are held only for the
+    call itself. Per-tenant queueing state is dropped once a tenant has
+    nothing queued or running and the class's virtual time has caught up
+    with it, so short-lived tenants do not accumulate.
+
+    admit() is the admission check for new requests, and it decides their
+    priority class on the server rather than trusting the client: a request
+    may ask to run as batch, but unless its tenant is pinned to a class in
+    `tenant_priorities`, it only runs as interactive while the tenant has
+    fewer than `interactive_per_tenant` interactive requests in flight. Bulk submitters are
+    therefore served as batch however they label their requests. admit()
+    also turns requests away while the queue for their class is deeper than
+    max_queue; every admitted request is handed back with finish().
+    """
+
+    # Recent queue waits kept per class for the percentiles in stats()
+    WAIT_SAMPLES = 1000
+
+    def __init__(
+        self,
+        capacity: int = 16,
+        interactive_reserve: int = 4,
+        max_queue: int = 64,
+        weights: Optional[Dict[str, float]] = None,
+        interactive_per_tenant: int = 2,
+        tenant_priorities: Optional[Dict[str, str]] = None
+    ):
+        """
+        Args:
+            capacity: Concurrent model calls
+            interactive_reserve: Slots batch calls may not use
+            max_queue: Waiting calls in a class beyond which admit() rejects
+            weights: Relative share per tenant (default 1.0)
+            interactive_per_tenant: Requests in flight per tenant that may run as interactive
+            tenant_priorities: Tenants pinned to a priority class, e.g. {"key:3f2a9c1b0d4e": "batch"}
+        """
+        self.capacity = max(1, capacity)
+        self.interactive_reserve = min(max(0, interactive_reserve), self.capacity - 1)
+        self.max_queue = max_queue
+        self.weights = dict(weights or {})
+        self.interactive_per_tenant = interactive_per_tenant
+        self.tenant_priorities = dict(tenant_priorities or {})
+        for priority in self.tenant_priorities.values():
+            self._check_priority(priority)
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Dict[str, Deque[Ticket]]] = {p: {} for p in PRIORITIES}
+        self._virtual_time = {p: 0.0 for p in PRIORITIES}
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        # Slots held per (priority, tenant), to tell when a tenant's state can be dropped
+        self._held: Dict[Tuple[str, str], int] = {}
+        # Interactive requests in flight per tenant, for admit()
+        self._in_flight: Dict[str, int] = {}
+        self._sweep_at = 64
+        self._running = {p: 0 for p in PRIORITIES}
+        self._waits = {p: deque(maxlen=self.WAIT_SAMPLES) for p in PRIORITIES}
+        self.rejected = {p: 0 for p in PRIORITIES}
+
+    def admit(self, tenant: str, requested: str = "interactive") -> str:
+        """
+        Admission control and priority classification for a new request.
+
+        Args:
+            tenant: Whose request this is
+            requested: Priority the client asked for; only "batch" is taken as is
+
+        Returns:
+            The priority class the request runs at; raises SchedulerRejectedError
+            when that class is backed up
+        """
+        self._check_priority(requested)
+        with self._lock:
+            pinned = self.tenant_priorities.get(tenant)
+            priority = pinned or requested
+            if pinned is None and priority == "interactive" and self._in_flight.get(tenant, 0) >= self.interactive_per_tenant:
+                priority = "batch"
+            waiting = self._waiting(priority)
+            if waiting > self.max_queue:
+                self.rejected[priority] += 1
+                raise SchedulerRejectedError(
+                    f"Model call queue for {priority} requests is full ({waiting} waiting); retry shortly"
+                )
+            if priority == "interactive":
+                self._in_flight[tenant] = self._in_flight.get(tenant, 0) + 1
+            return priority
+
+    def finish(self, tenant: str, priority: str):
+        """Mark a request admitted with admit() as done."""
+        if priority != "interactive":
+            return
+        with self._lock:
+            count = self._in_flight.get(tenant, 0) - 1
+            if count > 0:
+                self._in_flight[tenant] = count
+            else:
+                self._in_flight.pop(tenant, None)
+
+    def enqueue(self, tenant: str, priority: str = "interactive", cost: float = 1.0) -> Ticket:
+        """
+        Queue a call for a slot.
+
+        Args:
+            tenant: Whose call this is (API key, session or batch run)
+            priority: "interactive" or "batch"
+            cost: Expected duration of the call, by which the tenant's virtual time advances
+
+        Returns:
+            Ticket to wait() on and release() when the call is done
+        """
+        self._check_priority(priority)
+        weight = self.weights.get(tenant, 1.0)
+        with self._lock:
+            key = (priority, tenant)
+            start_tag = max(self._virtual_time[priority], self._last_finish.get(key, 0.0))
+            self._last_finish[key] = start_tag + max(cost, 0.01) / weight
+            ticket = Ticket(tenant, priority, start_tag)
+            self._queues[priority].setdefault(tenant, deque()).append(ticket)
+            self._dispatch()
+        return ticket
+
+    def release(self, ticket: Ticket):
+        """Give back a ticket's slot, or withdraw it from the queue if it never got one."""
+        with self._lock:
+            if ticket.released:
+                return
+            ticket.released = True
+            key = (ticket.priority, ticket.tenant)
+            if ticket.holding:
+                self._running[ticket.priority] -= 1
+                self._held[key] -= 1
+                if not self._held[key]:
+                    del self._held[key]
+            else:
+                queue = self._queues[ticket.priority].get(ticket.tenant)
+                if queue is not None and ticket in queue:
+                    queue.remove(ticket)
+                    if not queue:
+                        del self._queues[ticket.priority][ticket.tenant]
+                ticket._settled.set()
+            self._dispatch()
+            self._forget_idle(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            classes = {}
+            for priority in PRIORITIES:
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    "running": self._running[priority],
+                    "waiting": self._waiting(priority),
+                    "tenants_waiting": len(self._queues[priority]),
+                    "rejected": self.rejected[priority],
+                    "wait_p50_seconds": round(waits[len(waits) // 2], 3) if waits else None,
+                    "wait_p95_seconds": round(waits[int(len(waits) * 0.95)], 3) if waits else None
+                }
+            return {
+                "capacity": self.capacity,
+                "interactive_reserve": self.interactive_reserve,
+                "max_queue": self.max_queue,
+                "tenants_tracked": len(self._last_finish),
+                "classes": classes
+            }
+
+    def _dispatch(self):
+        """Grant free slots to the next tickets in line; called with the lock held."""
+        while True:
+            running = sum(self._running.values())
+            if running >= self.capacity:
+                return
+            if self._queues["interactive"]:
+                priority = "interactive"
+            elif self._queues["batch"] and running < self.capacity - self.interactive_reserve:
+                priority = "batch"
+            else:
+                return
+
+            queues = self._queues[priority]
+            tenant = min(queues, key=lambda t: queues[t][0].start_tag)
+            ticket = queues[tenant].popleft()
+            if not queues[tenant]:
+                del queues[tenant]
+            self._virtual_time[priority] = ticket.start_tag
+            self._running[priority] += 1
+            self._held[(priority, tenant)] = self._held.get((priority, tenant), 0) + 1
+            self._waits[priority].append(time.monotonic() - ticket.enqueued)
+            ticket.holding = True
+            ticket._settled.set()
+
+    def _forget_idle(self, key: Tuple[str, str]):
+        """
+        Drop queueing state of tenants with nothing queued or running; called with the lock held.
+
+        A tenant's finish tag only matters while it is ahead of the class's
+        virtual time. When a whole class goes idle, its virtual time moves up
+        to the latest finish tag, as in start-time fair queueing, so every
+        tenant of that class is forgotten. Otherwise the released tenant is
+        dropped once it is idle and caught up. Whenever the table has doubled
+        since the last sweep, every tenant with nothing queued or running is
+        dropped, caught up or not: while a long call keeps the class busy its
+        virtual time stands still, and tenants making a single call would
+        otherwise pile up. A tenant forgotten ahead of the virtual time
+        starts again at the current one, like a new tenant.
+        """
+        priority = key[0]
+        if not self._queues[priority] and not self._running[priority]:
+            stale = [k for k in self._last_finish if k[0] == priority]
+            if stale:
+                self._virtual_time[priority] = max(
+                    [self._virtual_time[priority]] + [self._last_finish[k] for k in stale]
+                )
+            for k in stale:
+                del self._last_finish[k]
+        elif self._idle(key):
+            del self._last_finish[key]
+
+        if len(self._last_finish) > self._sweep_at:
+            for k in [k for k in self._last_finish if self._inactive(k)]:
+                del self._last_finish[k]
+            self._sweep_at = max(64, 2 * len(self._last_finish))
+
+    def _inactive(self, key: Tuple[str, str]) -> bool:
+        priority, tenant = key
+        return key not in self._held and tenant not in self._queues[priority]
+
+    def _idle(self, key: Tuple[str, str]) -> bool:
+        return (
+            key in self._last_finish
+            and self._inactive(key)
+            and self._last_finish[key] <= self._virtual_time[key[0]]
+        )
+
+    def _waiting(self, priority: str) -> int:
+        return sum(len(queue) for queue in self._queues[priority].values())
+
+    @staticmethod
+    def _check_priority(priority: str):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'; expected one of {PRIORITIES}")
+
+
+# Shared by every client in the process, so all requests and batch runs compete for the same slots
+default_scheduler = FairScheduler(
+    capacity=Config.SCHEDULER_CONCURRENCY,
+    interactive_reserve=Config.SCHEDULER_INTERACTIVE_RESERVE,
+    max_queue=Config.SCHEDULER_MAX_QUEUE,
+    weights=Config.SCHEDULER_WEIGHTS,
+    interactive_per_tenant=Config.SCHEDULER_INTERACTIVE_PER_TENANT,
+    tenant_priorities=Config.SCHEDULER_TENANT_PRIORITIES
+)
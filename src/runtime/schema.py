@@ -0,0 +1,277 @@
+"""
+Output Validation - Schema checks and local repair of model JSON against signature_schema.json.
+"""
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "signature_schema.json")
+
+# A compiled schema node: (value, path, errors, repairs) -> repaired value
+Check = Callable[[Any, str, List[str], List[str]], Any]
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+}
+
+# Markdown code fences some models wrap around JSON despite the prompt
+_FENCE_PATTERN = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+class SchemaError(ValueError):
+    """Raised when model output does not match the schema even after repair."""
+
+    def __init__(self, definition: str, errors: List[str]):
+        super().__init__(f"{definition} output invalid: " + "; ".join(errors[:5]))
+        self.definition = definition
+        self.errors = errors
+
+
+def recover_json(text: str) -> Any:
+    """
+    Parse JSON, closing it off if the response was cut short.
+
+    Strips code fences and text before the first brace, then closes any open
+    string, array and object. If that does not parse (the cut fell inside a
+    key or a number), the text is cut back to the last complete element and
+    closed there instead. Raises json.JSONDecodeError if nothing parses.
+    """
+    text = _FENCE_PATTERN.sub("", text)
+    start = text.find("{")
+    if start > 0:
+        text = text[start:]
+
+    stack: List[str] = []
+    # Positions where everything before is complete, with the closers needed there
+    cuts: List[Tuple[int, str]] = []
+    in_string = escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                # Complete document; ignore anything the model added after it
+                return json.loads(text[:i + 1])
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(stack))))
+
+    closers = "".join(reversed(stack))
+    candidates = [text + ('"' if in_string else "") + closers]
+    candidates += [text[:cut] + cut_closers for cut, cut_closers in reversed(cuts[-50:])]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return json.loads(text)
+
+
+class OutputValidator:
+    """
+    Validates model responses against definitions compiled once from the schema.
+
+    Each schema node is compiled into a closure that checks a value and
+    repairs what can be fixed locally, so near-valid output is kept instead
+    of paying for a full re-generation:
+    - bounded numbers are clamped into range; a 0-1 confidence given on a
+      0-10 scale (7) or as a percentage (85, "7%") is rescaled, and numeric
+      strings are converted
+    - array items missing a required integer (reasoning step numbers) get
+      their 1-based position, and an invalid last item is dropped
+    - scalars in string fields are converted to strings
+    - truncated JSON is closed off by recover_json()
+
+    Every repair is reported so callers can record it on the result. Output
+    still invalid after repair raises SchemaError.
+    """
+
+    def __init__(self, schema_path: str = SCHEMA_PATH):
+        with open(schema_path, "r", encoding="utf-8") as f:
+            self.schema = json.load(f)
+        self._compiled: Dict[str, Check] = {}
+        self._checks = {
+            name: self._compile({"$ref": f"#/definitions/{name}"})
+            for name in self.schema.get("definitions", {})
+        }
+
+    def parse(self, text: str, definition: str) -> Tuple[Dict, List[str]]:
+        """
+        Parse, repair and validate one model response.
+
+        Args:
+            text: Raw response text
+            definition: Name of the schema definition, e.g. "ModelSignature"
+
+        Returns:
+            Tuple of (parsed data, list of repairs applied)
+        """
+        repairs = []
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = recover_json(text)
+            repairs.append("recovered truncated or wrapped JSON")
+        return self.validate(data, definition, repairs), repairs
+
+    def validate(self, data: Any, definition: str, repairs: Optional[List[str]] = None) -> Any:
+        """Repair and validate parsed data in place; raises SchemaError if it stays invalid."""
+        errors: List[str] = []
+        data = self._checks[definition](data, "$", errors, repairs if repairs is not None else [])
+        if errors:
+            raise SchemaError(definition, errors)
+        return data
+
+    def _resolve(self, ref: str) -> Dict:
+        node = self.schema
+        for part in ref.lstrip("#/").split("/"):
+            node = node[part]
+        return node
+
+    def _compile(self, node: Dict) -> Check:
+        ref = node.get("$ref")
+        if ref is not None:
+            if ref not in self._compiled:
+                # Placeholder first, so a definition that refers to itself terminates
+                self._compiled[ref] = lambda value, path, errors, repairs: self._compiled[ref](value, path, errors, repairs)
+                self._compiled[ref] = self._compile(self._resolve(ref))
+            return self._compiled[ref]
+
+        kind = node.get("type")
+        if kind == "object":
+            return self._compile_object(node)
+        if kind == "array":
+            return self._compile_array(node)
+        if kind in ("number", "integer"):
+            return self._compile_number(node, kind)
+        if kind == "string":
+            return self._compile_string(node)
+        if kind in _TYPES:
+            expected = _TYPES[kind]
+
+            def check(value, path, errors, repairs):
+                if not isinstance(value, expected):
+                    errors.append(f"{path}: expected {kind}")
+                return value
+            return check
+        return lambda value, path, errors, repairs: value
+
+    def _compile_object(self, node: Dict) -> Check:
+        properties = {name: self._compile(sub) for name, sub in node.get("properties", {}).items()}
+        required = node.get("required", [])
+
+        def check(value, path, errors, repairs):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object")
+                return value
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: required")
+            for name, sub in properties.items():
+                if name in value:
+                    value[name] = sub(value[name], f"{path}.{name}", errors, repairs)
+            return value
+        return check
+
+    def _compile_array(self, node: Dict) -> Check:
+        items_node = node.get("items", {})
+        items = self._compile(items_node)
+        if "$ref" in items_node:
+            items_node = self._resolve(items_node["$ref"])
+        # Required integer fields of object items are positions (e.g. reasoning step numbers)
+        positional = [
+            name for name in items_node.get("required", [])
+            if items_node.get("properties", {}).get(name, {}).get("type") == "integer"
+        ]
+
+        def check(value, path, errors, repairs):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected array")
+                return value
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    for name in positional:
+                        if not isinstance(item.get(name), int) or isinstance(item.get(name), bool):
+                            item[name] = i + 1
+                            repairs.append(f"{path}[{i}].{name}: filled in as {i + 1}")
+                item_errors: List[str] = []
+                value[i] = items(item, f"{path}[{i}]", item_errors, repairs)
+                if item_errors and i > 0 and i == len(value) - 1:
+                    # An incomplete last item is what a truncated response leaves behind
+                    value.pop()
+                    repairs.append(f"{path}[{i}]: dropped incomplete item")
+                else:
+                    errors.extend(item_errors)
+            return value
+        return check
+
+    def _compile_number(self, node: Dict, kind: str) -> Check:
+        low, high = node.get("minimum"), node.get("maximum")
+
+        def check(value, path, errors, repairs):
+            percent = False
+            if isinstance(value, str):
+                percent = value.strip().endswith("%")
+                try:
+                    value = float(value.strip().rstrip("%"))
+                    repairs.append(f"{path}: converted from string")
+                except ValueError:
+                    errors.append(f"{path}: expected {kind}")
+                    return value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{path}: expected {kind}")
+                return value
+            if kind == "integer" and value != int(value):
+                errors.append(f"{path}: expected integer")
+                return value
+            if high == 1 and (percent or 10 < value <= 100):
+                # A 0-1 score given as a percentage
+                repairs.append(f"{path}: rescaled {value} to {value / 100}")
+                value = value / 100
+            elif high == 1 and 1 < value <= 10:
+                # A 0-1 score given on a 0-10 scale
+                repairs.append(f"{path}: rescaled {value} to {value / 10}")
+                value = value / 10
+            if low is not None and value < low:
+                repairs.append(f"{path}: clamped {value} to {low}")
+                value = low
+            if high is not None and value > high:
+                repairs.append(f"{path}: clamped {value} to {high}")
+                value = high
+            return int(value) if kind == "integer" else value
+        return check
+
+    def _compile_string(self, node: Dict) -> Check:
+        allowed = node.get("enum")
+
+        def check(value, path, errors, repairs):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                repairs.append(f"{path}: converted to string")
+                value = str(value)
+            if not isinstance(value, str):
+                errors.append(f"{path}: expected string")
+            elif allowed is not None and value not in allowed:
+                errors.append(f"{path}: must be one of {allowed}")
+            return value
+        return check
+
+
+# Compiled once per process and shared by every agent, detector and synthesizer
+default_validator = OutputValidator()
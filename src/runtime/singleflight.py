@@ -0,0 +1,112 @@
+"""
+Single-Flight - Coalesces identical in-flight calls so they share one request.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it."""
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same key share one in-flight call.
+
+    The first caller for a key becomes the leader and runs the call; callers
+    arriving while it runs wait for its outcome instead of issuing their own.
+    The key is released as soon as the call settles, so later callers start
+    a fresh call; nothing is cached.
+
+    Failure and cancellation:
+    - the leader's exception is raised in every waiter, except for types in
+      `retry_on`, which describe failures specific to the leader (such as
+      its own deadline running out); waiters then retry, and one of them
+      becomes the new leader
+    - a waiter that times out stops waiting without affecting the call
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = ()
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn(), or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable performing the call
+            timeout: Seconds a waiter waits before giving up with TimeoutError
+            retry_on: Leader exception types that waiters retry instead of raising
+
+        Returns:
+            Tuple of (result, shared); shared is True when the result came from
+            another caller's call
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    result = fn()
+                except BaseException as e:
+                    self._settle(key, call, exception=e)
+                    raise
+                self._settle(key, call, result=result)
+                return result, False
+
+            try:
+                error = call.future.exception(timeout=timeout)
+            finally:
+                self._leave(call)
+            if error is None:
+                return call.future.result(), True
+            if not isinstance(error, retry_on):
+                raise error
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
+
+    def _join(self, key: Hashable) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def _leave(self, call: _Call):
+        with self._lock:
+            call.waiters -= 1
+
+    def _settle(self, key: Hashable, call: _Call, result: Any = None, exception: Optional[BaseException] = None):
+        # Release the key first so callers arriving from now on start a fresh call
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if exception is not None:
+            call.future.set_exception(exception)
+        else:
+            call.future.set_result(result)
+
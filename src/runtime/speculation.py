@@ -0,0 +1,130 @@
+"""
+Speculative Execution - Starts a child agent from its parent's streamed conclusion.
+"""
+import json
+import re
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional
+
+# Streamed JSON string value of "conclusion", complete once its closing quote arrives
+_CONCLUSION_PATTERN = re.compile(r'"conclusion"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def streamed_conclusion(text: str) -> Optional[str]:
+    """Return the conclusion from a partially streamed signature, or None if not complete yet."""
+    match = _CONCLUSION_PATTERN.search(text)
+    if match is None:
+        return None
+    try:
+        return json.loads(f'"{match.group(1)}"')
+    except json.JSONDecodeError:
+        return match.group(1)
+
+
+class SpeculationCancelledError(Exception):
+    """Raised inside a speculative run once its result has been discarded."""
+
+
+# The SpeculativeChild whose run the current thread is executing, if any
+_running = threading.local()
+
+
+def current_speculation() -> Optional["SpeculativeChild"]:
+    """The speculative run executing on this thread, or None for a regular call."""
+    return getattr(_running, "child", None)
+
+
+def check_cancelled():
+    """Raise SpeculationCancelledError if this thread runs a discarded speculation."""
+    child = current_speculation()
+    if child is not None and child.cancelled():
+        raise SpeculationCancelledError("Speculative run discarded")
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+class SpeculativeChild:
+    """
+    One downstream call that may start before its parent has finished.
+
+    start() is handed to the parent agent as its on_conclusion callback and
+    launches the child on the pool with the partial parent. take() is called
+    once the parent is final and validated: the speculative result is kept
+    only if the final conclusion matches the one the child started from.
+    Otherwise the speculation is cancelled and None tells the caller to run
+    the child itself.
+
+    A cancelled run that is already executing stops at its next model call:
+    LLMClient calls check_cancelled() before queueing for a scheduler slot,
+    while queued, and on every streamed chunk, so a discarded run gives up
+    its slot and budget instead of finishing in the background. A child
+    created while another speculation runs (the executor started from a
+    speculative plan) is cancelled together with it.
+    """
+
+    def __init__(self, pool: Executor, run_child: Callable[[Dict], Any]):
+        self.pool = pool
+        self.run_child = run_child
+        self.parent = current_speculation()
+        self.partial_parent: Optional[Dict] = None
+        self.future = None
+        self.started_at = None
+        self.head_start_seconds = None
+        self.outcome = "not_started"
+        self._cancelled = threading.Event()
+
+    def start(self, partial_parent: Dict):
+        if self.future is not None or self.cancelled():
+            return
+        self.partial_parent = partial_parent
+        self.started_at = time.monotonic()
+        self.future = self.pool.submit(self._run, partial_parent)
+
+    def _run(self, partial_parent: Dict) -> Any:
+        previous, _running.child = current_speculation(), self
+        try:
+            check_cancelled()
+            return self.run_child(partial_parent)
+        finally:
+            _running.child = previous
+
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled())
+
+    def cancel(self):
+        """Discard the speculation; a run in progress stops at its next model call."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def take(self, final_parent: Dict) -> Optional[Any]:
+        """Return the speculative result if it is still valid for the final parent, else None."""
+        if self.future is None:
+            return None
+
+        # How long the child ran before its parent was final
+        head_start = time.monotonic() - self.started_at
+        if _normalize(self.partial_parent["conclusion"]) != _normalize(final_parent["conclusion"]):
+            self.cancel()
+            self.outcome = "rerun"
+            return None
+        try:
+            result = self.future.result()
+        except Exception as e:
+            print(f"[WARNING] Speculative run failed, re-running: {e}")
+            self.outcome = "rerun"
+            return None
+
+        self.outcome = "accepted"
+        self.head_start_seconds = round(head_start, 2)
+        return result
+
+    def to_dict(self) -> Dict:
+        info = {"outcome": self.outcome}
+        if self.outcome == "accepted":
+            info["head_start_seconds"] = self.head_start_seconds
+        return info
@@ -0,0 +1,79 @@
+"""
+Command-line archiving of saved runs and analytics over the signature archive.
+
+Inputs may be graphs written by ThoughtLineageOrchestrator.save_graph, saved
+/api/process responses, or JSONL files written by batch.py (results or
+--graphs output), one run per line.
+
+Usage:
+    python signature_archive.py add archive/ run1.json results.jsonl
+    python signature_archive.py stats archive/ --by agent --type decision
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from graph import SignatureArchive
+
+
+def iter_runs(path: str) -> Iterator[Tuple[str, dict]]:
+    """Yield (run label, source) for every run in a saved JSON or JSONL file."""
+    name = os.path.basename(path)
+    if not path.endswith(".jsonl"):
+        with open(path) as f:
+            yield name, json.load(f)
+        return
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            # batch.py lines: {"id", "result": {...}} for results, {"id", "graph": {...}} for --graphs
+            source = record.get("result", record)
+            if "graph" not in source and "nodes" not in source:
+                continue
+            yield f"{name}:{record.get('id', line_number)}", source
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive saved runs and report signature analytics.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Append saved runs to an archive")
+    add.add_argument("archive", help="Archive directory (created if missing)")
+    add.add_argument("inputs", nargs="+", help="Saved graph/response JSON or batch JSONL files")
+
+    stats = commands.add_parser("stats", help="Confidence distributions and contradiction rates")
+    stats.add_argument("archive", help="Archive directory")
+    stats.add_argument("--by", choices=["agent", "type", "run"], default="agent", help="Group by this column")
+    stats.add_argument("--type", help="Only signatures of this reasoning type")
+    stats.add_argument("--since", help="Only signatures at or after this ISO timestamp")
+    stats.add_argument("--until", help="Only signatures before this ISO timestamp")
+    stats.add_argument("--bins", type=int, default=10, help="Confidence histogram bins")
+    args = parser.parse_args(argv)
+
+    archive = SignatureArchive(args.archive)
+    if args.command == "add":
+        added = runs = 0
+        for path in args.inputs:
+            for run, source in iter_runs(path):
+                added += archive.append(source, run)
+                runs += 1
+        print(f"[ARCHIVE] Added {added} signatures from {runs} runs; {len(archive)} archived", file=sys.stderr)
+        return 0
+
+    filters = {"reasoning_type": args.type, "since": args.since, "until": args.until}
+    report = {
+        "signatures": len(archive),
+        "confidence": archive.confidence_distribution(by=args.by, bins=args.bins, **filters),
+        "contradiction_rates": archive.contradiction_rates(by=args.by, **filters)
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Test local alignment of reasoning chains and the detector's no-call fast path.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from intelligence import ContradictionDetector
+from intelligence.alignment import StepAligner
+from runtime import LLMClient
+
+SHARED = [
+    "Our churn rose after the last price increase",
+    "Enterprise customers renew regardless of price",
+]
+
+
+def chain(*thoughts):
+    return [{"step": i + 1, "thought": thought} for i, thought in enumerate(thoughts)]
+
+
+def test_identical_chains_never_diverge():
+    steps = chain(*SHARED)
+    alignment = StepAligner().align(steps, steps, "Raise enterprise prices", "Raise enterprise prices")
+    assert alignment["divergence"] is None
+    assert alignment["mean_similarity"] == pytest.approx(1.0)
+    assert alignment["conclusion_similarity"] == pytest.approx(1.0)
+    assert alignment["unaligned_steps"] == 0
+
+
+def test_divergence_is_the_first_aligned_pair_that_collapses():
+    a = chain(*SHARED, "Spend the surplus on paid acquisition campaigns")
+    b = chain(*SHARED, "Hold cash reserves against a downturn")
+    divergence = StepAligner().align(a, b)["divergence"]
+    assert (divergence["step_a"], divergence["step_b"]) == (3, 3)
+    assert divergence["thought_b"] == "Hold cash reserves against a downturn"
+
+
+def test_an_inserted_step_is_left_unaligned():
+    a = chain(*SHARED)
+    b = chain(SHARED[0], "Support tickets doubled in the same quarter", SHARED[1])
+    alignment = StepAligner().align(a, b)
+    assert alignment["unaligned_steps"] == 1
+    assert [(p["step_a"], p["step_b"]) for p in alignment["aligned_steps"]] == [(1, 1), (2, 3)]
+
+
+def test_near_identical_signatures_skip_the_model(monkeypatch):
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        raise AssertionError("the fast path must not call the model")
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    sig = {"agent_id": "planner-agent", "conclusion": "Raise enterprise prices", "confidence_score": 0.8,
+           "reasoning_chain": chain(*SHARED)}
+    report = ContradictionDetector().detect(dict(sig, signature_id="a"), dict(sig, signature_id="b"))
+    assert report["fast_path"] is True
+    assert report["has_contradiction"] is False
+    assert report["signatures_compared"] == ["a", "b"]
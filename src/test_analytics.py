@@ -0,0 +1,132 @@
+"""
+Test lineage analytics against a brute-force walk over every root-to-node path.
+"""
+import random
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from graph import LineageAnalytics
+from orchestrator import ReasoningGraph, ThoughtSignature
+
+
+def make_signature(index, confidence, parents):
+    return ThoughtSignature(
+        agent_id=f"agent-{index % 3}",
+        reasoning_type="analysis",
+        reasoning_chain=[],
+        conclusion=f"conclusion {index}",
+        confidence_score=confidence,
+        parent_signatures=parents,
+        content_addressed=False
+    )
+
+
+def random_signatures(count, seed):
+    """Signatures in topological order, each with up to three earlier parents."""
+    rng = random.Random(seed)
+    # Distinct confidences, so the weakest upstream signature is never a tie
+    confidences = [c / 10000 for c in rng.sample(range(500, 10000), count)]
+    signatures = []
+    for i in range(count):
+        parents = rng.sample(signatures, rng.randint(0, min(3, len(signatures)))) if i else []
+        signatures.append(make_signature(i, confidences[i], [p.signature_id for p in parents]))
+    return signatures
+
+
+def build_graph(signatures):
+    graph = ReasoningGraph()
+    for sig in signatures:
+        graph.add_signature(sig)
+    return graph
+
+
+def paths_to(graph, signature_id):
+    """Every path from a root to the signature, as lists of signature ids."""
+    parents = graph.nodes[signature_id].context["parent_signatures"]
+    if not parents:
+        return [[signature_id]]
+    return [path + [signature_id] for parent in parents for path in paths_to(graph, parent)]
+
+
+def brute_force(graph, signature_id):
+    paths = paths_to(graph, signature_id)
+    confidence = {sig_id: sig.confidence_score for sig_id, sig in graph.nodes.items()}
+    products = []
+    for path in paths:
+        product = 1.0
+        for sig_id in path:
+            product *= confidence[sig_id]
+        products.append(product)
+    lineage = {sig_id for path in paths for sig_id in path}
+    return {
+        "propagated_confidence": min(products),
+        "lineage_min_confidence": min(confidence[sig_id] for sig_id in lineage),
+        "weakest_upstream": min(lineage, key=lambda sig_id: confidence[sig_id]),
+        "depth": max(len(path) for path in paths) - 1
+    }
+
+
+def assert_matches_brute_force(analytics, graph):
+    for metrics in analytics.all_metrics():
+        expected = brute_force(graph, metrics["signature_id"])
+        assert metrics["propagated_confidence"] == pytest.approx(expected["propagated_confidence"])
+        assert metrics["lineage_min_confidence"] == pytest.approx(expected["lineage_min_confidence"])
+        assert metrics["weakest_upstream"] == expected["weakest_upstream"]
+        assert metrics["depth"] == expected["depth"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_metrics_match_brute_force(seed):
+    graph = build_graph(random_signatures(40, seed))
+    assert_matches_brute_force(LineageAnalytics(graph), graph)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_update_matches_brute_force(seed):
+    signatures = random_signatures(40, seed)
+    graph = build_graph(signatures[:15])
+    analytics = LineageAnalytics(graph)
+
+    # Folded in one signature at a time, then as one batch
+    for sig in signatures[15:25]:
+        graph.add_signature(sig)
+        analytics.update()
+    for sig in signatures[25:]:
+        graph.add_signature(sig)
+    assert analytics.update() == 15
+
+    assert_matches_brute_force(analytics, graph)
+
+
+def test_critical_path_follows_weakest_parent():
+    root_strong = make_signature(0, 0.9, [])
+    root_weak = make_signature(1, 0.3, [])
+    middle = make_signature(2, 0.8, [root_strong.signature_id, root_weak.signature_id])
+    leaf = make_signature(3, 0.7, [middle.signature_id])
+    graph = build_graph([root_strong, root_weak, middle, leaf])
+    analytics = LineageAnalytics(graph)
+
+    assert analytics.critical_path(leaf.signature_id) == [root_weak.signature_id, middle.signature_id, leaf.signature_id]
+    assert analytics.metrics(leaf.signature_id)["propagated_confidence"] == pytest.approx(0.3 * 0.8 * 0.7)
+    assert analytics.metrics("missing") is None
+
+
+def test_weakest_links_are_sorted_by_propagated_confidence():
+    graph = build_graph(random_signatures(30, 7))
+    analytics = LineageAnalytics(graph)
+
+    links = analytics.weakest_links(top=5)
+    everything = sorted(m["propagated_confidence"] for m in analytics.all_metrics())
+    assert [m["propagated_confidence"] for m in links] == pytest.approx(everything[:5])
+
+
+def test_cycle_is_rejected():
+    a = make_signature(0, 0.5, [])
+    b = make_signature(1, 0.5, [a.signature_id])
+    graph = build_graph([a, b])
+    a.context["parent_signatures"] = [b.signature_id]
+
+    with pytest.raises(ValueError):
+        LineageAnalytics(graph)
@@ -0,0 +1,140 @@
+"""
+Test the columnar signature archive: append, reopen and read back.
+"""
+import json
+import os
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from graph import SignatureArchive
+from orchestrator import ReasoningGraph, ThoughtSignature
+
+
+def add(graph, agent_id, reasoning_type, confidence, parents=()):
+    sig = ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[{"step": 1, "thought": f"{agent_id} thinks — carefully", "confidence": confidence}],
+        conclusion=f"{agent_id} concludes",
+        confidence_score=confidence,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=False
+    )
+    graph.add_signature(sig)
+    return sig
+
+
+def fan_out_run():
+    graph = ReasoningGraph()
+    analysis = add(graph, "analyzer-agent", "analysis", 0.8)
+    growth = add(graph, "planner-growth-focus", "decision", 0.7, [analysis])
+    revenue = add(graph, "planner-revenue-focus", "decision", 0.65, [analysis])
+    add(graph, "synthesizer-agent", "synthesis", 0.9, [growth, revenue])
+    return graph
+
+
+def assert_round_trip(archive, graph, run):
+    synthesized = {p for sig in graph.nodes.values() if sig.reasoning_type == "synthesis"
+                   for p in sig.context["parent_signatures"]}
+    for sig in graph.nodes.values():
+        stored = archive.signature(archive.find(sig.signature_id))
+        assert stored["agent_id"] == sig.agent_id
+        assert stored["reasoning_type"] == sig.reasoning_type
+        assert stored["run"] == run
+        assert np.datetime64(stored["timestamp"]) == np.datetime64(sig.timestamp)
+        assert stored["confidence_score"] == pytest.approx(sig.confidence_score, abs=1e-6)
+        assert stored["conclusion"] == sig.conclusion
+        assert stored["reasoning_chain"] == sig.reasoning_chain
+        assert stored["contradicted"] == (sig.signature_id in synthesized)
+
+
+def test_graph_round_trips_through_a_reopened_archive(tmp_path):
+    graph = fan_out_run()
+    assert SignatureArchive(str(tmp_path)).append(graph, "run-1") == 4
+
+    archive = SignatureArchive(str(tmp_path))
+    assert len(archive) == 4
+    assert_round_trip(archive, graph, "run-1")
+    assert archive.find("missing") is None
+
+
+def test_saved_response_round_trips_with_reasoning_chains(tmp_path):
+    graph = fan_out_run()
+    response = json.loads(json.dumps({
+        "signatures": [sig.to_dict() for sig in graph.nodes.values()],
+        "graph": graph.to_dict()
+    }))
+    archive = SignatureArchive(str(tmp_path))
+    archive.append(response, "saved.json")
+
+    assert_round_trip(SignatureArchive(str(tmp_path)), graph, "saved.json")
+
+
+def test_archived_ids_are_skipped_and_runs_accumulate(tmp_path):
+    archive = SignatureArchive(str(tmp_path))
+    first, second = fan_out_run(), fan_out_run()
+
+    archive.append(first, "run-1")
+    assert archive.append(first, "run-1-again") == 0
+    assert archive.append(second, "run-2") == 4
+
+    reopened = SignatureArchive(str(tmp_path))
+    assert len(reopened) == 8
+    assert reopened.dictionary("run") == ["run-1", "run-2"]
+    assert_round_trip(reopened, first, "run-1")
+    assert_round_trip(reopened, second, "run-2")
+
+
+def test_crashed_append_is_ignored_and_truncated(tmp_path):
+    archive = SignatureArchive(str(tmp_path))
+    first = fan_out_run()
+    archive.append(first, "run-1")
+    # Bytes of an append that crashed before its manifest was written
+    for name in ("id", "confidence", "conclusion", "conclusion.offsets"):
+        with open(os.path.join(str(tmp_path), f"{name}.bin"), "ab") as f:
+            f.write(b"\xff" * 40)
+
+    reopened = SignatureArchive(str(tmp_path))
+    assert len(reopened) == 4
+    second = fan_out_run()
+    reopened.append(second, "run-2")
+
+    final = SignatureArchive(str(tmp_path))
+    assert len(final) == 8
+    assert_round_trip(final, first, "run-1")
+    assert_round_trip(final, second, "run-2")
+
+
+def test_aggregates_match_the_stored_rows(tmp_path):
+    archive = SignatureArchive(str(tmp_path))
+    graphs = [fan_out_run() for _ in range(3)]
+    for i, graph in enumerate(graphs):
+        archive.append(graph, f"run-{i}")
+    signatures = [sig for graph in graphs for sig in graph.nodes.values()]
+
+    distribution = archive.confidence_distribution(by="agent", bins=10)
+    for agent in {sig.agent_id for sig in signatures}:
+        scores = [sig.confidence_score for sig in signatures if sig.agent_id == agent]
+        assert distribution[agent]["count"] == len(scores)
+        assert distribution[agent]["mean"] == pytest.approx(sum(scores) / len(scores), abs=1e-4)
+        assert sum(distribution[agent]["histogram"]) == len(scores)
+
+    rates = archive.contradiction_rates()
+    assert set(rates) == {"planner-growth-focus", "planner-revenue-focus"}
+    assert rates["planner-growth-focus"] == {"count": 3, "contradicted": 3, "rate": 1.0}
+
+
+def test_unsupported_version_is_rejected(tmp_path):
+    SignatureArchive(str(tmp_path)).append(fan_out_run(), "run-1")
+    manifest_path = os.path.join(str(tmp_path), "manifest.json")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["version"] = 99
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError):
+        SignatureArchive(str(tmp_path))
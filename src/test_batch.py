@@ -0,0 +1,66 @@
+"""
+Test the JSONL batch runner: streaming input, checkpointed resume and failure handling.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import pytest
+
+from batch import BatchRunner, iter_problems, load_checkpoint
+from runtime import LLMClient
+
+
+@pytest.fixture(autouse=True)
+def model(monkeypatch):
+    """Answer every model call locally with a valid signature."""
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        return json.dumps({
+            "reasoning_chain": [{"step": 1, "thought": "Check the numbers", "confidence": 0.8, "evidence": []}],
+            "conclusion": f"{decision['phase']} conclusion",
+            "confidence_score": 0.8,
+            "alternative_paths": []
+        })
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n")
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_invalid_lines_are_skipped_and_ids_default_to_line_numbers(tmp_path):
+    path = tmp_path / "problems.jsonl"
+    write_lines(path, [{"problem": "Raise prices?"}, "{not json", {"id": "x"}, "", {"id": "p-4", "problem": "Hire?"}])
+
+    records = list(iter_problems(str(path), skip_ids={"p-4"}))
+    assert [r["id"] for r in records] == ["1"]
+
+
+def test_run_writes_results_checkpoints_successes_and_resumes(tmp_path):
+    problems, output = tmp_path / "problems.jsonl", tmp_path / "results.jsonl"
+    write_lines(problems, [
+        {"id": "a", "problem": "Raise prices?"},
+        {"id": "b", "problem": "Open a store?", "mode": "bogus"},
+        {"id": "c", "problem": "Hire?"}
+    ])
+    graphs = tmp_path / "graphs.jsonl"
+
+    summary = BatchRunner(str(problems), str(output), graphs_path=str(graphs), workers=2).run()
+
+    assert (summary["completed"], summary["failed"]) == (2, 1)
+    lines = {line["id"]: line for line in read_jsonl(output)}
+    assert lines["a"]["status"] == "ok" and "graph" not in lines["a"]["result"]
+    assert (lines["b"]["status"], lines["b"]["error"]) == ("error", "Unknown mode: bogus")
+    assert {line["id"] for line in read_jsonl(graphs)} == {"a", "c"}
+    assert load_checkpoint(f"{output}.checkpoint") == {"a", "c"}
+
+    # Only the failed problem is run again
+    summary = BatchRunner(str(problems), str(output), workers=2).run()
+    assert (summary["completed"], summary["failed"]) == (0, 1)
+    assert [line["id"] for line in read_jsonl(output)].count("b") == 2
@@ -0,0 +1,58 @@
+"""
+Test content-addressed signature ids and merge-on-add deduplication.
+"""
+import sys
+sys.path.insert(0, '.')
+
+from orchestrator import ReasoningGraph, ThoughtSignature
+
+
+def signature(conclusion="Raise prices", confidence=0.8, parents=(), thought="Churn is low", **kwargs):
+    return ThoughtSignature(
+        agent_id="planner-agent",
+        reasoning_type="decision",
+        reasoning_chain=[{"step": 1, "thought": thought, "confidence": 0.8}],
+        conclusion=conclusion,
+        confidence_score=confidence,
+        parent_signatures=list(parents),
+        content_addressed=True,
+        **kwargs
+    )
+
+
+def test_id_ignores_parents_inputs_metadata_and_cosmetic_differences():
+    base = signature()
+    assert signature(parents=["p1"], input_data={"problem": "x"}, metadata={"routing": {}}).signature_id == base.signature_id
+    assert signature(conclusion="Raise   prices", thought=" Churn  is low ").signature_id == base.signature_id
+    assert signature(confidence=0.8000000001).signature_id == base.signature_id
+
+
+def test_id_changes_with_the_reasoning():
+    base = signature()
+    assert signature(conclusion="Cut prices").signature_id != base.signature_id
+    assert signature(confidence=0.7).signature_id != base.signature_id
+    assert signature(constraints=["No layoffs"]).signature_id != base.signature_id
+    assert ThoughtSignature("planner-agent", "decision", [], "Raise prices", 0.8, content_addressed=False).signature_id != \
+        ThoughtSignature("planner-agent", "decision", [], "Raise prices", 0.8, content_addressed=False).signature_id
+
+
+def test_duplicate_merges_its_parent_edges_into_the_existing_node():
+    graph = ReasoningGraph()
+    first = graph.add_signature(signature(parents=["analysis-1"]))
+    stored = graph.add_signature(signature(parents=["analysis-1", "analysis-2"]))
+
+    assert stored is first
+    assert len(graph.nodes) == 1
+    assert first.context["parent_signatures"] == ["analysis-1", "analysis-2"]
+    assert graph.edges == {"analysis-1": [first.signature_id], "analysis-2": [first.signature_id]}
+    assert first.metadata["occurrences"] == 2
+    assert graph.merges == 1
+    # Indexes hold the node once
+    assert graph.query(agent_id="planner-agent")["total"] == 1
+
+
+def test_merge_never_adds_a_self_edge():
+    graph = ReasoningGraph()
+    first = graph.add_signature(signature())
+    graph.add_signature(signature(parents=[first.signature_id]))
+    assert first.context["parent_signatures"] == []
@@ -0,0 +1,132 @@
+"""
+Test the contradiction report cache: symmetric keys, reversed hits and persistence.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+from intelligence import ContradictionIndex
+
+
+def signature(signature_id, conclusion, thoughts=("Grow users first", "Raise a large round")):
+    return {
+        "signature_id": signature_id,
+        "conclusion": conclusion,
+        "reasoning_chain": [{"step": i + 1, "thought": t} for i, t in enumerate(thoughts)]
+    }
+
+
+def report(sig_a, sig_b):
+    return {
+        "has_contradiction": True,
+        "contradiction_type": "assumption",
+        "severity": 0.8,
+        "assumption_a": "Market share wins",
+        "assumption_b": "Cash flow wins",
+        "conflicting_elements": ["A spends to grow while B refuses to burn cash"],
+        "local_alignment": {"divergence_step_a": 2, "divergence_step_b": 3},
+        "signatures_compared": [sig_a["signature_id"], sig_b["signature_id"]],
+        "routing": {"model": "m"}
+    }
+
+
+def test_key_is_symmetric_and_covers_model_and_version():
+    index = ContradictionIndex()
+    a, b = signature("a", "Expand fast"), signature("b", "Stay profitable")
+    key_ab, swapped_ab = index.pair_key(a, b, "m", "v1")
+    key_ba, swapped_ba = index.pair_key(b, a, "m", "v1")
+    assert key_ab == key_ba
+    assert swapped_ab != swapped_ba
+    assert index.pair_key(a, b, "other", "v1")[0] != key_ab
+    assert index.pair_key(a, b, "m", "v2")[0] != key_ab
+
+
+def test_fingerprint_ignores_case_and_punctuation():
+    index = ContradictionIndex()
+    assert index.fingerprint(signature("a", "Expand fast!")) == index.fingerprint(signature("b", "expand   FAST"))
+
+
+def test_hit_in_the_stored_order_keeps_the_call_order():
+    index = ContradictionIndex()
+    a, b = signature("a", "Expand fast"), signature("b", "Stay profitable")
+    index.put(a, b, "m", "v1", report(a, b))
+
+    cached = index.get(a, b, "m", "v1")
+    assert cached["cached"] is True
+    assert cached["signatures_compared"] == ["a", "b"]
+    assert "routing" not in cached
+
+
+def test_reversed_hit_keeps_every_sided_field_with_its_signature():
+    index = ContradictionIndex()
+    a, b = signature("a", "Expand fast"), signature("b", "Stay profitable")
+    index.put(a, b, "m", "v1", report(a, b))
+
+    cached = index.get(b, a, "m", "v1")
+    # The report still describes "a" as its A side, and says so
+    assert cached["signatures_compared"] == ["a", "b"]
+    assert cached["assumption_a"] == "Market share wins"
+    assert cached["conflicting_elements"] == ["A spends to grow while B refuses to burn cash"]
+    assert cached["local_alignment"] == {"divergence_step_a": 2, "divergence_step_b": 3}
+
+
+def test_miss_counts_and_model_invalidation():
+    index = ContradictionIndex()
+    a, b = signature("a", "Expand fast"), signature("b", "Stay profitable")
+    assert index.get(a, b, "m", "v1") is None
+    index.put(a, b, "m", "v1", report(a, b))
+    assert index.invalidate_model("m") == 1
+    assert index.get(a, b, "m", "v1") is None
+    assert index.stats() == {"entries": 0, "hits": 0, "misses": 2}
+
+
+def test_oldest_entries_are_evicted():
+    index = ContradictionIndex(max_entries=2)
+    pairs = [(signature(f"a{i}", f"Plan {i}"), signature(f"b{i}", f"Counter {i}")) for i in range(3)]
+    for a, b in pairs:
+        index.put(a, b, "m", "v1", report(a, b))
+    assert index.get(*pairs[0], "m", "v1") is None
+    assert index.get(*pairs[2], "m", "v1") is not None
+
+
+def test_persisted_index_appends_one_line_per_report(tmp_path):
+    path = str(tmp_path / "contradictions.jsonl")
+    index = ContradictionIndex(path, max_entries=10)
+    pairs = [(signature(f"a{i}", f"Plan {i}"), signature(f"b{i}", f"Counter {i}")) for i in range(3)]
+    for a, b in pairs:
+        index.put(a, b, "m", "v1", report(a, b))
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    # A header and one line per report; earlier lines are never rewritten
+    assert len(lines) == 4
+    assert json.loads(lines[0])["fingerprint"] == ContradictionIndex.FINGERPRINT_VERSION
+
+    reloaded = ContradictionIndex(path, max_entries=10)
+    cached = reloaded.get(pairs[1][1], pairs[1][0], "m", "v1")
+    assert cached["signatures_compared"] == ["a1", "b1"]
+
+
+def test_persisted_index_compacts_and_skips_partial_lines(tmp_path):
+    path = str(tmp_path / "contradictions.jsonl")
+    index = ContradictionIndex(path, max_entries=2)
+    for i in range(6):
+        a, b = signature(f"a{i}", f"Plan {i}"), signature(f"b{i}", f"Counter {i}")
+        index.put(a, b, "m", "v1", report(a, b))
+    with open(path) as f:
+        assert len(f.read().splitlines()) <= 1 + 2 * 2
+
+    with open(path, "a") as f:
+        f.write('{"key": "cut sho')
+    reloaded = ContradictionIndex(path, max_entries=2)
+    assert len(reloaded.entries) == 2
+    a, b = signature("a5", "Plan 5"), signature("b5", "Counter 5")
+    assert reloaded.get(a, b, "m", "v1") is not None
+
+
+def test_file_with_another_fingerprint_starts_fresh(tmp_path):
+    path = tmp_path / "contradictions.jsonl"
+    path.write_text(json.dumps({"fingerprint": "old", "leading_steps": 3, "entries": {}}))
+    index = ContradictionIndex(str(path))
+    assert index.entries == {}
@@ -0,0 +1,124 @@
+"""
+Test end-to-end request deadlines: degradation of each phase and request validation.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import time
+
+import pytest
+
+import app as web
+from config import Config
+from orchestrator import ThoughtLineageOrchestrator
+from runtime import Deadline, DeadlineExceededError, LLMClient
+
+
+def signature_json(conclusion):
+    return json.dumps({
+        "reasoning_chain": [
+            {"step": i, "thought": f"{conclusion} step {i}", "confidence": 0.8, "evidence": []}
+            for i in range(1, 4)
+        ],
+        "conclusion": conclusion,
+        "confidence_score": 0.8,
+        "alternative_paths": []
+    })
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Answer every model call locally; phases listed in `model.timeout` run past the deadline."""
+    class Model:
+        timeout = set()
+        phases = []
+
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        Model.phases.append(decision["phase"])
+        if decision["phase"] in Model.timeout:
+            raise DeadlineExceededError(f"The {decision['phase']} call ran past the request deadline")
+        return signature_json(f"{decision['phase']} conclusion")
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    return Model
+
+
+def test_deadline_tracks_remaining_time():
+    deadline = Deadline(0.05)
+    assert deadline.allows(0.01)
+    assert not deadline.allows(1)
+    time.sleep(0.06)
+    assert deadline.expired()
+    assert deadline.remaining() == 0.0
+
+    unlimited = Deadline(None)
+    assert unlimited.remaining() is None
+    assert unlimited.allows(1e9)
+    assert not unlimited.expired()
+
+
+def test_degradations_are_recorded():
+    deadline = Deadline(10)
+    deadline.degrade("decision", "skipped", "1.0s left")
+    assert deadline.degraded[0]["phase"] == "decision"
+    assert deadline.to_dict()["budget_seconds"] == 10
+
+
+def test_sequential_run_completes_within_its_deadline(model):
+    results = ThoughtLineageOrchestrator().process_problem("Raise prices?", deadline=Deadline(60))
+    assert [sig["reasoning_type"] for sig in results["signatures"]] == ["analysis", "decision", "evaluation"]
+    assert results["degraded_phases"] == []
+
+
+def test_planning_past_the_deadline_answers_with_the_analysis(model):
+    model.timeout = {"decision"}
+    results = ThoughtLineageOrchestrator().process_problem("Raise prices?", deadline=Deadline(60))
+    assert [sig["reasoning_type"] for sig in results["signatures"]] == ["analysis"]
+    assert results["final_conclusion"] == "analysis conclusion"
+    assert {(d["phase"], d["action"]) for d in results["degraded_phases"]} == {
+        ("decision", "skipped"), ("evaluation", "skipped")
+    }
+
+
+def test_analysis_past_the_deadline_degrades_instead_of_raising(model):
+    model.timeout = {"analysis"}
+    results = ThoughtLineageOrchestrator().process_problem("Raise prices?", deadline=Deadline(60))
+    assert results["signatures"] == []
+    assert results["final_conclusion"] is None
+    assert [d["phase"] for d in results["degraded_phases"]][:2] == ["analysis", "decision"]
+    assert "decision" not in model.phases
+
+
+def test_fanout_analysis_past_the_deadline_degrades_instead_of_raising(model):
+    model.timeout = {"analysis"}
+    results = ThoughtLineageOrchestrator().run_competing_plans(
+        "Raise prices?", ["growth", "revenue"], deadline=Deadline(60)
+    )
+    assert results["signatures"] == []
+    assert results["final_conclusion"] is None
+    assert ("decision", "skipped") in {(d["phase"], d["action"]) for d in results["degraded_phases"]}
+
+
+def test_process_endpoint_reports_a_timed_out_analysis(model, monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    model.timeout = {"analysis"}
+    response = web.app.test_client().post("/api/process", json={"problem": "Raise prices?"})
+    assert response.status_code == 200
+    assert response.json["final_conclusion"] is None
+
+
+@pytest.mark.parametrize("value", [-5, 0, "soon", True, [10], "nan"])
+def test_invalid_deadline_seconds_is_rejected(monkeypatch, value):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    client = web.app.test_client()
+    response = client.post("/api/process", json={"problem": "Raise prices?", "deadline_seconds": value})
+    assert response.status_code == 400
+    assert "deadline_seconds" in response.json["error"]
+
+
+def test_deadline_seconds_is_capped_and_accepts_numeric_strings():
+    with web.app.test_request_context():
+        assert web.deadline_seconds({"deadline_seconds": "12.5"}) == (12.5, None)
+        assert web.deadline_seconds({"deadline_seconds": 10 ** 6}) == (Config.REQUEST_DEADLINE_SECONDS, None)
+        assert web.deadline_seconds({}) == (Config.REQUEST_DEADLINE_SECONDS, None)
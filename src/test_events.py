@@ -0,0 +1,101 @@
+"""
+Test the live graph event bus: broadcast, replay on reconnect, lagging viewers and the page flag.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import app as web
+from config import Config
+from graph import GraphEventBus
+from orchestrator import ThoughtLineageOrchestrator, ThoughtSignature
+
+
+def frames(subscription):
+    """Frames queued for a subscription so far, without waiting for more."""
+    queued = []
+    while not subscription.queue.empty():
+        queued.append(subscription.queue.get_nowait())
+    return queued
+
+
+def events(subscription):
+    parsed = []
+    for frame in frames(subscription):
+        if frame is None:
+            break
+        fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+        parsed.append((fields["event"], json.loads(fields["data"])))
+    return parsed
+
+
+def signature(conclusion, parents=()):
+    return ThoughtSignature(
+        agent_id="planner-agent",
+        reasoning_type="decision",
+        reasoning_chain=[{"step": 1, "thought": "Weigh the options", "confidence": 0.8, "evidence": []}],
+        conclusion=conclusion,
+        confidence_score=0.8,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=True
+    )
+
+
+def test_every_subscriber_gets_the_same_frame():
+    bus = GraphEventBus()
+    first, second = bus.subscribe("s"), bus.subscribe("s")
+    bus.publish("s", "node", {"id": "a"})
+    assert frames(first) == frames(second) == [b'id: 1\nevent: node\ndata: {"id":"a"}\n\n']
+    assert bus.subscribe("other").queue.empty()
+
+
+def test_reconnect_replays_missed_events_or_asks_for_a_resync():
+    bus = GraphEventBus(history=2)
+    for i in range(3):
+        bus.publish("s", "node", {"id": i})
+
+    assert [data["id"] for _, data in events(bus.subscribe("s", last_event_id="1"))] == [1, 2]
+    assert [event for event, _ in events(bus.subscribe("s", last_event_id="0"))] == ["resync"]
+
+
+def test_lagging_subscriber_is_dropped_with_a_resync():
+    bus = GraphEventBus(max_queue=2)
+    sub = bus.subscribe("s")
+    for i in range(3):
+        bus.publish("s", "node", {"id": i})
+
+    assert frames(sub)[-2:] == [b'event: resync\ndata: {"reason":"subscriber fell behind"}\n\n', None]
+    assert bus.stats()["dropped_subscribers"] == 1
+    assert bus.stats()["subscribers"] == 0
+
+
+def test_stream_ends_with_a_retry_after_its_maximum_duration():
+    bus = GraphEventBus(heartbeat_seconds=0.01, stream_seconds=0.03)
+    assert list(bus.subscribe("s"))[-1] == b"retry: 500\n\n"
+    assert bus.stats()["subscribers"] == 0
+
+
+def test_listener_publishes_new_nodes_but_not_merged_duplicates():
+    bus = GraphEventBus()
+    orchestrator = ThoughtLineageOrchestrator()
+    orchestrator.signature_listeners.append(bus.listener("s", orchestrator.graph))
+    sub = bus.subscribe("s")
+
+    first, second = signature("Grow first"), signature("Profit first")
+    orchestrator.register_signature(first)
+    orchestrator.register_signature(second)
+    orchestrator.register_signature(signature("Do both", [first]))
+    orchestrator.register_signature(signature("Do both", [second]))
+
+    published = events(sub)
+    assert [event for event, _ in published] == ["node", "node", "node", "edge"]
+    assert orchestrator.graph.merges == 1
+
+
+def test_page_opens_the_stream_only_when_enabled(monkeypatch):
+    client = web.app.test_client()
+    monkeypatch.setattr(Config, "LIVE_EVENTS", False)
+    assert b"const LIVE_EVENTS = false;" in client.get("/").data
+    monkeypatch.setattr(Config, "LIVE_EVENTS", True)
+    assert b"const LIVE_EVENTS = true;" in client.get("/").data
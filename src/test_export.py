@@ -0,0 +1,70 @@
+"""
+Test deduplicated multi-lineage exports.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import app as web
+from orchestrator import ThoughtLineageOrchestrator, ThoughtSignature
+
+
+def register(orchestrator, agent_id, reasoning_type, parents=()):
+    sig = ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[],
+        conclusion=f"{agent_id} conclusion",
+        confidence_score=0.8,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=False
+    )
+    orchestrator.register_signature(sig)
+    return sig
+
+
+def fanout_graph():
+    """One analysis, two plans on it, and a synthesis of both plans."""
+    orchestrator = ThoughtLineageOrchestrator()
+    analysis = register(orchestrator, "analyzer-agent", "analysis")
+    growth = register(orchestrator, "planner-growth-focus", "decision", [analysis])
+    revenue = register(orchestrator, "planner-revenue-focus", "decision", [analysis])
+    synthesis = register(orchestrator, "synthesizer-orchestrator", "synthesis", [growth, revenue])
+    return orchestrator, analysis, growth, revenue, synthesis
+
+
+def test_shared_ancestors_are_exported_once():
+    orchestrator, analysis, growth, revenue, synthesis = fanout_graph()
+
+    export = json.loads("".join(orchestrator.iter_lineages_export(
+        [growth.signature_id, revenue.signature_id, "missing", growth.signature_id]
+    )))
+
+    assert [t["ancestors"] for t in export["targets"]] == [[analysis.signature_id], [analysis.signature_id]]
+    assert export["missing"] == ["missing"]
+    assert export["node_count"] == len(export["nodes"]) == 3
+
+
+def test_diamond_ancestors_are_listed_once_nearest_first():
+    orchestrator, analysis, growth, revenue, synthesis = fanout_graph()
+    target = orchestrator.collect_lineages([synthesis.signature_id])["targets"][0]
+    assert target["ancestors"] == [growth.signature_id, revenue.signature_id, analysis.signature_id]
+    assert target["lineage_depth"] == 3
+
+
+def test_export_to_file_matches_the_stream(tmp_path):
+    orchestrator, *_, synthesis = fanout_graph()
+    path = tmp_path / "lineages.json"
+    orchestrator.export_lineages([synthesis.signature_id], str(path))
+    assert json.loads(path.read_text()) == json.loads("".join(orchestrator.iter_lineages_export([synthesis.signature_id])))
+
+
+def test_endpoint_exports_every_signature_of_a_type():
+    orchestrator, *_ = fanout_graph()
+    web.set_current(orchestrator)
+    client = web.app.test_client()
+
+    export = client.post("/api/lineage/export", json={"reasoning_type": "decision"}).get_json()
+    assert len(export["targets"]) == 2 and export["node_count"] == 3
+    assert client.post("/api/lineage/export", json={}).status_code == 400
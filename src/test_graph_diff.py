@@ -0,0 +1,104 @@
+"""
+Test structural diff and merge of reasoning graph snapshots.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from graph import GraphDiff
+
+
+def node(node_id, agent, reasoning_type, conclusion, confidence, timestamp):
+    return {
+        "id": node_id,
+        "agent": agent,
+        "type": reasoning_type,
+        "conclusion": conclusion,
+        "confidence": confidence,
+        "timestamp": timestamp
+    }
+
+
+def run(prefix, executor_conclusion="Launch in Q3", executor_confidence=0.7):
+    """One analyzer -> planner -> executor run with ids unique to the prefix."""
+    return {
+        "nodes": [
+            node(f"{prefix}-a", "analyzer-agent", "analysis", "Market is ready", 0.8, "2026-01-01T00:00:00"),
+            node(f"{prefix}-p", "planner-agent", "decision", "Price at $20", 0.75, "2026-01-01T00:00:01"),
+            node(f"{prefix}-e", "executor-agent", "evaluation", executor_conclusion, executor_confidence, "2026-01-01T00:00:02")
+        ],
+        "edges": [
+            {"source": f"{prefix}-a", "target": f"{prefix}-p"},
+            {"source": f"{prefix}-p", "target": f"{prefix}-e"}
+        ]
+    }
+
+
+def test_identical_runs_match_despite_different_ids():
+    diff = GraphDiff().diff(run("old"), run("new"))
+
+    assert diff["summary"]["added"] == diff["summary"]["removed"] == diff["summary"]["changed"] == 0
+    assert diff["summary"]["unchanged"] == 3
+    # The executor's digest matched, so its two ancestors were never compared
+    assert diff["summary"]["skipped_by_lineage_digest"] == 2
+
+
+def test_changed_conclusion_and_confidence_are_reported():
+    diff = GraphDiff().diff(run("old"), run("new", "Launch in Q4", 0.5))
+
+    assert diff["summary"]["changed"] == 1
+    change = diff["changed"][0]
+    assert (change["base_id"], change["target_id"]) == ("old-e", "new-e")
+    assert change["conclusion_changed"]
+    assert change["confidence_shift"] == -0.2
+    assert change["lineage"] == "analyzer-agent > planner-agent > executor-agent"
+
+
+def test_confidence_within_tolerance_is_unchanged():
+    diff = GraphDiff(confidence_tolerance=0.01).diff(run("old"), run("new", executor_confidence=0.705))
+
+    assert diff["summary"]["changed"] == 0
+    assert diff["summary"]["unchanged"] == 3
+
+
+def test_added_and_removed_nodes():
+    base = run("old")
+    target = run("new")
+    target["nodes"].append(node("new-s", "synthesizer-agent", "synthesis", "Hybrid", 0.9, "2026-01-01T00:00:03"))
+    target["edges"].append({"source": "new-e", "target": "new-s"})
+    # Same position as the executor, but a second occurrence of it
+    base["nodes"].append(node("old-e2", "executor-agent", "evaluation", "Launch later", 0.6, "2026-01-01T00:00:05"))
+    base["edges"].append({"source": "old-p", "target": "old-e2"})
+
+    diff = GraphDiff().diff(base, target)
+
+    assert [n["id"] for n in diff["added"]] == ["new-s"]
+    assert [n["id"] for n in diff["removed"]] == ["old-e2"]
+    assert diff["removed"][0]["lineage"] == "analyzer-agent > planner-agent > executor-agent #2"
+
+
+def test_merge_keeps_base_ids_and_tags_every_node():
+    target = run("new", "Launch in Q4", 0.5)
+    target["nodes"].append(node("new-s", "synthesizer-agent", "synthesis", "Hybrid", 0.9, "2026-01-01T00:00:03"))
+    target["edges"].append({"source": "new-e", "target": "new-s"})
+
+    merged = GraphDiff().merge(run("old"), target)
+
+    status = {n["id"]: n["diff_status"] for n in merged["nodes"]}
+    assert status == {"old-a": "unchanged", "old-p": "unchanged", "old-e": "changed", "new-s": "added"}
+    executor = next(n for n in merged["nodes"] if n["id"] == "old-e")
+    assert executor["conclusion"] == "Launch in Q4"
+    assert executor["previous"] == {"conclusion": "Launch in Q3", "confidence": 0.7}
+    # The added node's edge is rewired onto the base id of its parent
+    assert {(e["source"], e["target"]) for e in merged["edges"]} == {
+        ("old-a", "old-p"), ("old-p", "old-e"), ("old-e", "new-s")
+    }
+
+
+def test_cycle_is_rejected():
+    graph = run("x")
+    graph["edges"].append({"source": "x-e", "target": "x-a"})
+
+    with pytest.raises(ValueError):
+        GraphDiff().index(graph)
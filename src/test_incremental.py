@@ -0,0 +1,124 @@
+"""
+Test incremental contradiction detection as signatures are registered.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import threading
+
+import pytest
+
+from intelligence import IncrementalDetector
+from orchestrator import ThoughtLineageOrchestrator, ThoughtSignature
+from runtime import LLMClient
+
+
+class Detector:
+    """Records compared pairs; blocks until `release` is set when `hold` is."""
+
+    def __init__(self, hold=False):
+        self.pairs = []
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def detect(self, sig_a, sig_b):
+        self.pairs.append({sig_a["signature_id"], sig_b["signature_id"]})
+        self.release.wait(2)
+        return {"signatures_compared": [sig_a["signature_id"], sig_b["signature_id"]], "has_contradiction": False}
+
+
+def register(orchestrator, agent_id, reasoning_type, parents=()):
+    sig = ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[],
+        conclusion=f"{agent_id} conclusion",
+        confidence_score=0.8,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=False
+    )
+    orchestrator.register_signature(sig)
+    return sig
+
+
+def attach(detector, **options):
+    orchestrator = ThoughtLineageOrchestrator()
+    incremental = IncrementalDetector(detector, orchestrator.graph, **options)
+    orchestrator.signature_listeners.append(incremental.on_signature)
+    return orchestrator, incremental
+
+
+def test_siblings_are_compared_as_they_land():
+    detector = Detector()
+    orchestrator, incremental = attach(detector, reasoning_types=["decision"])
+    analysis = register(orchestrator, "analyzer-agent", "analysis")
+    plans = [register(orchestrator, f"planner-{i}", "decision", [analysis]) for i in range(3)]
+    other_analysis = register(orchestrator, "analyzer-agent-2", "analysis")
+    register(orchestrator, "planner-elsewhere", "decision", [other_analysis])
+
+    reports = incremental.collect([p.signature_id for p in plans])
+    incremental.close()
+    assert len(reports) == 3
+    assert len(detector.pairs) == 3
+    assert incremental.to_dict()["pairs"] == 3
+
+
+def test_type_scope_compares_signatures_of_the_same_type():
+    detector = Detector()
+    orchestrator, incremental = attach(detector, scope="type")
+    first = register(orchestrator, "planner-a", "decision")
+    register(orchestrator, "analyzer-agent", "analysis")
+    second = register(orchestrator, "planner-b", "decision")
+
+    incremental.collect([first.signature_id, second.signature_id])
+    incremental.close()
+    assert detector.pairs == [{first.signature_id, second.signature_id}]
+
+
+def test_collect_starts_pairs_left_out_by_max_candidates():
+    detector = Detector()
+    orchestrator, incremental = attach(detector, max_candidates=1)
+    analysis = register(orchestrator, "analyzer-agent", "analysis")
+    plans = [register(orchestrator, f"planner-{i}", "decision", [analysis]) for i in range(3)]
+    assert len(incremental.pairs) == 2
+
+    assert len(incremental.collect([p.signature_id for p in plans])) == 3
+    incremental.close()
+
+
+def test_pairs_still_running_at_the_timeout_are_counted():
+    detector = Detector(hold=True)
+    orchestrator, incremental = attach(detector)
+    analysis = register(orchestrator, "analyzer-agent", "analysis")
+    plans = [register(orchestrator, f"planner-{i}", "decision", [analysis]) for i in range(2)]
+
+    assert incremental.collect([p.signature_id for p in plans], timeout=0.05) == []
+    assert incremental.unfinished == 1
+    detector.release.set()
+    incremental.close()
+
+
+def test_unknown_scope_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalDetector(Detector(), ThoughtLineageOrchestrator().graph, scope="everything")
+
+
+def test_fanout_detects_every_plan_pair_incrementally(monkeypatch):
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        return json.dumps({
+            "reasoning_chain": [{"step": 1, "thought": "Check the numbers", "confidence": 0.8, "evidence": []}],
+            "conclusion": f"{decision['phase']} conclusion",
+            "confidence_score": 0.8,
+            "alternative_paths": []
+        })
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    results = ThoughtLineageOrchestrator().run_competing_plans(
+        "Raise prices?",
+        ["growth", "revenue", {"focus": "risk", "role_description": "Risk Officer - Avoid irreversible bets."}],
+        incremental_detection=True
+    )
+    assert results["incremental_detection"]["pairs"] == 3
+    assert results["incremental_detection"]["unfinished_pairs"] == 0
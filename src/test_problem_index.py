@@ -0,0 +1,87 @@
+"""
+Test near-identical problem matching and reuse of analyses.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+from intelligence import ProblemIndex
+from orchestrator import ThoughtLineageOrchestrator
+from runtime import LLMClient
+
+ANALYSIS = {"agent_id": "analyzer-agent", "conclusion": "Demand is price sensitive"}
+
+
+def test_rewording_casing_and_constraint_order_still_match():
+    index = ProblemIndex()
+    index.add("Should we raise the price of our Pro plan?", ["Keep churn low", "No new hires"], ANALYSIS)
+
+    match = index.find_similar("should we raise price of our pro plan", ["No new hires", "Keep churn low"])
+    assert match["analysis"] == ANALYSIS
+    assert match["similarity"] >= 0.9
+    assert index.find_similar("Should we open an office in Berlin?") is None
+
+
+def test_tenants_only_match_their_own_entries():
+    index = ProblemIndex()
+    index.add("Should we raise prices?", None, ANALYSIS, tenant="alice")
+    assert index.find_similar("Should we raise prices?", tenant="bob") is None
+    assert index.find_similar("Should we raise prices?", tenant="alice") is not None
+
+
+def test_oldest_entries_are_evicted():
+    index = ProblemIndex(max_entries=2)
+    for problem in ("Raise prices?", "Open a store?", "Hire a designer?"):
+        index.add(problem, None, ANALYSIS)
+    assert len(index) == 2
+    assert index.find_similar("Raise prices?") is None
+
+
+def test_persisted_index_appends_and_reloads(tmp_path):
+    path = str(tmp_path / "problems.jsonl")
+    index = ProblemIndex(path)
+    index.add("Should we raise prices?", None, ANALYSIS)
+    index.add("Should we open a store?", None, ANALYSIS)
+    with open(path) as f:
+        assert len(f.read().splitlines()) == 3
+
+    with open(path, "a") as f:
+        f.write('{"entry": {"tenant": "def')
+    reloaded = ProblemIndex(path)
+    assert len(reloaded) == 2
+    assert reloaded.find_similar("should we raise prices") is not None
+
+
+def test_file_built_with_other_parameters_starts_fresh(tmp_path):
+    path = str(tmp_path / "problems.jsonl")
+    ProblemIndex(path, num_perm=64).add("Should we raise prices?", None, ANALYSIS)
+    assert len(ProblemIndex(path)) == 0
+
+
+def test_auto_mode_reuses_the_analysis_without_a_model_call(monkeypatch):
+    calls = []
+
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        calls.append(decision["phase"])
+        return json.dumps({
+            "reasoning_chain": [{"step": 1, "thought": "Look at churn", "confidence": 0.8, "evidence": []}],
+            "conclusion": "Demand is price sensitive",
+            "confidence_score": 0.8,
+            "alternative_paths": []
+        })
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    index = ProblemIndex()
+
+    first, reuse = ThoughtLineageOrchestrator(problem_index=index).run_analysis("Should we raise prices?")
+    assert reuse is None and calls == ["analysis"]
+
+    _, reuse = ThoughtLineageOrchestrator(problem_index=index).run_analysis("Should we raise prices?!", reuse_analysis="offer")
+    assert reuse["status"] == "offered" and calls == ["analysis", "analysis"]
+
+    reused, reuse = ThoughtLineageOrchestrator(problem_index=index).run_analysis("should we raise prices", reuse_analysis="auto")
+    assert reuse["status"] == "reused"
+    assert calls == ["analysis", "analysis"]
+    assert reused.conclusion == first.conclusion
+    assert reused.context["input_data"]["reused_analysis_of"] in ("Should we raise prices?", "Should we raise prices?!")
@@ -0,0 +1,67 @@
+"""
+Test opt-in request profiling: collected outputs, summaries and time categories.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import os
+import time
+
+import app as web
+from runtime import RequestProfiler
+from runtime.profiling import _APP_ROOT, _category
+
+
+def busy(seconds):
+    """Application code that serializes in a loop for a while."""
+    ends = time.monotonic() + seconds
+    while time.monotonic() < ends:
+        json.dumps({"nodes": list(range(200))})
+
+
+def test_profile_writes_flamegraph_input_stats_and_summary(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), interval_seconds=0.002)
+    with profiler.profile("/api/process") as profile:
+        busy(0.1)
+
+    summary = profiler.get(profile["id"])
+    assert summary["label"] == "/api/process"
+    assert summary["samples"] > 0
+    assert abs(sum(summary["time_share"].values()) - 1.0) < 0.01
+    assert any("busy" in f["function"] for f in summary["functions"])
+    for extension in ("folded", "prof", "json"):
+        assert os.path.exists(profiler.path(profile["id"], extension))
+    with open(profiler.path(profile["id"], "folded")) as f:
+        assert "busy (test_profiling.py)" in f.read()
+
+
+def test_other_workers_read_summaries_from_the_directory(tmp_path):
+    with RequestProfiler(str(tmp_path)).profile("/api/graph") as profile:
+        busy(0.01)
+    other_worker = RequestProfiler(str(tmp_path))
+    assert other_worker.summaries() == []
+    assert other_worker.get(profile["id"])["label"] == "/api/graph"
+    assert other_worker.get("../etc") is None
+
+
+def test_only_requested_or_sampled_requests_are_profiled(tmp_path):
+    assert RequestProfiler(str(tmp_path)).should_profile(True)
+    assert not RequestProfiler(str(tmp_path)).should_profile(False)
+    assert RequestProfiler(str(tmp_path), sample_rate=1.0).should_profile(False)
+
+
+def test_stacks_are_classified_by_where_time_goes():
+    app_file = os.path.join(_APP_ROOT, "agents", "base_agent.py")
+    site = os.path.join("lib", "site-packages", "google", "api_core", "grpc_helpers.py")
+    json_file = os.path.join("lib", "json", "decoder.py")
+
+    assert _category([(app_file, "generate_signature"), (site, "__call__")]) == "network"
+    assert _category([(app_file, "to_dict"), (json_file, "encode")]) == "serialization"
+    assert _category([(app_file, "_parse"), (json_file, "decode")]) == "json_parsing"
+    assert _category([(app_file, "generate_signature")]) == "prompt_construction"
+    assert _category([(app_file, "add_signature")]) == "application"
+
+
+def test_unknown_profile_is_not_found():
+    assert web.app.test_client().get("/api/profiles/unknown").status_code == 404
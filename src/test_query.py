@@ -0,0 +1,77 @@
+"""
+Test secondary-index signature queries and the paginated /api/signatures endpoint.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import app as web
+from orchestrator import ReasoningGraph, ThoughtLineageOrchestrator, ThoughtSignature
+
+
+def add(graph, agent_id, reasoning_type, confidence, timestamp):
+    sig = ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[],
+        conclusion=f"{agent_id} at {timestamp}",
+        confidence_score=confidence,
+        parent_signatures=[],
+        content_addressed=False
+    )
+    sig.timestamp = timestamp
+    graph.add_signature(sig)
+    return sig
+
+
+def sample_graph():
+    graph = ReasoningGraph()
+    add(graph, "analyzer-agent", "analysis", 0.9, "2026-01-01T10:00:00")
+    add(graph, "planner-agent", "decision", 0.55, "2026-01-01T10:05:00")
+    add(graph, "planner-agent", "decision", 0.3, "2026-01-01T09:00:00")  # Arrives out of time order
+    add(graph, "executor-agent", "evaluation", 1.0, "2026-01-01T10:10:00")
+    return graph
+
+
+def conclusions(result):
+    return [sig.conclusion for sig in result["signatures"]]
+
+
+def test_filters_combine_and_results_are_newest_first():
+    graph = sample_graph()
+    assert conclusions(graph.query(agent_id="planner-agent")) == [
+        "planner-agent at 2026-01-01T10:05:00", "planner-agent at 2026-01-01T09:00:00"
+    ]
+    assert graph.query(reasoning_type="decision", min_confidence=0.5)["total"] == 1
+    assert graph.query(agent_id="nobody")["total"] == 0
+
+
+def test_time_range_is_inclusive_then_exclusive():
+    graph = sample_graph()
+    result = graph.query(since="2026-01-01T09:00:00", until="2026-01-01T10:05:00")
+    assert conclusions(result) == ["analyzer-agent at 2026-01-01T10:00:00", "planner-agent at 2026-01-01T09:00:00"]
+
+
+def test_confidence_bounds_include_the_top_bucket():
+    graph = sample_graph()
+    assert graph.query(min_confidence=0.95)["total"] == 1
+    assert graph.query(min_confidence=0.3, max_confidence=0.55)["total"] == 1
+
+
+def test_pages_are_offset_and_limited():
+    graph = sample_graph()
+    page = graph.query(offset=1, limit=2)
+    assert page["total"] == 4
+    assert conclusions(page) == ["planner-agent at 2026-01-01T10:05:00", "analyzer-agent at 2026-01-01T10:00:00"]
+
+
+def test_endpoint_reports_the_next_offset():
+    orchestrator = ThoughtLineageOrchestrator()
+    orchestrator.graph = sample_graph()
+    web.set_current(orchestrator)
+    client = web.app.test_client()
+
+    first = client.get("/api/signatures?limit=3").json
+    assert (first["total"], len(first["signatures"]), first["next_offset"]) == (4, 3, 3)
+    last = client.get("/api/signatures?limit=3&offset=3").json
+    assert len(last["signatures"]) == 1 and "next_offset" not in last
+    assert client.get("/api/signatures?agent_id=executor-agent").json["signatures"][0]["confidence_score"] == 1.0
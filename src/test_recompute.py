@@ -0,0 +1,122 @@
+"""
+Test incremental recompute: dirty marking, reuse of unchanged syntheses and request errors.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import pytest
+
+import app as web
+from config import Config
+from orchestrator import ThoughtLineageOrchestrator
+from runtime import DeadlineExceededError, LLMClient
+
+
+def plan_conclusion(prompt):
+    if "Growth-Obsessed" in prompt:
+        return "Spend heavily to grow users now"
+    return "Cut spending and raise prices for revenue"
+
+
+@pytest.fixture
+def phases(monkeypatch):
+    """Answer every model call locally, recording the phase of each call."""
+    calls = []
+
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        calls.append(decision["phase"])
+        if decision["phase"] == "detection":
+            return json.dumps({
+                "has_contradiction": True,
+                "contradiction_type": "assumption",
+                "severity": 0.7,
+                "assumption_a": "Market share wins",
+                "assumption_b": "Cash flow wins",
+                "conflicting_elements": ["Spending"]
+            })
+        conclusion = plan_conclusion(prompt) if decision["phase"] == "decision" else f"{decision['phase']} conclusion"
+        return json.dumps({
+            "reasoning_chain": [
+                {"step": i, "thought": f"{conclusion} because {i}", "confidence": 0.8, "evidence": []}
+                for i in range(1, 4)
+            ],
+            "conclusion": conclusion,
+            "confidence_score": 0.8,
+            "alternative_paths": []
+        })
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    return calls
+
+
+def fanout(phases):
+    orchestrator = ThoughtLineageOrchestrator()
+    results = orchestrator.run_competing_plans("Raise prices?", ["growth", "revenue"])
+    by_type = {}
+    for sig in results["signatures"]:
+        by_type.setdefault(sig["reasoning_type"], []).append(sig["signature_id"])
+    phases.clear()
+    return orchestrator, by_type
+
+
+def test_edited_plan_reruns_only_the_synthesis_below_it(phases):
+    orchestrator, ids = fanout(phases)
+    plan = ids["decision"][0]
+
+    result = orchestrator.recompute([{"signature_id": plan, "conclusion": "Grow, but slowly"}])
+
+    assert [r["old_id"] for r in result["regenerated"]] == [plan, ids["synthesis"][0]]
+    assert result["reused"] == 2
+    assert sorted(phases) == ["detection", "synthesis"]
+    synthesis = orchestrator.graph.get_signature(result["regenerated"][1]["new_id"])
+    assert result["regenerated"][0]["new_id"] in synthesis.context["parent_signatures"]
+
+
+def test_synthesis_is_reused_when_its_parents_come_back_unchanged(phases, monkeypatch):
+    monkeypatch.setattr(Config, "CONTENT_ADDRESSED_IDS", True)
+    orchestrator, ids = fanout(phases)
+    plan = ids["decision"][0]
+
+    result = orchestrator.recompute([{"signature_id": plan, "regenerate": True}])
+
+    # The plan regenerates to the same content, so its id and the synthesis above it stand
+    assert [r["new_id"] for r in result["regenerated"]] == [plan]
+    assert phases == ["decision"]
+    assert result["reused"] == 3
+
+
+def test_unknown_and_superseded_signatures_are_rejected(phases):
+    orchestrator, ids = fanout(phases)
+    plan = ids["decision"][0]
+    orchestrator.recompute([{"signature_id": plan, "conclusion": "Grow, but slowly"}])
+
+    with pytest.raises(KeyError):
+        orchestrator.recompute([{"signature_id": "missing", "regenerate": True}])
+    with pytest.raises(ValueError, match="superseded"):
+        orchestrator.recompute([{"signature_id": plan, "regenerate": True}])
+
+
+def test_recompute_endpoint_maps_errors_to_statuses(phases, monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    orchestrator, ids = fanout(phases)
+    plan = ids["decision"][0]
+    web.set_current(orchestrator)
+    client = web.app.test_client()
+
+    response = client.post("/api/recompute", json={"changes": [{"signature_id": "missing", "regenerate": True}]})
+    assert response.status_code == 404
+    assert response.json["error"] == "Unknown signature: missing"
+
+    response = client.post("/api/recompute", json={"changes": [{"signature_id": plan, "conclusion": "Grow, but slowly"}]})
+    assert response.status_code == 200
+    response = client.post("/api/recompute", json={"changes": [{"signature_id": plan, "regenerate": True}]})
+    assert response.status_code == 400
+
+    def out_of_time(self, changes, deadline=None, max_concurrency=None):
+        raise DeadlineExceededError("No time left for the decision call")
+
+    monkeypatch.setattr(ThoughtLineageOrchestrator, "recompute", out_of_time)
+    response = client.post("/api/recompute", json={"changes": [{"signature_id": plan, "regenerate": True}]})
+    assert response.status_code == 504
@@ -0,0 +1,100 @@
+"""
+Test per-phase model routing, live stats and request budgets.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from config import Config, env_flag
+from runtime import ModelRouter, RequestBudget
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    monkeypatch.setattr(Config, "MODEL_ROUTING_ENABLED", True)
+    return ModelRouter()
+
+
+@pytest.mark.parametrize("value", ["1", "true", "TRUE", "yes", " Yes "])
+def test_flag_values_that_turn_a_setting_on(monkeypatch, value):
+    monkeypatch.setenv("TLO_TEST_FLAG", value)
+    assert env_flag("TLO_TEST_FLAG", False) is True
+
+
+@pytest.mark.parametrize("value", ["0", "false", "no", "off", ""])
+def test_flag_values_that_turn_a_setting_off(monkeypatch, value):
+    monkeypatch.setenv("TLO_TEST_FLAG", value)
+    assert env_flag("TLO_TEST_FLAG", True) is False
+
+
+def test_unset_flag_keeps_its_default(monkeypatch):
+    monkeypatch.delenv("TLO_TEST_FLAG", raising=False)
+    assert env_flag("TLO_TEST_FLAG", True) is True
+    assert env_flag("TLO_TEST_FLAG", False) is False
+
+
+def test_disabled_routing_uses_the_request_model(monkeypatch):
+    monkeypatch.setattr(Config, "MODEL_ROUTING_ENABLED", False)
+    decision = ModelRouter().select("analysis", default_model="gemini-2.5-flash")
+    assert decision["model"] == "gemini-2.5-flash"
+    assert decision["reason"] == "routing disabled"
+
+
+def test_policy_maps_phases_to_tiers(routing):
+    tiers = Config.MODEL_ROUTING["tiers"]
+    assert routing.select("analysis")["model"] == tiers["fast"]
+    assert routing.select("decision", default_model="gemini-2.5-flash")["model"] == "gemini-2.5-flash"
+
+
+def test_severe_synthesis_escalates_to_the_strong_tier(routing):
+    decision = routing.select("synthesis", severity=0.9)
+    assert decision["tier"] == "strong"
+    assert decision["model"] == Config.MODEL_ROUTING["tiers"]["strong"]
+    assert routing.select("synthesis", severity=0.5)["tier"] == "default"
+
+
+def test_choice_is_downgraded_to_fit_the_remaining_budget(routing):
+    budget = RequestBudget(max_cost_usd=0.01)
+    budget.charge(0.0099)
+    decision = routing.select("synthesis", severity=0.9, budget=budget)
+    assert decision["model"] != Config.MODEL_ROUTING["tiers"]["strong"]
+    assert "remaining budget" in decision["reason"]
+
+
+def test_budget_tracks_spend_against_its_ceiling():
+    budget = RequestBudget(max_cost_usd=1.0)
+    budget.charge(0.25)
+    budget.charge(0.5)
+    assert budget.remaining_cost() == pytest.approx(0.25)
+    assert budget.to_dict() == {"max_cost_usd": 1.0, "spent_cost_usd": 0.75, "calls": 2}
+    assert RequestBudget().remaining_cost() is None
+
+
+def test_failed_first_call_does_not_seed_the_averages():
+    router = ModelRouter()
+    router.record("m", 0.2, 400, 0, failed=True)
+    # Still estimated like an unseen model
+    assert router.expected_latency("m") == Config.ESTIMATED_CALL_LATENCY_SECONDS
+    assert router.expected_cost("m", "signature") == ModelRouter().expected_cost("m", "signature")
+
+    router.record("m", 4.0, 1000, 800)
+    stats = router.stats["m"]
+    assert stats["latency"] == 4.0
+    assert stats["output_tokens"] == 800
+    assert (stats["calls"], stats["successes"], stats["failures"]) == (2, 1, 1)
+
+
+def test_later_calls_move_the_averages_and_failures_do_not(routing):
+    routing.record("m", 4.0, 1000, 800)
+    routing.record("m", 8.0, 1000, 800)
+    assert routing.expected_latency("m") == pytest.approx(0.7 * 4.0 + 0.3 * 8.0)
+    routing.record("m", 60.0, 1000, 0, failed=True)
+    assert routing.expected_latency("m") == pytest.approx(0.7 * 4.0 + 0.3 * 8.0)
+
+
+def test_snapshot_reports_models_without_successes(routing):
+    routing.record("m", 1.0, 100, 0, failed=True)
+    snapshot = routing.snapshot()["models"]["m"]
+    assert snapshot["latency"] is None
+    assert snapshot["expected_cost_usd"] is None
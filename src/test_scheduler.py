@@ -0,0 +1,128 @@
+"""
+Test weighted fair scheduling of model calls across tenants and priority classes.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from runtime import FairScheduler, SchedulerRejectedError
+
+
+def granted(tickets):
+    return [ticket for ticket in tickets if ticket.holding and not ticket.released]
+
+
+def drain(scheduler, blocker, tickets):
+    """Release the blocking ticket, then each granted ticket in turn; returns the grant order."""
+    order = []
+    scheduler.release(blocker)
+    while len(order) < len(tickets):
+        ticket = next(t for t in tickets if t.holding and not t.released)
+        order.append(ticket.tenant)
+        scheduler.release(ticket)
+    return order
+
+
+def test_capacity_is_never_exceeded():
+    scheduler = FairScheduler(capacity=2, interactive_reserve=0)
+    tickets = [scheduler.enqueue("a") for _ in range(3)]
+
+    assert len(granted(tickets)) == 2
+    assert not tickets[2].wait(0)
+    scheduler.release(tickets[0])
+    assert tickets[2].wait(0)
+
+
+def test_batch_calls_leave_the_interactive_reserve_free():
+    scheduler = FairScheduler(capacity=2, interactive_reserve=1)
+    first = scheduler.enqueue("bulk", "batch")
+    second = scheduler.enqueue("bulk", "batch")
+    interactive = scheduler.enqueue("user", "interactive")
+
+    assert first.wait(0) and not second.wait(0)
+    assert interactive.wait(0)
+
+
+def test_interactive_calls_go_before_batch_calls():
+    scheduler = FairScheduler(capacity=1, interactive_reserve=0)
+    blocker = scheduler.enqueue("x")
+    tickets = [scheduler.enqueue("bulk", "batch"), scheduler.enqueue("user", "interactive")]
+
+    assert drain(scheduler, blocker, tickets) == ["user", "bulk"]
+
+
+def test_tenants_take_turns_instead_of_first_come_first_served():
+    scheduler = FairScheduler(capacity=1, interactive_reserve=0)
+    blocker = scheduler.enqueue("x")
+    tickets = [scheduler.enqueue("heavy") for _ in range(4)] + [scheduler.enqueue("light")]
+
+    order = drain(scheduler, blocker, tickets)
+
+    assert order.index("light") <= 1
+
+
+def test_weights_set_each_tenant_share():
+    scheduler = FairScheduler(capacity=1, interactive_reserve=0, weights={"gold": 2.0})
+    blocker = scheduler.enqueue("x")
+    tickets = []
+    for _ in range(6):
+        tickets.append(scheduler.enqueue("gold"))
+        tickets.append(scheduler.enqueue("basic"))
+
+    order = drain(scheduler, blocker, tickets)
+
+    assert order[:6].count("gold") == 4
+
+
+def test_released_waiting_ticket_is_withdrawn():
+    scheduler = FairScheduler(capacity=1, interactive_reserve=0)
+    blocker = scheduler.enqueue("a")
+    waiting = scheduler.enqueue("b")
+
+    scheduler.release(waiting)
+    assert not waiting.wait(0)
+    scheduler.release(blocker)
+    assert scheduler.stats()["classes"]["interactive"]["waiting"] == 0
+
+
+def test_admit_demotes_busy_tenants_to_batch():
+    scheduler = FairScheduler(interactive_per_tenant=2)
+
+    assert [scheduler.admit("a") for _ in range(3)] == ["interactive", "interactive", "batch"]
+    assert scheduler.admit("b") == "interactive"
+    scheduler.finish("a", "interactive")
+    assert scheduler.admit("a") == "interactive"
+    assert scheduler.admit("a", "batch") == "batch"
+
+
+def test_pinned_tenants_get_their_class_whatever_they_ask_for():
+    scheduler = FairScheduler(tenant_priorities={"bulk": "batch", "vip": "interactive"}, interactive_per_tenant=1)
+
+    assert scheduler.admit("bulk", "interactive") == "batch"
+    assert [scheduler.admit("vip") for _ in range(3)] == ["interactive"] * 3
+    with pytest.raises(ValueError):
+        scheduler.admit("a", "urgent")
+
+
+def test_admit_rejects_when_the_queue_is_full():
+    scheduler = FairScheduler(capacity=1, interactive_reserve=0, max_queue=1)
+    scheduler.enqueue("a")
+    scheduler.enqueue("a")
+    scheduler.enqueue("a")
+
+    with pytest.raises(SchedulerRejectedError):
+        scheduler.admit("b")
+    assert scheduler.stats()["classes"]["interactive"]["rejected"] == 1
+
+
+def test_idle_tenants_are_forgotten():
+    scheduler = FairScheduler(capacity=4, interactive_reserve=1)
+    long_running = scheduler.enqueue("steady")
+    for i in range(500):
+        ticket = scheduler.enqueue(f"session-{i}", "batch" if i % 2 else "interactive")
+        scheduler.release(ticket)
+
+    assert scheduler.stats()["tenants_tracked"] <= 64
+    scheduler.release(long_running)
+    assert scheduler.stats()["tenants_tracked"] == 0
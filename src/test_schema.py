@@ -0,0 +1,112 @@
+"""
+Test validation and local repair of model output against signature_schema.json.
+"""
+import json
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from runtime import OutputValidator, SchemaError, recover_json
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return OutputValidator()
+
+
+def signature(**overrides):
+    data = {
+        "reasoning_chain": [
+            {"step": 1, "thought": "observe", "confidence": 0.8, "evidence": ["fact"]},
+            {"step": 2, "thought": "infer", "confidence": 0.7}
+        ],
+        "conclusion": "ship it",
+        "confidence_score": 0.75,
+        "alternative_paths": []
+    }
+    data.update(overrides)
+    return data
+
+
+def test_valid_signature_needs_no_repairs(validator):
+    data, repairs = validator.parse(json.dumps(signature()), "ModelSignature")
+
+    assert data == signature()
+    assert repairs == []
+
+
+def test_scores_are_rescaled_clamped_and_converted(validator):
+    data = signature(confidence_score="85%")
+    data["reasoning_chain"][0]["confidence"] = 140
+    data["reasoning_chain"][1]["confidence"] = -0.2
+
+    data, repairs = validator.parse(json.dumps(data), "ModelSignature")
+
+    assert data["confidence_score"] == pytest.approx(0.85)
+    assert data["reasoning_chain"][0]["confidence"] == 1
+    assert data["reasoning_chain"][1]["confidence"] == 0
+    assert len(repairs) == 4
+
+
+@pytest.mark.parametrize("given, expected", [(7, 0.7), (10, 1.0), (2.5, 0.25), (85, 0.85), ("7%", 0.07), (1, 1)])
+def test_scores_on_other_scales_are_rescaled(validator, given, expected):
+    data, _ = validator.parse(json.dumps(signature(confidence_score=given)), "ModelSignature")
+    assert data["confidence_score"] == pytest.approx(expected)
+
+
+def test_missing_step_numbers_are_filled_in_by_position(validator):
+    data = signature()
+    del data["reasoning_chain"][0]["step"]
+    data["reasoning_chain"][1]["step"] = "two"
+
+    data, repairs = validator.parse(json.dumps(data), "ModelSignature")
+
+    assert [step["step"] for step in data["reasoning_chain"]] == [1, 2]
+    assert len(repairs) == 2
+
+
+def test_scalar_in_string_field_is_converted(validator):
+    data, repairs = validator.parse(json.dumps(signature(conclusion=42)), "ModelSignature")
+
+    assert data["conclusion"] == "42"
+    assert repairs == ["$.conclusion: converted to string"]
+
+
+def test_truncated_response_is_recovered_and_incomplete_step_dropped(validator):
+    data = signature()
+    # Conclusion first, as streamed responses are asked for
+    text = json.dumps({"conclusion": data.pop("conclusion"), "confidence_score": data.pop("confidence_score"), **data})
+    # Cut inside the second step, before its required confidence arrives
+    cut = text[:text.index('"confidence": 0.7') + len('"confi')]
+
+    data, repairs = validator.parse(cut, "ModelSignature")
+
+    assert "recovered truncated or wrapped JSON" in repairs
+    assert "$.reasoning_chain[1]: dropped incomplete item" in repairs
+    assert len(data["reasoning_chain"]) == 1
+
+
+def test_missing_required_field_raises(validator):
+    data = signature()
+    del data["conclusion"]
+
+    with pytest.raises(SchemaError) as error:
+        validator.parse(json.dumps(data), "ModelSignature")
+    assert "$.conclusion: required" in str(error.value)
+
+
+def test_wrong_type_raises(validator):
+    with pytest.raises(SchemaError):
+        validator.validate({"has_contradiction": "yes", "contradiction_type": "x", "severity": 0.5}, "ContradictionReport")
+
+
+def test_recover_json_strips_fences_and_trailing_text():
+    assert recover_json('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+    assert recover_json('Here you go: {"a": 1} hope that helps') == {"a": 1}
+    assert recover_json('{"a": "unterminated') == {"a": "unterminated"}
+
+
+def test_recover_json_raises_when_nothing_parses():
+    with pytest.raises(json.JSONDecodeError):
+        recover_json("no json here")
@@ -0,0 +1,87 @@
+"""
+Test sharded execution planning: executor sub-agents per workstream, reduced locally.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import re
+
+import pytest
+
+from agents import ExecutorAgent
+from orchestrator import ThoughtLineageOrchestrator
+from runtime import LLMClient
+
+
+def steps(count):
+    return [{"step": i, "thought": f"Step {i}", "confidence": 0.8, "evidence": []} for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Answer every model call locally; the plan has four steps, workstreams name themselves."""
+    prompts = []
+
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        prompts.append(prompt)
+        workstream = re.search(r"workstream (\d+) of \d+", prompt)
+        return json.dumps({
+            "reasoning_chain": steps(4 if decision["phase"] == "decision" else 1),
+            "conclusion": f"workstream {workstream.group(1)} done" if workstream else f"{decision['phase']} conclusion",
+            "confidence_score": 0.6 if workstream and workstream.group(1) == "1" else 0.8,
+            "alternative_paths": []
+        })
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    return prompts
+
+
+def test_workstreams_are_contiguous_and_never_empty():
+    chain = steps(5)
+    assert [[s["step"] for s in ws] for ws in ExecutorAgent.workstreams(chain, 2)] == [[1, 2], [3, 4, 5]]
+    assert len(ExecutorAgent.workstreams(chain, 8)) == 5
+    assert ExecutorAgent.workstreams(chain, 0) == [chain]
+
+
+def test_reduce_concatenates_workstreams_and_averages_confidence():
+    workstreams = [
+        {"signature_id": "ws1", "reasoning_chain": steps(2), "conclusion": "First", "confidence_score": 0.6},
+        {"signature_id": "ws2", "reasoning_chain": steps(1), "conclusion": "Second", "confidence_score": 0.9,
+         "alternative_paths": ["Wait"]}
+    ]
+    reduced = ExecutorAgent().reduce_workstreams("Raise prices?", workstreams)
+
+    assert [s["step"] for s in reduced["reasoning_chain"]] == [1, 2, 3]
+    assert reduced["reasoning_chain"][2]["thought"] == "[Workstream 2] Step 1"
+    assert reduced["conclusion"] == "Workstream 1: First\nWorkstream 2: Second"
+    assert reduced["confidence_score"] == 0.75
+    assert reduced["alternative_paths"] == ["Wait"]
+    assert reduced["context"]["parent_signatures"] == ["ws1", "ws2"]
+
+
+def test_workstream_covers_only_its_steps(model):
+    plan = {"signature_id": "plan", "agent_id": "planner-agent", "reasoning_chain": steps(4), "conclusion": "Raise prices", "confidence_score": 0.8}
+    data = ExecutorAgent(workstream=2).execute_workstream("Raise prices?", plan, 2)
+
+    assert "- Step 3: Step 3\n- Step 4: Step 4" in model[0]
+    assert "Step 1:" not in model[0]
+    assert data["agent_id"] == "executor-agent-ws2"
+    assert data["metadata"]["workstream"]["plan_steps"] == [3, 4]
+
+
+def test_sharded_run_registers_workstreams_under_the_plan(model):
+    orchestrator = ThoughtLineageOrchestrator()
+    results = orchestrator.process_problem("Raise prices?", executor_shards=2)
+
+    analysis, plan, ws1, ws2, reduced = results["signatures"]
+    assert [ws1["agent_id"], ws2["agent_id"], reduced["agent_id"]] == [
+        "executor-agent-ws1", "executor-agent-ws2", "executor-agent"
+    ]
+    assert ws1["context"]["parent_signatures"] == [plan["signature_id"]]
+    assert ws2["context"]["parent_signatures"] == [plan["signature_id"]]
+    assert reduced["context"]["parent_signatures"] == [ws1["signature_id"], ws2["signature_id"]]
+    assert reduced["reasoning_type"] == "evaluation"
+    assert reduced["confidence_score"] == 0.7
+    # Analysis, plan and two workstreams; the reduction makes no model call
+    assert len(model) == 4
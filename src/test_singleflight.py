@@ -0,0 +1,135 @@
+"""
+Test coalescing of identical in-flight calls.
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, '.')
+
+import pytest
+
+from runtime import SingleFlight
+
+
+class LeaderFailed(Exception):
+    pass
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def blocking_call(release, calls, result="done", error=None):
+    """A call that blocks until released, counting how often it actually runs."""
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        if error is not None:
+            raise error
+        return result
+    return fn
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release, calls = threading.Event(), []
+    fn = blocking_call(release, calls)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "key", fn) for _ in range(5)]
+        wait_until(lambda: flight.stats()["coalesced"] == 4)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(value == "done" for value, _ in results)
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_and_later_calls_are_not_coalesced():
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+    # Nothing is cached once a call settles
+    assert flight.do("a", lambda: 3) == (3, False)
+
+
+def test_leader_error_is_raised_in_waiters():
+    flight = SingleFlight()
+    release, calls = threading.Event(), []
+    fn = blocking_call(release, calls, error=LeaderFailed("boom"))
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", fn) for _ in range(3)]
+        wait_until(lambda: flight.stats()["coalesced"] == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(LeaderFailed):
+                future.result()
+    assert len(calls) == 1
+
+
+def test_waiters_retry_on_leader_specific_errors():
+    flight = SingleFlight()
+    release, calls = threading.Event(), []
+    leader_fn = blocking_call(release, calls, error=LeaderFailed("leader's own deadline"))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", leader_fn, retry_on=(LeaderFailed,))
+        wait_until(lambda: flight.stats()["in_flight"] == 1)
+        waiter = pool.submit(flight.do, "key", lambda: "retried", retry_on=(LeaderFailed,))
+        wait_until(lambda: flight.stats()["coalesced"] == 1)
+        release.set()
+
+        with pytest.raises(LeaderFailed):
+            leader.result()
+        # The waiter became the new leader and ran its own call
+        assert waiter.result() == ("retried", False)
+
+
+def test_waiter_timeout_does_not_affect_the_call():
+    flight = SingleFlight()
+    release, calls = threading.Event(), []
+    fn = blocking_call(release, calls)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(flight.do, "key", fn)
+        wait_until(lambda: flight.stats()["in_flight"] == 1)
+        with pytest.raises(TimeoutError):
+            flight.do("key", fn, timeout=0.05)
+        release.set()
+        assert leader.result() == ("done", False)
+    assert len(calls) == 1
+
+
+
+def test_caller_key_goes_through_its_own_client(monkeypatch):
+    import google.ai.generativelanguage as glm
+    from runtime import Deadline, LLMClient, llm
+
+    requests = []
+
+    class KeyClient:
+        def generate_content(self, request, timeout=None):
+            requests.append((request, timeout))
+            return glm.GenerateContentResponse(
+                candidates=[{"content": {"parts": [{"text": '{"ok": true}'}]}}],
+                usage_metadata={"prompt_token_count": 12, "candidates_token_count": 3}
+            )
+
+    monkeypatch.setattr(llm, "_key_client", lambda api_key: KeyClient())
+    client = LLMClient(flight=SingleFlight(), deadline=Deadline(30), api_key="caller-key")
+    decision = client.route("analysis")
+
+    assert client.generate_json("prompt", decision, 0.3) == '{"ok": true}'
+    request, timeout = requests[0]
+    assert request.model == f"models/{decision['model']}"
+    assert request.generation_config.response_mime_type == "application/json"
+    assert 0 < timeout <= 30
+    assert (decision["input_tokens"], decision["output_tokens"]) == (12, 3)
@@ -0,0 +1,90 @@
+"""
+Test speculative starts of sequential children from streamed parent conclusions.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orchestrator import ThoughtLineageOrchestrator
+from runtime import LLMClient, SpeculationCancelledError, SpeculativeChild, streamed_conclusion
+from runtime.speculation import check_cancelled
+
+
+def test_conclusion_is_read_once_its_closing_quote_arrives():
+    assert streamed_conclusion('{"reasoning_chain": [], "conclusion": "Raise pri') is None
+    assert streamed_conclusion('{"conclusion": "Raise \\"Pro\\" prices", "confidence') == 'Raise "Pro" prices'
+
+
+def test_result_is_kept_when_the_final_conclusion_matches():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        child = SpeculativeChild(pool, lambda parent: f"child of {parent['conclusion']}")
+        child.start({"conclusion": "Raise  prices"})
+        assert child.take({"conclusion": "raise prices"}) == "child of Raise  prices"
+    assert child.to_dict()["outcome"] == "accepted"
+
+
+def test_changed_conclusion_cancels_the_run_at_its_next_call():
+    started, release = threading.Event(), threading.Event()
+    stopped = []
+
+    def run_child(parent):
+        started.set()
+        release.wait(2)
+        try:
+            check_cancelled()
+        except SpeculationCancelledError:
+            stopped.append(True)
+            raise
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        child = SpeculativeChild(pool, run_child)
+        child.start({"conclusion": "Raise prices"})
+        started.wait(2)
+        assert child.take({"conclusion": "Cut prices"}) is None
+        release.set()
+    assert stopped == [True]
+    assert child.to_dict() == {"outcome": "rerun"}
+
+
+def test_child_started_inside_a_speculation_is_cancelled_with_it():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        outer = SpeculativeChild(pool, lambda parent: SpeculativeChild(pool, lambda p: None))
+        outer.start({"conclusion": "Raise prices"})
+        inner = outer.future.result()
+        outer.cancel()
+        assert inner.cancelled()
+
+
+@pytest.fixture
+def streaming_model(monkeypatch):
+    """Answer every model call locally, streaming the response in two chunks when asked to."""
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        text = json.dumps({
+            "conclusion": f"{decision['phase']} conclusion",
+            "confidence_score": 0.8,
+            "reasoning_chain": [{"step": 1, "thought": "Check the numbers", "confidence": 0.8, "evidence": []}],
+            "alternative_paths": []
+        })
+        if on_partial is not None:
+            on_partial(text[:len(text) // 2])
+            on_partial(text)
+        return text
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+
+
+def test_sequential_run_accepts_matching_speculations(streaming_model):
+    results = ThoughtLineageOrchestrator().process_problem("Raise prices?", speculative=True)
+
+    assert {phase: info["outcome"] for phase, info in results["speculation"].items()} == {
+        "decision": "accepted", "evaluation": "accepted"
+    }
+    analysis, plan, execution = results["signatures"]
+    # Speculative children are re-parented onto the registered parents
+    assert plan["context"]["parent_signatures"] == [analysis["signature_id"]]
+    assert execution["context"]["parent_signatures"] == [plan["signature_id"]]
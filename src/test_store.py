@@ -0,0 +1,125 @@
+"""
+Test the shared graph store: cross-process replay, merges and concurrent readers.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import threading
+
+from graph import SharedGraphStore
+from orchestrator import ReasoningGraph, ThoughtLineageOrchestrator, ThoughtSignature
+
+
+def signature(agent_id, reasoning_type, parents=(), conclusion=None, content_addressed=False):
+    return ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[{"step": 1, "thought": "Look at the numbers", "confidence": 0.8, "evidence": []}],
+        conclusion=conclusion or f"{agent_id} conclusion",
+        confidence_score=0.8,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=content_addressed
+    )
+
+
+def test_no_current_run_before_the_first_run(tmp_path):
+    store = SharedGraphStore(str(tmp_path / "state.db"))
+    assert store.current(ThoughtLineageOrchestrator) is None
+
+
+def test_other_process_replays_the_running_graph(tmp_path):
+    path = str(tmp_path / "state.db")
+    writer, reader = SharedGraphStore(path), SharedGraphStore(path)
+
+    orchestrator = ThoughtLineageOrchestrator()
+    writer.start_run(orchestrator)
+    analysis = signature("analyzer-agent", "analysis")
+    orchestrator.register_signature(analysis)
+
+    replayed = reader.current(ThoughtLineageOrchestrator)
+    assert replayed is not orchestrator
+    assert list(replayed.graph.nodes) == [analysis.signature_id]
+
+    # Only rows not yet applied are replayed on the next read
+    plan = signature("planner-agent", "decision", [analysis])
+    orchestrator.register_signature(plan)
+    assert reader.current(ThoughtLineageOrchestrator) is replayed
+    assert replayed.graph.get_children(analysis.signature_id)[0].signature_id == plan.signature_id
+
+    # The writing process serves its own orchestrator without re-adding its signatures
+    assert writer.current(ThoughtLineageOrchestrator) is orchestrator
+    assert len(orchestrator.graph.nodes) == 2
+
+
+def test_replay_reproduces_merges(tmp_path):
+    path = str(tmp_path / "state.db")
+    writer, reader = SharedGraphStore(path), SharedGraphStore(path)
+
+    orchestrator = ThoughtLineageOrchestrator()
+    writer.start_run(orchestrator)
+    first, second = signature("analyzer-agent", "analysis", conclusion="A"), signature("analyzer-agent", "analysis", conclusion="B")
+    for parent in (first, second):
+        orchestrator.register_signature(parent)
+        orchestrator.register_signature(signature("planner-agent", "decision", [parent], conclusion="Same plan", content_addressed=True))
+
+    replayed = reader.current(ThoughtLineageOrchestrator).graph
+    assert len(replayed.nodes) == len(orchestrator.graph.nodes) == 3
+    assert replayed.merges == orchestrator.graph.merges == 1
+
+
+def test_a_new_run_replaces_the_current_one(tmp_path):
+    path = str(tmp_path / "state.db")
+    writer, reader = SharedGraphStore(path), SharedGraphStore(path)
+
+    writer.start_run(ThoughtLineageOrchestrator())
+    first = reader.current(ThoughtLineageOrchestrator)
+    second_run = ThoughtLineageOrchestrator()
+    writer.start_run(second_run)
+    second_run.register_signature(signature("analyzer-agent", "analysis"))
+
+    current = reader.current(ThoughtLineageOrchestrator)
+    assert current is not first
+    assert len(current.graph.nodes) == 1
+
+
+def test_old_runs_are_pruned(tmp_path):
+    store = SharedGraphStore(str(tmp_path / "state.db"), keep_runs=2)
+    for _ in range(4):
+        orchestrator = ThoughtLineageOrchestrator()
+        run_id = store.start_run(orchestrator)
+        orchestrator.register_signature(signature("analyzer-agent", "analysis"))
+        store.finish_run(run_id, {"final_conclusion": "done", "graph": {}})
+
+    conn = store._connection()
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    assert conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0] == 2
+
+
+def test_snapshots_are_consistent_while_signatures_are_added():
+    graph = ReasoningGraph()
+    root = signature("analyzer-agent", "analysis")
+    graph.add_signature(root)
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        for _ in range(3000):
+            graph.add_signature(signature("planner-agent", "decision", [root]))
+        done.set()
+
+    def reader():
+        try:
+            while not done.is_set():
+                snapshot = graph.to_dict()
+                assert len(snapshot["edges"]) <= len(snapshot["nodes"])
+                graph.query(agent_id="planner-agent", limit=5)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(graph.to_dict()["edges"]) == 3000
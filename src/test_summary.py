@@ -0,0 +1,105 @@
+"""
+Test bounded level-of-detail summaries of reasoning graphs.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from graph import GraphSummarizer
+from orchestrator import ReasoningGraph, ThoughtSignature
+
+
+def add(graph, agent_id, reasoning_type, parents=(), confidence=0.8):
+    sig = ThoughtSignature(
+        agent_id=agent_id,
+        reasoning_type=reasoning_type,
+        reasoning_chain=[],
+        conclusion=f"{agent_id} says " + "x" * 300,
+        confidence_score=confidence,
+        parent_signatures=[p.signature_id for p in parents],
+        content_addressed=False
+    )
+    graph.add_signature(sig)
+    return sig
+
+
+def sequential_runs(count):
+    """`count` independent analyzer -> planner -> executor chains."""
+    graph = ReasoningGraph()
+    for _ in range(count):
+        analysis = add(graph, "analyzer-agent", "analysis")
+        plan = add(graph, "planner-agent", "decision", [analysis])
+        add(graph, "executor-agent", "evaluation", [plan])
+    return graph
+
+
+def test_small_graph_is_shown_node_by_node():
+    view = GraphSummarizer(max_nodes=10, conclusion_chars=20).summarize(sequential_runs(2))
+
+    assert view["level"] == "nodes"
+    assert view["total_signatures"] == view["total_nodes"] == 6
+    assert len(view["edges"]) == 4
+    assert all(len(node["conclusion"]) == 23 for node in view["nodes"])
+
+
+def test_chains_collapse_and_expand():
+    graph = sequential_runs(5)
+    summarizer = GraphSummarizer(max_nodes=5)
+
+    view = summarizer.summarize(graph)
+    assert view["level"] == "chains"
+    assert [node["size"] for node in view["nodes"]] == [3] * 5
+    assert view["nodes"][0]["label"] == "analyzer-agent > planner-agent > executor-agent"
+
+    expanded = summarizer.summarize(graph, cluster_id=view["nodes"][0]["id"])
+    assert expanded["level"] == "nodes"
+    assert [node["agent"] for node in expanded["nodes"]] == ["analyzer-agent", "planner-agent", "executor-agent"]
+    assert all(edge["count"] == 1 for edge in expanded["edges"])
+
+
+def test_large_graph_clusters_and_pages_on_expand():
+    graph = sequential_runs(30)
+    summarizer = GraphSummarizer(max_nodes=10)
+
+    view = summarizer.summarize(graph)
+    assert view["level"] == "agent_type"
+    assert len(view["nodes"]) == 1
+    cluster = view["nodes"][0]
+    assert (cluster["size"], cluster["chains"]) == (90, 30)
+    assert cluster["label"].endswith("(x30)")
+
+    # 30 chains do not fit in 10 nodes, so the expansion is paged
+    page = summarizer.summarize(graph, cluster_id=cluster["id"])
+    assert page["level"] == "chains"
+    assert (page["total_nodes"], len(page["nodes"]), page["next_offset"]) == (30, 10, 10)
+    last = summarizer.summarize(graph, cluster_id=cluster["id"], offset=20)
+    assert len(last["nodes"]) == 10 and "next_offset" not in last
+
+
+def test_fan_out_edges_are_aggregated_with_counts():
+    graph = ReasoningGraph()
+    for _ in range(4):
+        analysis = add(graph, "analyzer-agent", "analysis")
+        growth = add(graph, "planner-growth-focus", "decision", [analysis])
+        revenue = add(graph, "planner-revenue-focus", "decision", [analysis])
+        add(graph, "synthesizer-agent", "synthesis", [growth, revenue])
+
+    view = GraphSummarizer(max_nodes=4).summarize(graph)
+
+    assert view["level"] == "agent_type"
+    assert view["total_signatures"] == 16
+    assert sorted(edge["count"] for edge in view["edges"]) == [4, 4, 4, 4]
+
+
+def test_cluster_ids_are_stable_across_summarizers():
+    graph = sequential_runs(30)
+    first = GraphSummarizer(max_nodes=10).summarize(graph)["nodes"][0]["id"]
+
+    assert GraphSummarizer(max_nodes=10).summarize(graph)["nodes"][0]["id"] == first
+    assert GraphSummarizer(max_nodes=10).summarize(graph, cluster_id=first)["cluster_id"] == first
+
+
+def test_unknown_cluster_raises_key_error():
+    with pytest.raises(KeyError):
+        GraphSummarizer().summarize(sequential_runs(1), cluster_id="chain:missing")
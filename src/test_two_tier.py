@@ -0,0 +1,89 @@
+"""
+Test two-tier contradiction detection: a severity-only probe before the full report.
+"""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import pytest
+
+from intelligence import ContradictionDetector, ContradictionIndex
+from runtime import LLMClient
+
+FULL_REPORT = {
+    "has_contradiction": True,
+    "contradiction_type": "assumption",
+    "severity": 0.9,
+    "assumption_a": "Market share wins",
+    "assumption_b": "Cash flow wins",
+    "conflicting_elements": ["Spending"]
+}
+
+
+def signature(signature_id, conclusion, thoughts):
+    return {
+        "signature_id": signature_id,
+        "agent_id": f"planner-{signature_id}",
+        "conclusion": conclusion,
+        "confidence_score": 0.8,
+        "reasoning_chain": [{"step": i + 1, "thought": t} for i, t in enumerate(thoughts)]
+    }
+
+
+PLAN_A = signature("a", "Spend to grow users", ["Market share compounds", "Burn cash on ads"])
+PLAN_B = signature("b", "Protect margins", ["Profit funds the company", "Cut ad spend"])
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Answer probes with `model.probe` (text) and full prompts with FULL_REPORT, counting each."""
+    class Model:
+        probe = json.dumps({"has_contradiction": True, "severity": 0.1})
+        calls = []
+
+    def generate_json(self, prompt, decision, temperature, on_partial=None):
+        kind = "probe" if "Rate whether" in prompt else "full"
+        Model.calls.append(kind)
+        return Model.probe if kind == "probe" else json.dumps(FULL_REPORT)
+
+    monkeypatch.setattr(LLMClient, "generate_json", generate_json)
+    return Model
+
+
+def test_low_probe_answers_without_the_full_report(model):
+    report = ContradictionDetector(two_tier=True).detect(PLAN_A, PLAN_B)
+    assert model.calls == ["probe"]
+    assert report["probe_only"] is True
+    assert report["severity"] == 0.1
+    assert report["signatures_compared"] == ["a", "b"]
+
+
+def test_probe_near_the_threshold_escalates(model):
+    model.probe = json.dumps({"has_contradiction": True, "severity": 0.45})
+    report = ContradictionDetector(two_tier=True).detect(PLAN_A, PLAN_B)
+    assert model.calls == ["probe", "full"]
+    assert report["severity"] == 0.9 and "probe_only" not in report
+
+
+def test_failed_probe_falls_back_to_the_full_report(model):
+    model.probe = "not json at all"
+    report = ContradictionDetector(two_tier=True).detect(PLAN_A, PLAN_B)
+    assert model.calls == ["probe", "full"]
+    assert report["contradiction_type"] == "assumption"
+
+
+def test_single_tier_asks_for_the_full_report_only(model):
+    ContradictionDetector(two_tier=False).detect(PLAN_A, PLAN_B)
+    assert model.calls == ["full"]
+
+
+def test_probe_results_are_cached_under_their_own_version(model):
+    index = ContradictionIndex()
+    ContradictionDetector(index=index, two_tier=True).detect(PLAN_A, PLAN_B)
+    cached = ContradictionDetector(index=index, two_tier=True).detect(PLAN_B, PLAN_A)
+    assert model.calls == ["probe"]
+    assert cached["probe_only"] is True and cached["cached"] is True
+    # The full-report cache is separate, so single-tier detection still asks for it
+    ContradictionDetector(index=index, two_tier=False).detect(PLAN_A, PLAN_B)
+    assert model.calls == ["probe", "full"]